@@ -0,0 +1,36 @@
+"""Capacity-aware admission: approved volunteers counter and waitlist index
+
+Revision ID: 2f7b9e4c1a68
+Revises: 9d4a6c2e8b15
+Create Date: 2026-10-19 16:40:12.731054
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7b9e4c1a68'
+down_revision: Union[str, Sequence[str], None] = '9d4a6c2e8b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('approved_volunteers_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE events SET approved_volunteers_count = approved.count "
+        "FROM (SELECT event_id, count(*) AS count FROM applications WHERE status = 'approved' GROUP BY event_id) AS approved "
+        "WHERE events.id = approved.event_id"
+    )
+    op.create_index('ix_applications_event_status_created', 'applications', ['event_id', 'status', 'date_created'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE applications SET status = 'pending' WHERE status = 'waitlisted'")
+    op.drop_index('ix_applications_event_status_created', table_name='applications')
+    op.drop_column('events', 'approved_volunteers_count')
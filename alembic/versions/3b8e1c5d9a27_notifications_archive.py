@@ -0,0 +1,44 @@
+"""Notifications archive partitioned by month
+
+Revision ID: 3b8e1c5d9a27
+Revises: f619ec0d6c8e
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e1c5d9a27'
+down_revision: Union[str, Sequence[str], None] = 'f619ec0d6c8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_notifications_is_read_created_at', 'notifications', ['is_read', 'created_at'], unique=False)
+    # Секции по месяцам создаются фоновой задачей архивации (NotificationsRepo.ensure_archive_partition)
+    op.create_table('notifications_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.String(length=255), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index(op.f('ix_notifications_archive_user_id'), 'notifications_archive', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notifications_archive_user_id'), table_name='notifications_archive')
+    op.drop_table('notifications_archive')
+    op.drop_index('ix_notifications_is_read_created_at', table_name='notifications')
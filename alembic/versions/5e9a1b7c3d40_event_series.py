@@ -0,0 +1,49 @@
+"""Recurring event series with materialized occurrences
+
+Revision ID: 5e9a1b7c3d40
+Revises: 7c2d4f8a1e63
+Create Date: 2026-10-19 13:21:05.204731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a1b7c3d40'
+down_revision: Union[str, Sequence[str], None] = '7c2d4f8a1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_series',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organizer_id', sa.Integer(), nullable=False),
+    sa.Column('rrule', sa.String(length=500), nullable=False),
+    sa.Column('dtstart', sa.DateTime(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('materialized_until', sa.DateTime(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('date_created', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['organizer_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_series_organizer_id'), 'event_series', ['organizer_id'], unique=False)
+    op.create_index('ix_event_series_active_materialized', 'event_series', ['is_active', 'materialized_until'], unique=False)
+    op.add_column('events', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('events_series_id_fkey', 'events', 'event_series', ['series_id'], ['id'], ondelete='SET NULL')
+    op.create_unique_constraint('uq_events_series_start', 'events', ['series_id', 'start_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_events_series_start', 'events', type_='unique')
+    op.drop_constraint('events_series_id_fkey', 'events', type_='foreignkey')
+    op.drop_column('events', 'series_id')
+    op.drop_index('ix_event_series_active_materialized', table_name='event_series')
+    op.drop_index(op.f('ix_event_series_organizer_id'), table_name='event_series')
+    op.drop_table('event_series')
@@ -0,0 +1,42 @@
+"""Events full-text search vector and trigram location index
+
+Revision ID: 7c2d4f8a1e63
+Revises: 3b8e1c5d9a27
+Create Date: 2026-10-19 11:04:17.552910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d4f8a1e63'
+down_revision: Union[str, Sequence[str], None] = '3b8e1c5d9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('events', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('russian'::regconfig, title || ' ' || description || ' ' || location)", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_events_location_trgm', 'events', ['location'], unique=False,
+        postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_location_trgm', table_name='events')
+    op.drop_index('ix_events_search_vector', table_name='events')
+    op.drop_column('events', 'search_vector')
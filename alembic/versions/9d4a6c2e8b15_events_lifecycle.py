@@ -0,0 +1,37 @@
+"""Events lifecycle: completion index and reminder marker
+
+Revision ID: 9d4a6c2e8b15
+Revises: 5e9a1b7c3d40
+Create Date: 2026-10-19 15:02:41.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a6c2e8b15'
+down_revision: Union[str, Sequence[str], None] = '5e9a1b7c3d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_events_status_end_date', 'events', ['status', 'end_date'], unique=False)
+    op.create_index(
+        'ix_events_reminder_due', 'events', ['start_date'], unique=False,
+        postgresql_where=sa.text("status = 'approved' AND reminder_sent_at IS NULL")
+    )
+    # уже начавшиеся события напоминаний не получат - не держим их в частичном индексе
+    op.execute("UPDATE events SET reminder_sent_at = now() WHERE start_date < now()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_reminder_due', table_name='events', postgresql_where=sa.text("status = 'approved' AND reminder_sent_at IS NULL"))
+    op.drop_index('ix_events_status_end_date', table_name='events')
+    op.drop_column('events', 'reminder_sent_at')
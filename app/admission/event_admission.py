@@ -0,0 +1,191 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy.engine import Row
+
+from app.core.exceptions import NotFoundError
+from db.unit_of_work import UnitOfWork
+from db.repositories.applications_repo import ApplicationsRepo
+from db.repositories.events_repo import EventsRepo
+from db.repositories.notifications_repo import NotificationsRepo
+from models.pydantic_response_request_models.application_dto import ApplicationStatus
+from models.pydantic_response_request_models.notification_dto import NotificationCreate, NotificationType
+
+# заявки, которые ещё можно одобрить (отклонённую организатор может пересмотреть)
+ADMITTABLE_STATUSES = (ApplicationStatus.PENDING, ApplicationStatus.WAITLISTED, ApplicationStatus.REJECTED)
+# заявки, которые организатор может отклонить
+REJECTABLE_STATUSES = (ApplicationStatus.PENDING, ApplicationStatus.WAITLISTED, ApplicationStatus.APPROVED)
+
+
+@dataclass
+class AdmissionResult:
+    """Итог изменения статусов заявок"""
+    approved: List[int] = field(default_factory=list)
+    waitlisted: List[int] = field(default_factory=list)
+    released: List[int] = field(default_factory=list)
+    promoted: List[int] = field(default_factory=list)
+
+
+async def admit_applications(uow: UnitOfWork, organizer_id: int, app_ids: List[int]) -> AdmissionResult:
+    """
+    Одобряет заявки на мероприятия организатора в пределах required_volunteers.
+    Строки мероприятий блокируются до конца транзакции, поэтому параллельные одобрения
+    выстраиваются в очередь и не превышают лимит. Не поместившиеся заявки уходят в лист ожидания,
+    заявки чужих мероприятий не изменяются. Коммит - на вызывающей стороне.
+    """
+    events_repo: EventsRepo = uow.events
+    applications_repo: ApplicationsRepo = uow.applications
+
+    capacities = await events_repo.lock_owned_events_capacity(organizer_id, app_ids)
+    if not capacities:
+        return AdmissionResult()
+
+    approved = await applications_repo.approve_owned_applications(organizer_id, app_ids, ADMITTABLE_STATUSES)
+    await events_repo.change_approved_counts(Counter(row.event_id for row in approved))
+
+    approved_ids = {row.id for row in approved}
+    waitlisted = await applications_repo.set_owned_applications_status(
+        organizer_id,
+        [app_id for app_id in app_ids if app_id not in approved_ids],
+        ApplicationStatus.WAITLISTED,
+        [ApplicationStatus.PENDING, ApplicationStatus.REJECTED]
+    )
+
+    await _notify(
+        uow, approved, capacities, NotificationType.APPLICATION_APPROVED,
+        "Заявка одобрена", "Ваша заявка на мероприятие «{event}» одобрена"
+    )
+    return AdmissionResult(approved=[row.id for row in approved], waitlisted=[row.id for row in waitlisted])
+
+
+async def reject_applications(uow: UnitOfWork, organizer_id: int, app_ids: List[int]) -> AdmissionResult:
+    """
+    Отклоняет заявки на мероприятия организатора одним UPDATE с проверкой владения.
+    Места, освобождённые одобренными заявками, сразу занимает лист ожидания.
+    Коммит - на вызывающей стороне.
+    """
+    events_repo: EventsRepo = uow.events
+    applications_repo: ApplicationsRepo = uow.applications
+
+    capacities = await events_repo.lock_owned_events_capacity(organizer_id, app_ids)
+    if not capacities:
+        return AdmissionResult()
+
+    rejected = await applications_repo.set_owned_applications_status(
+        organizer_id, app_ids, ApplicationStatus.REJECTED, REJECTABLE_STATUSES
+    )
+    await _notify(
+        uow, rejected, capacities, NotificationType.APPLICATION_REJECTED,
+        "Заявка отклонена", "Ваша заявка на мероприятие «{event}» отклонена"
+    )
+
+    freed = Counter(row.event_id for row in rejected if row.previous_status == ApplicationStatus.APPROVED)
+    promoted = await _release_seats(uow, capacities, freed)
+    return AdmissionResult(released=[row.id for row in rejected], promoted=promoted)
+
+
+async def cancel_application(uow: UnitOfWork, event_id: int, app_id: int) -> AdmissionResult:
+    """
+    Отмена заявки волонтёром (права проверяет вызывающая сторона).
+    Место одобренной заявки сразу занимает лист ожидания. Коммит - на вызывающей стороне.
+    """
+    events_repo: EventsRepo = uow.events
+    applications_repo: ApplicationsRepo = uow.applications
+
+    capacity = await events_repo.lock_event_capacity(event_id)
+    if capacity is None:
+        raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
+
+    freed = await applications_repo.set_status([app_id], ApplicationStatus.CANCELED, [ApplicationStatus.APPROVED])
+    others = await applications_repo.set_status(
+        [app_id], ApplicationStatus.CANCELED,
+        [ApplicationStatus.PENDING, ApplicationStatus.WAITLISTED, ApplicationStatus.REJECTED]
+    )
+
+    promoted = await _release_seats(uow, [capacity], {event_id: len(freed)})
+    return AdmissionResult(released=freed + others, promoted=promoted)
+
+
+async def fill_from_waitlist(uow: UnitOfWork, event_ids: List[int]) -> List[int]:
+    """
+    Занимает свободные места мероприятий листом ожидания (например, после увеличения required_volunteers):
+    одна блокировка всех строк, один UPDATE заявок и один UPDATE счётчиков на все мероприятия.
+    """
+    events_repo: EventsRepo = uow.events
+    applications_repo: ApplicationsRepo = uow.applications
+
+    capacities = await events_repo.lock_events_capacity(event_ids)
+    if not capacities:
+        return []
+
+    promoted = await applications_repo.approve_waitlisted(
+        [capacity.id for capacity in capacities], [ApplicationStatus.WAITLISTED]
+    )
+    if not promoted:
+        return []
+
+    await events_repo.change_approved_counts(Counter(row.event_id for row in promoted))
+    await _notify(
+        uow, promoted, capacities, NotificationType.APPLICATION_APPROVED,
+        "Заявка одобрена", "Освободилось место: ваша заявка на мероприятие «{event}» одобрена"
+    )
+    return [row.id for row in promoted]
+
+
+async def _release_seats(uow: UnitOfWork, capacities: List[Row], freed: Dict[int, int]) -> List[int]:
+    """Уменьшает счётчики на освобождённые места и занимает их листом ожидания."""
+    events_repo: EventsRepo = uow.events
+    await events_repo.change_approved_counts({event_id: -count for event_id, count in freed.items()})
+
+    promoted = []
+    for capacity in capacities:
+        if freed.get(capacity.id):
+            promoted += await _promote_waitlisted(
+                uow, capacity, capacity.approved_volunteers_count - freed[capacity.id]
+            )
+    return promoted
+
+
+async def _promote_waitlisted(uow: UnitOfWork, capacity: Row, approved_count: int) -> List[int]:
+    """Одобряет заявки из листа ожидания на свободные места и уведомляет волонтёров."""
+    events_repo: EventsRepo = uow.events
+    applications_repo: ApplicationsRepo = uow.applications
+
+    promoted = await applications_repo.approve_in_queue_order(
+        capacity.id, capacity.required_volunteers - approved_count, [ApplicationStatus.WAITLISTED]
+    )
+    if not promoted:
+        return []
+
+    await events_repo.change_approved_counts({capacity.id: len(promoted)})
+    await _notify(
+        uow, promoted, [capacity], NotificationType.APPLICATION_APPROVED,
+        "Заявка одобрена", "Освободилось место: ваша заявка на мероприятие «{event}» одобрена"
+    )
+    return [row.id for row in promoted]
+
+
+async def _notify(
+    uow: UnitOfWork,
+    rows: List[Row],
+    capacities: List[Row],
+    notification_type: NotificationType,
+    title: str,
+    message: str
+):
+    """Уведомления волонтёрам по строкам (id, event_id, volunteer_id) из RETURNING - одним INSERT."""
+    notifications_repo: NotificationsRepo = uow.notifications
+    event_titles = {capacity.id: capacity.title[:150] for capacity in capacities}
+
+    await notifications_repo.bulk_create_notifications([
+        NotificationCreate(
+            title=title,
+            message=message.format(event=event_titles[row.event_id]),
+            type=notification_type,
+            user_id=row.volunteer_id,
+            related_event_id=row.event_id,
+            related_application_id=row.id
+        )
+        for row in rows
+    ])
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime, timedelta
+from loguru import logger
+
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY
+from db.repositories.events_repo import EventsRepo
+from db.repositories.notifications_repo import NotificationsRepo
+from settings import settings
+
+# ключ pg_try_advisory_xact_lock: проход жизненного цикла выполняет один воркер
+EVENTS_LIFECYCLE_LOCK_KEY = 0x65766C63
+
+
+async def run_events_lifecycle_once() -> tuple[int, int]:
+    """
+    Один проход жизненного цикла мероприятий:
+    - approved -> completed для событий с end_date в прошлом;
+    - напоминания EVENT_REMINDER одобренным волонтёрам за EVENTS_REMINDER_HOURS до начала.
+
+    Работает ограниченными пачками, каждая пачка - отдельная транзакция под advisory-блокировкой.
+    Если блокировку держит другой воркер, проход пропускается.
+    Возвращает (завершено событий, создано напоминаний).
+    """
+    batch_size = settings.EVENTS_LIFECYCLE_BATCH_SIZE
+    total_completed = total_reminders = 0
+
+    while True:
+        async with db_manager.get_session() as session:
+            async with UnitOfWork(session, REPOSITORY_REGISTRY) as uow:
+                events_repo: EventsRepo = uow.events
+                notifications_repo: NotificationsRepo = uow.notifications
+
+                if not await events_repo.try_advisory_xact_lock(EVENTS_LIFECYCLE_LOCK_KEY):
+                    await uow.commit()
+                    logger.info("Жизненный цикл мероприятий обрабатывает другой воркер")
+                    break
+
+                now = datetime.now()
+                completed = await events_repo.complete_finished_events(now, batch_size)
+                reminded = await events_repo.mark_reminders_due(
+                    now, now + timedelta(hours=settings.EVENTS_REMINDER_HOURS), batch_size
+                )
+                reminders = await notifications_repo.enqueue_event_reminders(reminded)
+                await uow.commit()
+
+        total_completed += len(completed)
+        total_reminders += reminders
+        if len(completed) < batch_size and len(reminded) < batch_size:
+            break
+        await asyncio.sleep(0)
+
+    logger.info(f"Завершено мероприятий: {total_completed}, создано напоминаний: {total_reminders}")
+    return total_completed, total_reminders
+
+
+async def run_events_lifecycle():
+    """Периодически запускает проход жизненного цикла мероприятий, пока задача не будет отменена."""
+    while True:
+        try:
+            await run_events_lifecycle_once()
+        except Exception as e:
+            logger.error(f"Ошибка обработки жизненного цикла мероприятий: {e}")
+
+        await asyncio.sleep(settings.EVENTS_LIFECYCLE_INTERVAL)
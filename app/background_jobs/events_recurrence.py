@@ -0,0 +1,32 @@
+import asyncio
+from datetime import datetime, timedelta
+from loguru import logger
+
+from app.recurrence.event_recurrence import materialize_series
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY
+from settings import settings
+
+
+async def materialize_series_once() -> int:
+    """Досоздаёт вхождения всех активных серий до скользящего горизонта EVENTS_RECURRENCE_HORIZON_DAYS."""
+    until = datetime.now() + timedelta(days=settings.EVENTS_RECURRENCE_HORIZON_DAYS)
+
+    async with db_manager.get_session() as session:
+        async with UnitOfWork(session, REPOSITORY_REGISTRY) as uow:
+            processed = await materialize_series(uow, until)
+            await uow.commit()
+
+    logger.info(f"Обработано серий мероприятий: {processed}")
+    return processed
+
+
+async def run_events_recurrence():
+    """Периодически сдвигает горизонт серий мероприятий, пока задача не будет отменена."""
+    while True:
+        try:
+            await materialize_series_once()
+        except Exception as e:
+            logger.error(f"Ошибка материализации серий мероприятий: {e}")
+
+        await asyncio.sleep(settings.EVENTS_RECURRENCE_INTERVAL)
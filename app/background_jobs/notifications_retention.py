@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timedelta
+from loguru import logger
+
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY
+from db.repositories.notifications_repo import NotificationsRepo
+from settings import settings
+
+# ключ pg_try_advisory_xact_lock: секции архива создаёт и пачки переносит один воркер
+NOTIFICATIONS_ARCHIVE_LOCK_KEY = 0x6E617263
+
+
+def _month_bounds(moment: datetime) -> tuple[datetime, datetime]:
+    """Начало текущего и начало следующего месяца для moment."""
+    month_start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if month_start.month == 12:
+        return month_start, month_start.replace(year=month_start.year + 1, month=1)
+    return month_start, month_start.replace(month=month_start.month + 1)
+
+
+async def archive_notifications_once() -> int:
+    """
+    Переносит прочитанные уведомления старше NOTIFICATIONS_RETENTION_DAYS в архив.
+
+    Работает ограниченными пачками, каждая пачка - отдельная транзакция под advisory-блокировкой,
+    поэтому блокировки на notifications держатся недолго, а параллельные воркеры
+    не создают одну секцию одновременно.
+    Пачки идут помесячно от самых старых, чтобы секция архива
+    под каждую пачку существовала до вставки.
+    """
+    cutoff = datetime.now() - timedelta(days=settings.NOTIFICATIONS_RETENTION_DAYS)
+    total_archived = 0
+
+    while True:
+        async with db_manager.get_session() as session:
+            async with UnitOfWork(session, REPOSITORY_REGISTRY) as uow:
+                notifications_repo: NotificationsRepo = uow.notifications
+
+                if not await notifications_repo.try_advisory_xact_lock(NOTIFICATIONS_ARCHIVE_LOCK_KEY):
+                    await uow.commit()
+                    logger.info("Архивацию уведомлений выполняет другой воркер")
+                    break
+
+                oldest = await notifications_repo.get_oldest_archivable_date(cutoff)
+                if oldest is None:
+                    await uow.commit()
+                    break
+
+                month_start, month_end = _month_bounds(oldest)
+                await notifications_repo.ensure_archive_partition(month_start, month_end)
+                archived = await notifications_repo.archive_read_notifications(
+                    older_than=min(cutoff, month_end),
+                    batch_size=settings.NOTIFICATIONS_ARCHIVE_BATCH_SIZE
+                )
+                await uow.commit()
+
+        if archived == 0:
+            # Оставшиеся строки заблокированы другими транзакциями - доберём в следующий запуск
+            break
+
+        total_archived += archived
+        await asyncio.sleep(0)
+
+    logger.info(f"Архивировано уведомлений: {total_archived}")
+    return total_archived
+
+
+async def run_notifications_retention():
+    """Периодически запускает архивацию уведомлений, пока задача не будет отменена."""
+    while True:
+        try:
+            await archive_notifications_once()
+        except Exception as e:
+            logger.error(f"Ошибка архивации уведомлений: {e}")
+
+        await asyncio.sleep(settings.NOTIFICATIONS_ARCHIVE_INTERVAL)
@@ -0,0 +1,133 @@
+import codecs
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+
+
+class BulkFormat(str, Enum):
+    """Форматы массового импорта/экспорта"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    BulkFormat.CSV: "text/csv; charset=utf-8",
+    BulkFormat.NDJSON: "application/x-ndjson",
+}
+
+# разделитель списков (теги, навыки) внутри ячейки CSV
+CSV_LIST_SEPARATOR = ";"
+
+
+def format_validation_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in error.errors()
+    ]
+
+
+async def _iter_lines(stream: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Строки из потока байт (UTF-8, в т.ч. с BOM) без символов перевода строки"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in stream:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_records(
+    stream: AsyncIterable[bytes],
+    file_format: BulkFormat
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Читает записи из потока, не загружая файл целиком.
+    Отдаёт (номер строки начала записи, запись, ошибка разбора) - запись или ошибка всегда одна.
+    В CSV первая запись - заголовок, пустые ячейки пропускаются (поле берёт значение по умолчанию).
+    """
+    if file_format == BulkFormat.NDJSON:
+        line_no = 0
+        async for line in _iter_lines(stream):
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"Некорректный JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Ожидается JSON-объект"
+                continue
+            yield line_no, record, None
+        return
+
+    header: Optional[List[str]] = None
+    buffer: List[str] = []
+    record_start = line_no = 0
+    async for line in _iter_lines(stream):
+        line_no += 1
+        if not buffer:
+            record_start = line_no
+        buffer.append(line)
+        text = "\n".join(buffer)
+        # нечётное число кавычек - поле в кавычках продолжается на следующей строке
+        if text.count('"') % 2:
+            continue
+        buffer = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_start, None, f"Ожидается столбцов: {len(header)}, получено: {len(values)}"
+            continue
+        yield record_start, {name: value for name, value in zip(header, values) if value != ""}, None
+
+    if buffer:
+        yield record_start, None, "Незакрытая кавычка в конце файла"
+
+
+def serialize_rows(rows: List[BaseModel], file_format: BulkFormat, fields: List[str]) -> bytes:
+    """Сериализует пачку строк; списки в CSV склеиваются через CSV_LIST_SEPARATOR"""
+    if file_format == BulkFormat.NDJSON:
+        return b"".join(to_json(row) + b"\n" for row in rows)
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    for row in rows:
+        data = row.model_dump(mode="json", include=set(fields))
+        writer.writerow([
+            CSV_LIST_SEPARATOR.join(str(item) for item in value) if isinstance(value, list)
+            else "" if value is None else value
+            for value in (data.get(field) for field in fields)
+        ])
+    return output.getvalue().encode()
+
+
+async def stream_rows(
+    chunks: AsyncIterator[List[BaseModel]],
+    file_format: BulkFormat,
+    row_model: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """Поток байт для StreamingResponse: заголовок CSV и по куску на каждую пачку строк"""
+    fields = list(row_model.model_fields)
+    if file_format == BulkFormat.CSV:
+        output = io.StringIO()
+        csv.writer(output, lineterminator="\n").writerow(fields)
+        yield output.getvalue().encode()
+
+    async for rows in chunks:
+        if rows:
+            yield serialize_rows(rows, file_format, fields)
@@ -0,0 +1,77 @@
+"""
+Запуск в несколько воркеров (uvicorn --workers / WEB_CONCURRENCY).
+
+Состояние в памяти процесса и как оно ведёт себя при N воркерах:
+
+- db_manager (движок и пул соединений) - свой в каждом воркере, это безопасно.
+  Соединений с БД: до WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) и ещё одно на воркер
+  для рассылки изменений - учитывайте max_connections Postgres.
+- Ключи JWT (lru_cache в generate_jwt_keys) - каждый воркер читает одни и те же файлы,
+  entrypoint создаёт их только при первом запуске (ensure_jwt_keys).
+- Коды верификации email (codes_storage) - общие только с VERIFY_CODES_BACKEND=redis
+  (так в docker-compose); memory при нескольких воркерах не даёт воркеру стартовать.
+- Кеш ответов (response_cache_backend) - с redis общий; с memory у каждого воркера свой,
+  инвалидация приходит через рассылку изменений.
+- Индекс публичных мероприятий, справочники (reference_data), single-flight - копия в каждом
+  воркере, обновляются подписчиками коммита, чужие коммиты приходят через рассылку изменений
+  (db.change_broadcast, CHANGE_BROADCAST_ENABLED).
+- Профилирование запросов (request_profiler) - включение рассылается всем воркерам через
+  LISTEN/NOTIFY, буфер профилей у каждого воркера свой: список и выгрузка показывают профили
+  воркера, принявшего запрос.
+- Метрики (metrics_registry) - у каждого воркера свои; с METRICS_DIR воркеры сбрасывают срезы
+  в общий каталог, и /metrics отдаёт сумму по всем воркерам.
+- Фоновые задачи запускаются в каждом воркере; параллельные запуски безопасны:
+  жизненный цикл мероприятий и архивация уведомлений - под advisory lock,
+  серии мероприятий берут строки с SKIP LOCKED.
+"""
+import math
+import os
+
+from loguru import logger
+
+from settings import settings
+
+
+def available_cpus() -> int:
+    """CPU, доступные процессу: affinity и квота cgroup v2 контейнера (cpu.max)."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def default_worker_count() -> int:
+    """Воркеров по числу CPU: воркер асинхронный, одного процесса на ядро достаточно."""
+    return available_cpus()
+
+
+def audit_process_local_state():
+    """Проверяет при старте воркера, что настройки подходят для WEB_CONCURRENCY воркеров."""
+    workers = settings.WEB_CONCURRENCY
+    connections = workers * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW + settings.CHANGE_BROADCAST_ENABLED)
+    logger.info(f"Воркеров: {workers}, соединений с БД на все воркеры - до {connections}")
+    if workers == 1:
+        return
+
+    if settings.VERIFY_CODES_BACKEND == "memory":
+        # код, выданный одним воркером, не проверится другим - регистрация ломается, а не замедляется
+        raise RuntimeError(
+            f"VERIFY_CODES_BACKEND=memory не работает при WEB_CONCURRENCY={workers}: "
+            "задайте VERIFY_CODES_BACKEND=redis или запустите один воркер"
+        )
+    if not settings.METRICS_DIR:
+        logger.warning("METRICS_DIR не задан: /metrics показывает только воркер, принявший запрос")
+    if not settings.CHANGE_BROADCAST_ENABLED:
+        logger.warning(
+            "CHANGE_BROADCAST_ENABLED=false: индекс мероприятий, справочники и кеш ответов "
+            "не узнают об изменениях из других воркеров"
+        )
@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError, HTTPException
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.core.exceptions import AppException
+from app.metrics.red_metrics import app_exceptions_total, db_errors_total
 from loguru import logger
 
 
@@ -24,6 +25,7 @@ def app_exception_handler(
         f"AppException: {exc.error_code} | {exc.message} | "
         f"Path: {request.url.path} | Method: {request.method}"
     )
+    app_exceptions_total.inc(exc.error_code, str(exc.status_code))
 
     return JSONResponse(
         status_code=exc.status_code,
@@ -112,6 +114,7 @@ def integrity_error_handler(
     Срабатывает при нарушении ограничений БД
     """
     error_msg = str(exc.orig)
+    db_errors_total.inc(type(exc).__name__)
 
     logger.error(
         f"IntegrityError: {error_msg} | "
@@ -156,6 +159,7 @@ def sqlalchemy_exception_handler(
         f"Path: {request.url.path}",
         exc_info=True
     )
+    db_errors_total.inc(type(exc).__name__)
 
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
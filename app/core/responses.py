@@ -0,0 +1,16 @@
+from typing import Any
+from fastapi.responses import ORJSONResponse
+from pydantic_core import to_json
+
+
+class DTOResponse(ORJSONResponse):
+    """
+    Ответ из готовых DTO (см. to_dto) напрямую в JSON-байты через pydantic-core.
+
+    FastAPI возвращённый Response не трогает, поэтому повторная валидация по
+    response_model и jsonable_encoder пропускаются. response_model у маршрута
+    остаётся для документации OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
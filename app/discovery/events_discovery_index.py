@@ -0,0 +1,300 @@
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from loguru import logger
+
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY, register_commit_listener
+from db.repositories.events_repo import EventsRepo
+from models.pydantic_response_request_models.event_dto import EventIndexEntry, EventStatus
+
+
+class LocationTrie:
+    """
+    Суффиксное дерево по нормализованным (lower) названиям мест.
+    Поиск подстроки повторяет семантику ILIKE '%...%' из EventsRepo.get_paginated_events.
+    В узлах хранятся названия мест, а не ID событий - мест на порядки меньше, чем событий.
+    """
+
+    def __init__(self):
+        self._root: dict = {}
+
+    def add(self, location: str):
+        for start in range(len(location)):
+            node = self._root
+            for char in location[start:]:
+                node = node.setdefault(char, {})
+                node.setdefault(None, set()).add(location)
+
+    def remove(self, location: str):
+        for start in range(len(location)):
+            parent = self._root
+            for char in location[start:]:
+                node = parent.get(char)
+                if node is None:
+                    break
+                node.get(None, set()).discard(location)
+                if not node.get(None):
+                    # через пустой узел не проходит ни одно место - всё поддерево пустое
+                    del parent[char]
+                    break
+                parent = node
+
+    def find(self, substring: str) -> Set[str]:
+        node = self._root
+        for char in substring:
+            node = node.get(char)
+            if node is None:
+                return set()
+        return node.get(None, set())
+
+
+class EventsDiscoveryIndex:
+    """
+    In-memory индекс одобренных мероприятий для публичной страницы.
+
+    Хранит множества ID событий по тегам, навыкам и местам, а также
+    отсортированный по start_date массив. Комбинации фильтров считаются
+    пересечением множеств без обращения к БД - из БД подгружаются
+    только строки запрошенной страницы.
+
+    Индекс обновляется точечно после коммита изменений событий
+    (см. on_commit) и может быть перестроен целиком через rebuild().
+
+    Обновления читают снимок из БД и применяют его после await, поэтому согласуются так:
+    точечные обновления и перестроения выполняются по одному (свои блокировки); события,
+    изменённые во время перестроения, перечитываются после замены индекса его снимком;
+    точечное обновление, во время чтения которого индекс перестроен, читает заново.
+    """
+
+    def __init__(self):
+        self.is_ready = False
+        self._missed_changes = False
+        self._rebuild_lock = asyncio.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._rebuilding = False
+        self._changed_during_rebuild: Set[int] = set()
+        self._generation = 0
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._rebuild_requested = False
+        self._entries: Dict[int, EventIndexEntry] = {}
+        self._by_tag: Dict[int, Set[int]] = {}
+        self._by_skill: Dict[int, Set[int]] = {}
+        self._by_location: Dict[str, Set[int]] = {}
+        self._locations = LocationTrie()
+        self._by_date: List[Tuple[datetime, int]] = []
+
+    async def rebuild(self) -> int:
+        """Полностью перестраивает индекс из БД. Возвращает количество событий в индексе."""
+        changed: Set[int] = set()
+        try:
+            async with self._rebuild_lock:
+                self._rebuilding = True
+                self._changed_during_rebuild = set()
+                try:
+                    entries = await self._read_entries()
+
+                    fresh_index = EventsDiscoveryIndex()
+                    for entry in entries:
+                        fresh_index._add(entry)
+
+                    self._entries = fresh_index._entries
+                    self._by_tag = fresh_index._by_tag
+                    self._by_skill = fresh_index._by_skill
+                    self._by_location = fresh_index._by_location
+                    self._locations = fresh_index._locations
+                    self._by_date = fresh_index._by_date
+                    self._generation += 1
+                    self.is_ready = True
+                finally:
+                    self._rebuilding = False
+                    changed, self._changed_during_rebuild = self._changed_during_rebuild, set()
+
+                logger.info(f"Индекс публичных мероприятий построен: {len(self._entries)} событий")
+                return len(self._entries)
+        finally:
+            # снимок мог быть прочитан до этих изменений, а при ошибке они не применены вовсе
+            if changed:
+                await self.refresh_events(changed)
+
+    def schedule_rebuild(self):
+        """
+        Перестроение в фоне: коммит, изменивший справочник, не ждёт чтения всех событий.
+        Запросы, пришедшие во время перестроения, объединяются в одно следующее.
+        """
+        self._rebuild_requested = True
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self._run_scheduled_rebuilds())
+
+    async def _run_scheduled_rebuilds(self):
+        while self._rebuild_requested:
+            self._rebuild_requested = False
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Индекс публичных мероприятий не перестроен: {e}")
+
+    async def close(self):
+        """Отменяет фоновое перестроение при остановке воркера."""
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            self._rebuild_task.cancel()
+            await asyncio.gather(self._rebuild_task, return_exceptions=True)
+
+    async def build_in_background(self):
+        """
+        Первое построение при старте воркера: воркер принимает запросы сразу, поиск до готовности
+        индекса идёт через БД. Изменения, закоммиченные во время построения, могли не попасть
+        в прочитанный снимок - тогда индекс строится ещё раз.
+        """
+        try:
+            while True:
+                self._missed_changes = False
+                await self.rebuild()
+                if not self._missed_changes:
+                    return
+        except Exception as e:
+            logger.error(f"Индекс публичных мероприятий не построен, поиск идёт через БД: {e}")
+
+    async def refresh_events(self, event_ids: Set[int]):
+        """Перечитывает из БД указанные события и обновляет их в индексе."""
+        if not self.is_ready:
+            return
+
+        async with self._refresh_lock:
+            while True:
+                if self._rebuilding:
+                    # применятся после замены индекса снимком перестроения
+                    self._changed_during_rebuild |= event_ids
+                    return
+
+                generation = self._generation
+                entries = await self._read_entries(list(event_ids))
+                if self._rebuilding:
+                    self._changed_during_rebuild |= event_ids
+                    return
+                if generation == self._generation:
+                    break
+                # индекс заменён снимком, прочитанным параллельно, - читаем ещё раз
+
+            for event_id in event_ids:
+                self._remove(event_id)
+            for entry in entries:
+                self._add(entry)
+
+    @staticmethod
+    async def _read_entries(event_ids: Optional[List[int]] = None) -> List[EventIndexEntry]:
+        async with db_manager.get_session() as session:
+            async with UnitOfWork(session, REPOSITORY_REGISTRY) as uow:
+                events_repo: EventsRepo = uow.events
+                entries = await events_repo.get_index_entries(EventStatus.APPROVED, event_ids)
+                await uow.commit()
+        return entries
+
+    def search(
+        self,
+        location: Optional[str] = None,
+        tag_ids: Optional[List[int]] = None,
+        skill_ids: Optional[List[int]] = None,
+        start_date_from: Optional[datetime] = None,
+        start_date_to: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[int], int]:
+        """
+        Возвращает ID событий страницы (по возрастанию start_date) и общее количество.
+        Фильтры по тегам и навыкам - "любой из", как в EventsRepo.get_paginated_events.
+        """
+        candidates: Optional[Set[int]] = None
+
+        if tag_ids:
+            candidates = self._intersect(candidates, self._union(self._by_tag, tag_ids))
+        if skill_ids:
+            candidates = self._intersect(candidates, self._union(self._by_skill, skill_ids))
+        if location:
+            matched_locations = self._locations.find(location.lower())
+            candidates = self._intersect(candidates, self._union(self._by_location, matched_locations))
+
+        low = 0 if start_date_from is None else bisect_left(self._by_date, (start_date_from,))
+        high = len(self._by_date) if start_date_to is None else bisect_right(self._by_date, (start_date_to, float("inf")))
+
+        if candidates is None and start_date_from is None and start_date_to is None:
+            page = [event_id for _, event_id in self._by_date[offset:offset + limit]]
+            return page, len(self._by_date)
+
+        page = []
+        total = 0
+        for _, event_id in self._by_date[low:high]:
+            if candidates is not None and event_id not in candidates:
+                continue
+            if offset <= total < offset + limit:
+                page.append(event_id)
+            total += 1
+
+        return page, total
+
+    @staticmethod
+    def _union(index: Dict, keys) -> Set[int]:
+        result: Set[int] = set()
+        for key in keys:
+            result |= index.get(key, set())
+        return result
+
+    @staticmethod
+    def _intersect(current: Optional[Set[int]], other: Set[int]) -> Set[int]:
+        return other if current is None else current & other
+
+    def _add(self, entry: EventIndexEntry):
+        self._entries[entry.id] = entry
+        for tag_id in entry.tag_ids:
+            self._by_tag.setdefault(tag_id, set()).add(entry.id)
+        for skill_id in entry.skill_ids:
+            self._by_skill.setdefault(skill_id, set()).add(entry.id)
+
+        location = entry.location.lower()
+        if location not in self._by_location:
+            self._by_location[location] = set()
+            self._locations.add(location)
+        self._by_location[location].add(entry.id)
+
+        insort(self._by_date, (entry.start_date, entry.id))
+
+    def _remove(self, event_id: int):
+        entry = self._entries.pop(event_id, None)
+        if entry is None:
+            return
+
+        for tag_id in entry.tag_ids:
+            self._by_tag.get(tag_id, set()).discard(event_id)
+        for skill_id in entry.skill_ids:
+            self._by_skill.get(skill_id, set()).discard(event_id)
+
+        location = entry.location.lower()
+        location_events = self._by_location.get(location, set())
+        location_events.discard(event_id)
+        if not location_events:
+            self._by_location.pop(location, None)
+            self._locations.remove(location)
+
+        position = bisect_left(self._by_date, (entry.start_date, event_id))
+        if position < len(self._by_date) and self._by_date[position] == (entry.start_date, event_id):
+            del self._by_date[position]
+
+
+events_discovery_index = EventsDiscoveryIndex()
+
+
+@register_commit_listener
+async def refresh_events_discovery_index(changes: Dict[str, Set[Optional[int]]]):
+    """Точечно обновляет индекс после коммита; изменения справочников перестраивают его целиком в фоне."""
+    if not events_discovery_index.is_ready:
+        events_discovery_index._missed_changes = True
+        return
+
+    changed_events = changes.get("events", set())
+    if "tags" in changes or "skills" in changes or None in changed_events:
+        events_discovery_index.schedule_rebuild()
+
+    event_ids = {event_id for event_id in changed_events if event_id is not None}
+    if event_ids:
+        await events_discovery_index.refresh_events(event_ids)
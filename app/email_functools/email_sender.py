@@ -1,9 +1,9 @@
-import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from settings import settings
 from typing import Optional
 from loguru import logger
+from tracing.tracer import tracer
 
 
 class EmailSender:
@@ -145,15 +145,18 @@ class EmailSender:
             html_part = MIMEText(html_body, "html", "utf-8")
             message.attach(html_part)
 
-            # Отправляем через SMTP
-            await aiosmtplib.send(
-                message,
-                hostname=settings.SMTP_HOST,
-                port=settings.SMTP_PORT,
-                username=settings.SMTP_USER,
-                password=settings.SMTP_PASSWORD,
-                start_tls=True,
-            )
+            # Отправляем через SMTP; aiosmtplib нужен только при отправке писем
+            import aiosmtplib
+
+            with tracer.start_as_current_span("smtp.send", attributes={"smtp.host": settings.SMTP_HOST}):
+                await aiosmtplib.send(
+                    message,
+                    hostname=settings.SMTP_HOST,
+                    port=settings.SMTP_PORT,
+                    username=settings.SMTP_USER,
+                    password=settings.SMTP_PASSWORD,
+                    start_tls=True,
+                )
 
             logger.info(f"📧 Email sent successfully to {to_email}")
             return True
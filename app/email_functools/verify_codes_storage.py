@@ -1,4 +1,5 @@
 import secrets
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from typing import Dict
 from dataclasses import dataclass
@@ -15,18 +16,37 @@ class VerifyCode:
     expires_at: datetime
 
 
-class VerifyCodesStorage:
-    """In-memory хранилище кодов верификации"""
+class VerifyCodesStorage(ABC):
+    """Хранилище кодов верификации email. Код живёт VERIFY_CODE_EXPIRE минут и проверяется один раз."""
+
+    @abstractmethod
+    async def put_code(self, email: str) -> int:
+        """Сгенерировать и сохранить код. Возвращает код для отправки."""
+        ...
+
+    @abstractmethod
+    async def verify_code(self, email: str, code: int) -> bool:
+        """Проверить код. Удаляет при успехе."""
+        ...
+
+    async def close(self):
+        pass
+
+    @staticmethod
+    def _generate_code() -> int:
+        return secrets.randbelow(900000) + 100000
+
+
+class InMemoryVerifyCodesStorage(VerifyCodesStorage):
+    """In-memory хранилище кодов верификации. Коды видит только воркер, который их выдал."""
 
     def __init__(self):
         self._codes: Dict[str, VerifyCode] = {}
 
-    def put_code(self, email: str) -> int:
-        """Сгенерировать и сохранить код. Возвращает код для отправки."""
+    async def put_code(self, email: str) -> int:
         self._clear_expired()
 
-        code = secrets.randbelow(900000) + 100000
-        print(code)
+        code = self._generate_code()
         now_moscow = datetime.now(MOSCOW_TZ)
 
         self._codes[email] = VerifyCode(
@@ -35,8 +55,7 @@ class VerifyCodesStorage:
         )
         return code
 
-    def verify_code(self, email: str, code: int) -> bool:
-        """Проверить код. Удаляет при успехе."""
+    async def verify_code(self, email: str, code: int) -> bool:
         self._clear_expired()
 
         stored = self._codes.get(email)
@@ -58,4 +77,40 @@ class VerifyCodesStorage:
             del self._codes[email]
 
 
-codes_storage = VerifyCodesStorage()
\ No newline at end of file
+class RedisVerifyCodesStorage(VerifyCodesStorage):
+    """Общее для всех воркеров хранилище кодов в Redis, срок жизни - через EXPIRE."""
+
+    KEY_PREFIX = "verify_code:"
+
+    def __init__(self, redis_url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(redis_url)
+
+    async def put_code(self, email: str) -> int:
+        code = self._generate_code()
+        await self._redis.set(self.KEY_PREFIX + email, code, ex=settings.VERIFY_CODE_EXPIRE * 60)
+        return code
+
+    async def verify_code(self, email: str, code: int) -> bool:
+        key = self.KEY_PREFIX + email
+        stored = await self._redis.get(key)
+        if stored is None or int(stored) != code:
+            return False
+
+        # из параллельных проверок одного кода DEL удалит ключ только для одной
+        return await self._redis.delete(key) == 1
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_codes_storage() -> VerifyCodesStorage:
+    if settings.VERIFY_CODES_BACKEND == "redis":
+        return RedisVerifyCodesStorage(settings.REDIS_URL)
+    if settings.VERIFY_CODES_BACKEND == "memory":
+        return InMemoryVerifyCodesStorage()
+    raise RuntimeError(f"Unknown VERIFY_CODES_BACKEND: {settings.VERIFY_CODES_BACKEND}")
+
+
+codes_storage = create_codes_storage()
@@ -5,6 +5,7 @@ from .events import router as events_router
 from .applications import router as applications_router
 from .admin import router as admin_router
 from .public import router as public_router
+from .metrics import router as metrics_router
 
 
 main_router = APIRouter(prefix="/v1")
@@ -15,4 +16,4 @@ main_router.include_router(applications_router)
 main_router.include_router(admin_router)
 main_router.include_router(public_router)
 
-__all__ = ["main_router"]
\ No newline at end of file
+__all__ = ["main_router", "metrics_router"]
\ No newline at end of file
@@ -1,9 +1,17 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import Response
 from app.endpoints.authorization_methods.auth_user import verify_access_token_dependency
+from app.core.responses import DTOResponse
 from app.services.services_factory import Services, get_services
 from app.services.admin_service import AdminService
 from app.services.user_service import UserService
-from models.pydantic_response_request_models.role_dto import RoleRead
+from models.pydantic_response_request_models.profiling_dto import (
+    ProfileFormat,
+    ProfileListResponse,
+    ProfilingStatus,
+    ProfilingUpdate,
+)
+from models.pydantic_response_request_models.role_dto import RoleRead, RolesBulkAssign
 from models.pydantic_response_request_models.user_dto import UserTokenInfo, UserListResponse
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -39,7 +47,7 @@ async def get_users_list(
 ):
     """Получает список всех пользователей (только для админа)"""
     admin_service: AdminService = services.admin
-    return await admin_service.get_users_list(page, page_size)
+    return DTOResponse(await admin_service.get_users_list(page, page_size))
 
 
 @router.post("/users/{user_id}/block")
@@ -108,6 +116,17 @@ async def change_roles(
     return await admin_service.change_roles(user_id, new_roles)
 
 
+@router.post("/roles/assign")
+async def assign_roles(
+    data: RolesBulkAssign,
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Массово выдает роли пользователям (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.assign_roles(data)
+
+
 @router.get("/roles")
 async def get_all_roles(
     user: UserTokenInfo = Depends(verify_admin_role),
@@ -116,3 +135,79 @@ async def get_all_roles(
     """Получает список всех доступных ролей"""
     admin_service: AdminService = services.admin
     return await admin_service.get_all_roles()
+
+
+@router.post("/discovery-index/rebuild")
+async def rebuild_discovery_index(
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Перестраивает индекс публичных мероприятий (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.rebuild_discovery_index()
+
+
+PROFILE_FILE_EXTENSIONS = {
+    ProfileFormat.SPEEDSCOPE: "speedscope.json",
+    ProfileFormat.HTML: "html",
+    ProfileFormat.TEXT: "txt",
+}
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+async def get_profiling_status(
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Текущая настройка профилирования запросов (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.get_profiling_status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+async def set_profiling(
+    config: ProfilingUpdate,
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Включает профилирование доли запросов и/или маршрута на время (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.set_profiling(config)
+
+
+@router.get("/profiling/profiles", response_model=ProfileListResponse)
+async def get_profiles(
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Список сохранённых профилей запросов (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.get_profiles()
+
+
+@router.get("/profiling/profiles/{profile_id}")
+async def download_profile(
+    profile_id: int,
+    format: ProfileFormat = Query(ProfileFormat.SPEEDSCOPE),
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Скачивает профиль запроса: speedscope (flamegraph), html или text (только для админа)"""
+    admin_service: AdminService = services.admin
+    content, media_type = await admin_service.get_profile(profile_id, format)
+    filename = f"profile-{profile_id}.{PROFILE_FILE_EXTENSIONS[format]}"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.delete("/profiling/profiles")
+async def clear_profiles(
+    user: UserTokenInfo = Depends(verify_admin_role),
+    services: Services = Depends(get_services)
+):
+    """Очищает буфер профилей (только для админа)"""
+    admin_service: AdminService = services.admin
+    return await admin_service.clear_profiles()
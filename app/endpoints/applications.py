@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
+from app.bulk_io.bulk_formats import BulkFormat, MEDIA_TYPES
 from app.endpoints.authorization_methods.auth_user import verify_access_token_dependency
+from app.core.responses import DTOResponse
 from app.services.services_factory import Services, get_services
 from app.services.application_service import ApplicationService
 from models.pydantic_response_request_models.user_dto import UserTokenInfo
@@ -68,7 +71,7 @@ async def get_my_applications(
 ):
     """Получает все заявки текущего пользователя (волонтёра)"""
     application_service: ApplicationService = services.applications
-    return await application_service.get_my_applications(user.user_id, page, page_size)
+    return DTOResponse(await application_service.get_my_applications(user.user_id, page, page_size))
 
 
 @router.get("/event/{event_id}", response_model=ApplicationListResponse)
@@ -82,12 +85,30 @@ async def get_event_applications(
 ):
     """Получает все заявки на мероприятие (только для организатора)"""
     application_service: ApplicationService = services.applications
-    return await application_service.get_event_applications(
+    return DTOResponse(await application_service.get_event_applications(
         event_id,
         user.user_id,
         status,
         page,
         page_size
+    ))
+
+
+@router.get("/event/{event_id}/export")
+async def export_event_applications(
+    event_id: int,
+    status: Optional[ApplicationStatus] = Query(None, description="Фильтр по статусу"),
+    file_format: BulkFormat = Query(BulkFormat.CSV, alias="format", description="Формат выгрузки"),
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """Потоковая выгрузка всех заявок на мероприятие с контактами волонтёров (только для организатора)"""
+    application_service: ApplicationService = services.applications
+    stream = await application_service.export_event_applications(event_id, user.user_id, status, file_format)
+    return StreamingResponse(
+        stream,
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="event_{event_id}_applications.{file_format.value}"'}
     )
 
 
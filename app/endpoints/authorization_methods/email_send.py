@@ -15,7 +15,7 @@ async def send_verify_code(
         data: SendCodeRequest,
 ):
     email_sender = EmailSender()
-    code = codes_storage.put_code(data.email)
+    code = await codes_storage.put_code(data.email)
     try:
         await email_sender.send_verification_code(data.email, code)
     except Exception as e:
@@ -32,9 +32,7 @@ async def verify_code(
         data: VerifyCodeRequest,
         response:Response
 ):
-    print(data, data.email, data.code)
-    print(codes_storage, codes_storage._codes)
-    if not codes_storage.verify_code(data.email, data.code):
+    if not await codes_storage.verify_code(data.email, data.code):
         raise UnauthorizedError("Неверный или истекший код верификации")
 
     claims = {"email": data.email}
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from typing import Optional
+from app.bulk_io.bulk_formats import BulkFormat, MEDIA_TYPES
 from app.endpoints.authorization_methods.auth_user import verify_access_token_dependency
+from app.core.responses import DTOResponse
 from app.services.services_factory import Services, get_services
 from app.services.event_service import EventService
 from models.pydantic_response_request_models.user_dto import UserTokenInfo
@@ -12,7 +16,11 @@ from models.pydantic_response_request_models.event_dto import (
     EventFilters,
     EventListResponse,
     EventStatusUpdate,
-    EventListItem
+    EventListItem,
+    EventImportResult,
+    EventSeriesCreate,
+    EventSeriesUpdate,
+    EventSeriesRead
 )
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -21,8 +29,11 @@ router = APIRouter(prefix="/events", tags=["events"])
 @router.get("/", response_model=EventListResponse)
 async def get_events_list(
     location: Optional[str] = Query(None, description="Фильтр по городу"),
+    search: Optional[str] = Query(None, max_length=255, description="Полнотекстовый поиск"),
     tag_ids: Optional[str] = Query(None, description="ID тегов через запятую"),
     status: Optional[str] = Query(None, description="Статус мероприятия"),
+    start_date_from: Optional[datetime] = Query(None, description="Мероприятия, начинающиеся после"),
+    start_date_to: Optional[datetime] = Query(None, description="Мероприятия, начинающиеся до"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     user: UserTokenInfo = Depends(verify_access_token_dependency),
@@ -36,13 +47,16 @@ async def get_events_list(
     
     filters = EventFilters(
         location=location,
+        search=search,
         tag_ids=tag_ids_list,
         status=status,
+        start_date_from=start_date_from,
+        start_date_to=start_date_to,
         page=page,
         page_size=page_size
     )
     
-    return await event_service.get_events_list(filters)
+    return DTOResponse(await event_service.get_events_list(filters))
 
 
 @router.get("/{event_id}", response_model=EventWithDetails)
@@ -67,6 +81,78 @@ async def create_event(
     return await event_service.create_event(event_data, user.user_id)
 
 
+@router.post("/series", response_model=EventSeriesRead)
+async def create_event_series(
+    series_data: EventSeriesCreate,
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """Создаёт серию повторяющихся мероприятий по правилу RRULE (только для организаторов)"""
+    event_service: EventService = services.events
+    return await event_service.create_series(series_data, user.user_id)
+
+
+@router.patch("/series/{series_id}")
+async def update_event_series(
+    series_id: int,
+    series_data: EventSeriesUpdate,
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """Изменяет будущие вхождения серии (только организатор)"""
+    event_service: EventService = services.events
+    return await event_service.update_series(series_id, series_data, user.user_id)
+
+
+@router.delete("/series/{series_id}")
+async def end_event_series(
+    series_id: int,
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """Завершает серию: будущие вхождения отменяются (только организатор)"""
+    event_service: EventService = services.events
+    return await event_service.end_series(series_id, user.user_id)
+
+
+@router.post(
+    "/bulk",
+    response_model=EventImportResult,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        MEDIA_TYPES[BulkFormat.CSV]: {"schema": {"type": "string"}},
+        MEDIA_TYPES[BulkFormat.NDJSON]: {"schema": {"type": "string"}},
+    }}}
+)
+async def import_events(
+    request: Request,
+    file_format: BulkFormat = Query(BulkFormat.CSV, alias="format", description="Формат тела запроса"),
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """
+    Массовый импорт мероприятий из CSV (первая строка - заголовок) или NDJSON.
+    Поля - как при создании, теги и навыки - названиями (в CSV через ';').
+    Возвращает ID созданных мероприятий и ошибки по строкам.
+    """
+    event_service: EventService = services.events
+    return await event_service.import_events(request.stream(), file_format, user.user_id)
+
+
+@router.get("/my/export")
+async def export_my_events(
+    file_format: BulkFormat = Query(BulkFormat.CSV, alias="format", description="Формат выгрузки"),
+    user: UserTokenInfo = Depends(verify_access_token_dependency),
+    services: Services = Depends(get_services)
+):
+    """Потоковая выгрузка мероприятий текущего пользователя (формат совместим с импортом)"""
+    event_service: EventService = services.events
+    return StreamingResponse(
+        event_service.export_events(user.user_id, file_format),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="events.{file_format.value}"'}
+    )
+
+
 @router.patch("/{event_id}", response_model=EventRead)
 async def update_event(
     event_id: int,
@@ -97,7 +183,7 @@ async def get_my_events(
 ):
     """Получает все мероприятия текущего пользователя"""
     event_service: EventService = services.events
-    return await event_service.get_my_events(user.user_id)
+    return DTOResponse(await event_service.get_my_events(user.user_id))
 
 
 @router.patch("/{event_id}/status")
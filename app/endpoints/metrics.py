@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics.red_metrics import collect_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Метрики в текстовом формате Prometheus (синхронный - чтение срезов воркеров в threadpool)"""
+    return PlainTextResponse(collect_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
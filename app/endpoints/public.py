@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, Query
+from datetime import datetime
 from typing import Optional, List
+from app.core.responses import DTOResponse
 from app.services.services_factory import Services, get_services
 from app.services.public_service import PublicService
 from models.pydantic_response_request_models.user_dto import UserPublic
@@ -13,6 +15,11 @@ router = APIRouter(prefix="/public", tags=["public"])
 @router.get("/events", response_model=EventListResponse)
 async def get_public_events(
     location: Optional[str] = Query(None, description="Фильтр по городу"),
+    search: Optional[str] = Query(None, max_length=255, description="Полнотекстовый поиск"),
+    tag_ids: Optional[str] = Query(None, description="ID тегов через запятую"),
+    skill_ids: Optional[str] = Query(None, description="ID навыков через запятую"),
+    start_date_from: Optional[datetime] = Query(None, description="Мероприятия, начинающиеся после"),
+    start_date_to: Optional[datetime] = Query(None, description="Мероприятия, начинающиеся до"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     services: Services = Depends(get_services)
@@ -22,12 +29,20 @@ async def get_public_events(
     НЕ требует авторизации.
     """
     public_service: PublicService = services.public
+
+    tag_ids_list = [int(x) for x in tag_ids.split(",")] if tag_ids else None
+    skill_ids_list = [int(x) for x in skill_ids.split(",")] if skill_ids else None
     
-    return await public_service.get_public_events(
+    return DTOResponse(await public_service.get_public_events(
         location=location,
+        search=search,
+        tag_ids=tag_ids_list,
+        skill_ids=skill_ids_list,
+        start_date_from=start_date_from,
+        start_date_to=start_date_to,
         page=page,
         page_size=page_size
-    )
+    ))
 
 
 @router.get("/users/{user_id}", response_model=UserPublic)
@@ -0,0 +1,172 @@
+"""
+RED-метрики (rate, errors, duration) по маршрутам HTTP и методам сервисов,
+плюс счётчики AppException по error_code и ошибок БД.
+
+Воркер копит метрики в памяти (metrics_registry). При нескольких воркерах каждый сбрасывает
+свой срез в METRICS_DIR (раз в METRICS_FLUSH_INTERVAL и при остановке), а /metrics складывает
+срезы всех воркеров - Prometheus видит приложение целиком, какой бы воркер ни ответил.
+"""
+import asyncio
+import functools
+import glob
+import inspect
+import json
+import os
+import time
+from typing import Dict, List, Type, TypeVar
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exceptions import AppException
+from app.metrics.registry import metrics_registry
+from settings import settings
+
+T = TypeVar("T")
+
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP-запросы по маршрутам и статусам ответа", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "Длительность HTTP-запросов", ("method", "route")
+)
+service_calls_total = metrics_registry.counter(
+    "service_calls_total", "Вызовы методов сервисов: ok, app_error (AppException), error", ("service", "method", "outcome")
+)
+service_call_duration_seconds = metrics_registry.histogram(
+    "service_call_duration_seconds", "Длительность вызовов методов сервисов", ("service", "method")
+)
+app_exceptions_total = metrics_registry.counter(
+    "app_exceptions_total", "AppException, обработанные app_exception_handler", ("error_code", "status")
+)
+db_errors_total = metrics_registry.counter(
+    "db_errors_total", "Ошибки БД, обработанные обработчиками SQLAlchemy", ("error",)
+)
+
+
+def _outcome(error: BaseException) -> str:
+    return "app_error" if isinstance(error, AppException) else "error"
+
+
+def measure_service_calls(cls: Type[T], service_name: str) -> Type[T]:
+    """Оборачивает публичные async-методы сервиса: число вызовов по исходу и длительность."""
+    for method_name, method in inspect.getmembers(cls):
+        if method_name.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(method):
+            setattr(cls, method_name, _measure_coroutine(method, service_name, method_name))
+        elif inspect.isasyncgenfunction(method):
+            setattr(cls, method_name, _measure_async_gen(method, service_name, method_name))
+    return cls
+
+
+def _measure_coroutine(method, service_name: str, method_name: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await method(*args, **kwargs)
+        except BaseException as e:
+            outcome = _outcome(e)
+            raise
+        finally:
+            service_call_duration_seconds.observe(time.perf_counter() - started, service_name, method_name)
+            service_calls_total.inc(service_name, method_name, outcome)
+    return wrapper
+
+
+def _measure_async_gen(method, service_name: str, method_name: str):
+    # выгрузки: длительность - от первого вызова до конца итерации
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            async for item in method(*args, **kwargs):
+                yield item
+        except BaseException as e:
+            outcome = _outcome(e)
+            raise
+        finally:
+            service_call_duration_seconds.observe(time.perf_counter() - started, service_name, method_name)
+            service_calls_total.inc(service_name, method_name, outcome)
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    Число запросов и длительность по шаблону маршрута (/v1/events/{event_id}), а не по пути -
+    число рядов метрик не растёт с числом ID.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration_seconds.observe(time.perf_counter() - started, scope["method"], route_path)
+            http_requests_total.inc(scope["method"], route_path, str(status_code))
+
+
+def _snapshot_path() -> str:
+    return os.path.join(settings.METRICS_DIR, f"worker-{os.getpid()}.json")
+
+
+def flush_worker_snapshot():
+    """Пишет срез метрик воркера в METRICS_DIR (атомарно: чтение не увидит половину файла)."""
+    if not settings.METRICS_DIR:
+        return
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = _snapshot_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metrics_registry.snapshot(), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def collect_metrics() -> str:
+    """Метрики в формате Prometheus: этот воркер и последние срезы остальных."""
+    if not settings.METRICS_DIR:
+        return metrics_registry.render(metrics_registry.snapshot())
+
+    flush_worker_snapshot()
+    snapshots: List[Dict[str, dict]] = []
+    # срезы остановленных воркеров остаются: счётчики приложения не должны уменьшаться
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "worker-*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Срез метрик {path} не прочитан: {e}")
+    return metrics_registry.render(metrics_registry.merge(snapshots))
+
+
+async def run_metrics_flush():
+    """Периодически сбрасывает срез метрик воркера, пока задача не будет отменена."""
+    try:
+        while True:
+            await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+            try:
+                flush_worker_snapshot()
+            except OSError as e:
+                logger.error(f"Не удалось сохранить срез метрик: {e}")
+    finally:
+        flush_worker_snapshot()
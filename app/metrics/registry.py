@@ -0,0 +1,158 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    """
+    Значения метрики по наборам меток. Каждый поток пишет в свой шард (dict) без блокировок:
+    в event loop это один шард, отдельные - у потоков threadpool (синхронные обработчики
+    исключений Starlette). Шарды складываются только при сборе (snapshot).
+    """
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # append атомарен под GIL
+            self._shards.append(shard)
+        return shard
+
+    def _describe(self) -> dict:
+        return {"type": self.type, "help": self.documentation, "labels": list(self.labelnames)}
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        values: Dict[Labels, float] = {}
+        for shard in list(self._shards):
+            for labels, value in shard.copy().items():
+                values[labels] = values.get(labels, 0.0) + value
+        return {**self._describe(), "values": [[list(labels), value] for labels, value in values.items()]}
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # счётчики по корзинам (последняя - +Inf) и сумма; накопительные значения - при выводе
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def snapshot(self) -> dict:
+        values: Dict[Labels, list] = {}
+        for shard in list(self._shards):
+            for labels, (counts, total) in shard.copy().items():
+                merged = values.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+        return {
+            **self._describe(),
+            "buckets": list(self.buckets),
+            "values": [[list(labels), state] for labels, state in values.items()],
+        }
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик воркера. snapshot() - JSON-совместимый срез, merge() складывает срезы
+    нескольких воркеров, render() отдаёт текстовый формат Prometheus.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    @staticmethod
+    def merge(snapshots: Iterable[Dict[str, dict]]) -> Dict[str, dict]:
+        merged: Dict[str, dict] = {}
+        for snapshot in snapshots:
+            for name, metric in snapshot.items():
+                target = merged.setdefault(name, {**metric, "values": []})
+                values = {tuple(labels): value for labels, value in target["values"]}
+                for labels, value in metric["values"]:
+                    labels = tuple(labels)
+                    if labels not in values:
+                        values[labels] = value
+                    elif metric["type"] == "histogram":
+                        counts, total = values[labels]
+                        values[labels] = [[a + b for a, b in zip(counts, value[0])], total + value[1]]
+                    else:
+                        values[labels] += value
+                target["values"] = [[list(labels), value] for labels, value in values.items()]
+        return merged
+
+    @staticmethod
+    def render(snapshot: Dict[str, dict]) -> str:
+        lines: List[str] = []
+        for name, metric in snapshot.items():
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for labels, value in metric["values"]:
+                pairs = list(zip(metric["labels"], labels))
+                if metric["type"] == "histogram":
+                    counts, total = value
+                    cumulative = 0
+                    for bound, count in zip([*metric["buckets"], "+Inf"], counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels([*pairs, ('le', str(bound))])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(pairs)} {total}")
+                    lines.append(f"{name}_count{_format_labels(pairs)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_format_labels(pairs)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+metrics_registry = MetricsRegistry()
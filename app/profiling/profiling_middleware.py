@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.profiling.request_profiler import request_profiler
+
+# запросы к самому профилировщику не профилируются
+EXCLUDED_PREFIX = "/v1/admin/profiling"
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует выбранные запросы (см. RequestProfiler).
+
+    Чистый ASGI middleware, а не BaseHTTPMiddleware: при выключенном профилировании
+    запрос проходит дальше после проверки одного флага, без обёрток над телом ответа.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            not request_profiler.enabled
+            or scope["type"] != "http"
+            or scope["path"].startswith(EXCLUDED_PREFIX)
+            or not request_profiler.should_profile(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        status_code: Optional[int] = None
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = datetime.now()
+        profiler = request_profiler.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_profiler.save(profiler, scope["method"], scope["path"], status_code, started_at)
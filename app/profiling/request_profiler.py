@@ -0,0 +1,149 @@
+import itertools
+import json
+import random
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Deque, List, Optional, Tuple
+
+from loguru import logger
+
+from db.change_broadcast import change_broadcast_listener, worker_id
+from models.pydantic_response_request_models.profiling_dto import (
+    ProfileFormat,
+    ProfileInfo,
+    ProfilingStatus,
+    ProfilingUpdate,
+)
+from settings import settings
+
+if TYPE_CHECKING:
+    from pyinstrument import Profiler
+    from pyinstrument.session import Session
+
+PROFILING_CHANNEL = "profiling_config"
+
+
+@dataclass
+class ProfileRecord:
+    info: ProfileInfo
+    session: "Session"
+
+
+class RequestProfiler:
+    """
+    Профилирование запросов по требованию (pyinstrument, сэмплирующий профилировщик).
+
+    Админ включает профилирование на время для доли запросов и/или запросов, путь которых
+    подходит под регулярное выражение. Профили хранятся в кольцевом буфере воркера
+    (старые вытесняются) и выгружаются в формате flamegraph (speedscope), HTML или текстом.
+
+    Пока профилирование выключено, middleware проверяет только флаг enabled.
+    Настройка рассылается воркерам через LISTEN/NOTIFY (канал PROFILING_CHANNEL),
+    буфер профилей у каждого воркера свой.
+    """
+
+    def __init__(self, buffer_size: int, interval: float):
+        # единственная проверка на пути запроса при выключенном профилировании
+        self.enabled = False
+        self._interval = interval
+        self._config = ProfilingUpdate(enabled=False)
+        self._route: Optional[re.Pattern] = None
+        self._expires_at: Optional[datetime] = None
+        self._buffer_size = buffer_size
+        self._profiles: Deque[ProfileRecord] = deque(maxlen=buffer_size)
+        self._ids = itertools.count(1)
+
+    def configure(self, config: ProfilingUpdate, expires_at: Optional[datetime] = None):
+        if config.enabled and expires_at is None:
+            expires_at = datetime.now() + timedelta(seconds=config.duration_seconds)
+
+        self._config = config
+        self._route = re.compile(config.route) if config.route else None
+        self._expires_at = expires_at if config.enabled else None
+        self.enabled = config.enabled and config.sample_rate > 0
+        logger.info(
+            f"Профилирование запросов {'включено' if self.enabled else 'выключено'}: "
+            f"доля {config.sample_rate}, маршрут {config.route or '*'}, до {self._expires_at}"
+        )
+
+    def broadcast_payload(self) -> str:
+        return json.dumps({
+            "worker": worker_id(),
+            "config": self._config.model_dump(),
+            "expires_at": self._expires_at.isoformat() if self._expires_at else None,
+        })
+
+    def apply_broadcast(self, payload: str):
+        """Настройка, включённая админом в другом воркере."""
+        message = json.loads(payload)
+        if message["worker"] == worker_id():
+            return
+        expires_at = datetime.fromisoformat(message["expires_at"]) if message["expires_at"] else None
+        self.configure(ProfilingUpdate(**message["config"]), expires_at)
+
+    def should_profile(self, path: str) -> bool:
+        if self._expires_at is not None and datetime.now() >= self._expires_at:
+            self.configure(ProfilingUpdate(enabled=False))
+            return False
+        if self._route is not None and not self._route.search(path):
+            return False
+        return random.random() < self._config.sample_rate
+
+    def start(self) -> "Profiler":
+        # pyinstrument подгружается при первом профилируемом запросе, а не при старте воркера
+        from pyinstrument import Profiler
+
+        # async_mode: в профиль попадает только задача запроса, а не соседние запросы в event loop
+        profiler = Profiler(interval=self._interval, async_mode="enabled")
+        profiler.start()
+        return profiler
+
+    def save(self, profiler: "Profiler", method: str, path: str, status_code: Optional[int], started_at: datetime):
+        session = profiler.stop()
+        info = ProfileInfo(
+            id=next(self._ids),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=round(session.duration * 1000, 2),
+            started_at=started_at,
+            worker=worker_id(),
+        )
+        self._profiles.append(ProfileRecord(info=info, session=session))
+
+    def status(self) -> ProfilingStatus:
+        return ProfilingStatus(
+            **self._config.model_dump(),
+            expires_at=self._expires_at,
+            worker=worker_id(),
+            profiles_count=len(self._profiles),
+            buffer_size=self._buffer_size,
+        )
+
+    def list_profiles(self) -> List[ProfileInfo]:
+        return [record.info for record in reversed(self._profiles)]
+
+    def render(self, profile_id: int, profile_format: ProfileFormat) -> Optional[Tuple[str, str]]:
+        """(содержимое, media type) профиля или None, если он уже вытеснен из буфера."""
+        record = next((record for record in self._profiles if record.info.id == profile_id), None)
+        if record is None:
+            return None
+
+        from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+        if profile_format == ProfileFormat.SPEEDSCOPE:
+            return SpeedscopeRenderer().render(record.session), "application/json"
+        if profile_format == ProfileFormat.HTML:
+            return HTMLRenderer().render(record.session), "text/html"
+        return ConsoleRenderer(unicode=True, color=False).render(record.session), "text/plain"
+
+    def clear(self) -> int:
+        count = len(self._profiles)
+        self._profiles.clear()
+        return count
+
+
+request_profiler = RequestProfiler(settings.PROFILING_BUFFER_SIZE, settings.PROFILING_INTERVAL)
+change_broadcast_listener.subscribe(PROFILING_CHANNEL, request_profiler.apply_broadcast)
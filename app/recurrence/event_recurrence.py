@@ -0,0 +1,63 @@
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+from dateutil.rrule import rrule, rrulestr
+
+from app.core.exceptions import BadRequestError
+from db.unit_of_work import UnitOfWork
+from db.repositories.event_series_repo import EventSeriesRepo
+from settings import settings
+
+# чаще раза в день мероприятия не повторяются - такие правила раздувают таблицу events
+ALLOWED_FREQUENCIES = {"DAILY", "WEEKLY", "MONTHLY", "YEARLY"}
+
+
+def parse_rrule(rule: str, dtstart: datetime) -> rrule:
+    """Разбирает правило повторения RFC 5545 (RRULE) с отсчётом от dtstart."""
+    frequency = re.search(r"FREQ=(\w+)", rule.upper())
+    if not frequency or frequency.group(1) not in ALLOWED_FREQUENCIES:
+        raise BadRequestError(f"Допустимая частота повторения: {', '.join(sorted(ALLOWED_FREQUENCIES))}")
+
+    try:
+        parsed = rrulestr(rule, dtstart=dtstart)
+    except (ValueError, TypeError) as e:
+        raise BadRequestError(f"Некорректное правило повторения: {e}")
+    if not isinstance(parsed, rrule):
+        raise BadRequestError("Ожидается одно правило RRULE")
+    return parsed
+
+
+def occurrence_starts(rule: rrule, after: datetime, until: datetime) -> Tuple[List[datetime], datetime]:
+    """
+    Начала вхождений в (after, until] и новый горизонт материализации.
+    За один раз создаётся не больше EVENTS_RECURRENCE_MAX_OCCURRENCES вхождений -
+    тогда горизонт сдвигается только до последнего из них.
+    """
+    starts = []
+    for start in rule.xafter(after, count=settings.EVENTS_RECURRENCE_MAX_OCCURRENCES, inc=False):
+        if start > until:
+            return starts, until
+        starts.append(start)
+
+    if len(starts) == settings.EVENTS_RECURRENCE_MAX_OCCURRENCES:
+        return starts, starts[-1]
+    return starts, until
+
+
+async def materialize_series(uow: UnitOfWork, until: datetime, series_id: Optional[int] = None) -> int:
+    """
+    Создает вхождения активных серий до until (bulk INSERT ... SELECT на серию) и
+    сдвигает их горизонт. Серии, которые сейчас материализует другая транзакция, пропускаются.
+    Коммит - на вызывающей стороне. Возвращает количество обработанных серий.
+    """
+    series_repo: EventSeriesRepo = uow.event_series
+
+    series_list = await series_repo.lock_series_to_materialize(until, series_id)
+    for series in series_list:
+        rule = parse_rrule(series.rrule, series.dtstart)
+        starts, horizon = occurrence_starts(rule, series.materialized_until, until)
+        await series_repo.materialize_occurrences(series.id, starts, series.duration_minutes)
+        await series_repo.set_materialized_until(series.id, horizon, is_active=rule.after(horizon) is not None)
+
+    return len(series_list)
+
@@ -0,0 +1,181 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from settings import settings
+
+
+@dataclass
+class CachedResponse:
+    """Готовый к отдаче ответ: сериализованное тело и версии тегов на момент чтения из БД"""
+    body: bytes
+    etag: str
+    media_type: str
+    tag_versions: Dict[str, int] = field(default_factory=dict)
+
+
+class ResponseCacheBackend(ABC):
+    """
+    Хранилище закешированных ответов.
+
+    Инвалидация по тегам реализована через версии: запись хранит версии своих тегов,
+    invalidate_tags увеличивает версии, и запись со старыми версиями считается устаревшей.
+    Версии тегов нужно снимать ДО чтения данных из БД (get_tag_versions),
+    тогда ответ, собранный параллельно с записью, не переживёт инвалидацию.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, response: CachedResponse, ttl: int):
+        ...
+
+    @abstractmethod
+    async def get_tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]):
+        ...
+
+    async def close(self):
+        pass
+
+
+class InMemoryCacheBackend(ResponseCacheBackend):
+    """
+    LRU-кеш с TTL в памяти процесса. Каждый воркер держит свою копию.
+
+    Версии тегов (users:{id} и т.п.) копятся с каждой инвалидацией, поэтому, когда их становится
+    больше порога, версии тегов, на которые не ссылается ни одна запись, удаляются. Отсутствующий
+    тег имеет версию _floor; удаляемые версии поднимают его, а не сбрасывают в 0 - иначе ответ,
+    версии которого сняты до инвалидации, снова совпал бы с версией тега. Теги записей всегда
+    хранятся явно (set), поэтому подъём _floor задевает только ответы, собираемые прямо сейчас.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+        self._floor = 0
+        self._min_prune_at = max_entries * 4
+        self._prune_at = self._min_prune_at
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        expires_at, response = item
+        if expires_at < time.monotonic() or response.tag_versions != await self.get_tag_versions(response.tag_versions):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    async def set(self, key: str, response: CachedResponse, ttl: int):
+        for tag in response.tag_versions:
+            self._tag_versions.setdefault(tag, self._floor)
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        self._prune_tag_versions()
+
+    async def get_tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        return {tag: self._tag_versions.get(tag, self._floor) for tag in tags}
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, self._floor) + 1
+        self._prune_tag_versions()
+
+    def _prune_tag_versions(self):
+        if len(self._tag_versions) <= self._prune_at:
+            return
+
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at < now]:
+            del self._entries[key]
+
+        referenced = {tag for _, response in self._entries.values() for tag in response.tag_versions}
+        unreferenced = [tag for tag in self._tag_versions if tag not in referenced]
+        for tag in unreferenced:
+            self._floor = max(self._floor, self._tag_versions.pop(tag))
+        # порог растёт вместе с числом нужных версий - очистка остаётся амортизированно O(1)
+        self._prune_at = max(self._min_prune_at, 2 * len(self._tag_versions))
+
+
+class RedisCacheBackend(ResponseCacheBackend):
+    """
+    Общий для всех воркеров кеш в Redis.
+    TTL - через EXPIRE, вытеснение LRU - политикой сервера (maxmemory-policy allkeys-lru).
+    """
+
+    KEY_PREFIX = "response_cache:"
+    TAG_PREFIX = "response_cache_tag:"
+
+    def __init__(self, redis_url: str):
+        from redis import asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(redis_url)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        stored = await self._redis.hgetall(self.KEY_PREFIX + key)
+        if not stored:
+            return None
+
+        response = CachedResponse(
+            body=stored[b"body"],
+            etag=stored[b"etag"].decode(),
+            media_type=stored[b"media_type"].decode(),
+            tag_versions=json.loads(stored[b"tag_versions"]),
+        )
+        if response.tag_versions != await self.get_tag_versions(response.tag_versions):
+            return None
+        return response
+
+    async def set(self, key: str, response: CachedResponse, ttl: int):
+        redis_key = self.KEY_PREFIX + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(redis_key, mapping={
+                "body": response.body,
+                "etag": response.etag,
+                "media_type": response.media_type,
+                "tag_versions": json.dumps(response.tag_versions),
+            })
+            pipe.expire(redis_key, ttl)
+            await pipe.execute()
+
+    async def get_tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        versions = await self._redis.mget([self.TAG_PREFIX + tag for tag in tags])
+        return {tag: int(version or 0) for tag, version in zip(tags, versions)}
+
+    async def invalidate_tags(self, tags: Iterable[str]):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self.TAG_PREFIX + tag)
+            await pipe.execute()
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def create_cache_backend() -> ResponseCacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL)
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND: {settings.RESPONSE_CACHE_BACKEND}")
+
+
+response_cache_backend = create_cache_backend()
@@ -0,0 +1,123 @@
+import hashlib
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.response_cache.cache_backends import CachedResponse, response_cache_backend
+from db.unit_of_work import register_commit_listener
+from settings import settings
+
+'''
+Кешируемые маршруты: регулярное выражение пути -> функция, возвращающая теги ответа.
+Теги связывают ответ с сущностями, изменения которых должны его инвалидировать
+(см. invalidate_response_cache).
+'''
+CACHED_ROUTES: List[Tuple[re.Pattern, Callable[[re.Match], List[str]]]] = [
+    (re.compile(r"^/v1/public/events/?$"), lambda match: ["events"]),
+    (re.compile(r"^/v1/public/tags/?$"), lambda match: ["tags"]),
+    (re.compile(r"^/v1/public/skills/?$"), lambda match: ["skills"]),
+    (re.compile(r"^/v1/public/users/(?P<user_id>\d+)/?$"), lambda match: [f"users:{match['user_id']}", "users"]),
+]
+
+
+def _match_route(path: str) -> Optional[List[str]]:
+    for pattern, tags_factory in CACHED_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return tags_factory(match)
+    return None
+
+
+def _cache_key(request: Request) -> str:
+    """Ключ кеша: путь + отсортированные параметры запроса без пустых значений"""
+    params = sorted((k, v) for k, v in parse_qsl(request.url.query) if v != "")
+    return f"{request.url.path.rstrip('/')}?{urlencode(params)}"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _cached_response(request: Request, cached: CachedResponse) -> Response:
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_TTL}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Кеш ответов анонимных публичных эндпоинтов (CACHED_ROUTES).
+
+    Хранит уже сериализованное JSON-тело, отдаёт ETag и Cache-Control,
+    на совпавший If-None-Match отвечает 304 без тела.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET":
+            return await call_next(request)
+
+        tags = _match_route(request.url.path)
+        if tags is None:
+            return await call_next(request)
+
+        key = _cache_key(request)
+        try:
+            cached = await response_cache_backend.get(key)
+            if cached is not None:
+                return _cached_response(request, cached)
+            # версии снимаются до похода в БД - см. ResponseCacheBackend
+            tag_versions = await response_cache_backend.get_tag_versions(tags)
+        except Exception as e:
+            logger.error(f"Кеш ответов недоступен, запрос идёт мимо кеша: {e}")
+            return await call_next(request)
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        cached = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            media_type=response.headers.get("content-type", "application/json"),
+            tag_versions=tag_versions,
+        )
+        try:
+            await response_cache_backend.set(key, cached, settings.RESPONSE_CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Не удалось сохранить ответ в кеш: {e}")
+
+        return _cached_response(request, cached)
+
+
+@register_commit_listener
+async def invalidate_response_cache(changes: Dict[str, Set[Optional[int]]]):
+    """Инвалидирует теги кеша ответов по сущностям, изменённым в зафиксированной транзакции."""
+    tags: Set[str] = set()
+
+    if "events" in changes:
+        tags.add("events")
+    if "tags" in changes:
+        # в списке мероприятий выводятся названия тегов
+        tags.update({"tags", "events"})
+    if "skills" in changes:
+        tags.add("skills")
+    if "users" in changes:
+        # в списке мероприятий выводятся имя и аватар организатора
+        tags.add("events")
+        for user_id in changes["users"]:
+            tags.add("users" if user_id is None else f"users:{user_id}")
+
+    if tags:
+        await response_cache_backend.invalidate_tags(tags)
@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+from loguru import logger
+from pydantic import BaseModel
+
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY, register_commit_listener
+from settings import settings
+
+
+class SingleFlight:
+    """
+    Схлопывание одинаковых параллельных чтений в пределах воркера (single-flight):
+    первый запрос запускает вызов, остальные с тем же ключом ждут его и получают тот же результат.
+    Дополнительно результат живёт ttl секунд (микро-TTL) - до первого коммита с изменениями.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        # растёт при инвалидации - результаты вызовов, начатых до неё, не сохраняются
+        self._generation = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._execute(key, call, ttl))
+            # ошибку забирает хотя бы колбэк - даже если все ожидающие запросы отменены
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._in_flight[key] = task
+
+        # отмена одного запроса (клиент отключился) не отменяет общий вызов для остальных
+        return await asyncio.shield(task)
+
+    async def _execute(self, key: Hashable, call: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        generation = self._generation
+        try:
+            result = await call()
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+        if ttl > 0 and generation == self._generation:
+            self._store(key, result, ttl)
+        return result
+
+    def _store(self, key: Hashable, result: Any, ttl: float):
+        now = time.monotonic()
+        if len(self._results) >= self._max_entries:
+            self._results = {k: v for k, v in self._results.items() if v[0] > now}
+            if len(self._results) >= self._max_entries:
+                self._results.pop(next(iter(self._results)))
+        self._results[key] = (now + ttl, result)
+
+    def invalidate(self):
+        """Сбрасывает сохранённые результаты; новые запросы не присоединяются к уже идущим вызовам."""
+        self._generation += 1
+        self._results.clear()
+        self._in_flight.clear()
+
+
+single_flight_calls = SingleFlight(settings.SINGLE_FLIGHT_MAX_ENTRIES)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Хешируемое представление аргументов для ключа вызова."""
+    if isinstance(value, BaseModel):
+        return type(value).__name__, value.model_dump_json()
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    return value
+
+
+def single_flight(ttl: Optional[float] = None):
+    """
+    Декоратор метода сервиса только для чтения: одинаковые параллельные вызовы (метод + аргументы)
+    выполняются один раз. Общий вызов идёт в собственной сессии и UnitOfWork, а не в сессии
+    запроса-инициатора, поэтому его отмена или ошибка не затрагивает остальных.
+    ttl - микро-TTL результата в секундах (по умолчанию SINGLE_FLIGHT_TTL, 0 - только схлопывание).
+    """
+    def decorator(method):
+        name = method.__qualname__
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = (name, _freeze(args), _freeze(kwargs))
+            service_cls = type(self)
+
+            async def call():
+                async with db_manager.get_session() as session:
+                    return await method(service_cls(UnitOfWork(session, REPOSITORY_REGISTRY)), *args, **kwargs)
+
+            return await single_flight_calls.run(key, call, settings.SINGLE_FLIGHT_TTL if ttl is None else ttl)
+
+        return wrapper
+    return decorator
+
+
+@register_commit_listener
+async def invalidate_single_flight(changes: Dict[str, Set[Optional[int]]]):
+    """Любой коммит с изменениями сбрасывает результаты микро-TTL этого воркера."""
+    single_flight_calls.invalidate()
+    logger.debug(f"Сброшены результаты single-flight: {', '.join(changes)}")
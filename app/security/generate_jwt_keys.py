@@ -1,13 +1,15 @@
 import os
 import time
 import jwt
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
 from functools import lru_cache
 from app.core.exceptions import InternalServerError
 from settings import settings
 
 def generate_jwt_keys():
+    # генерация нужна только entrypoint-у при первом запуске - воркер не импортирует rsa
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
     os.makedirs(settings.DEFAULT_DIR, exist_ok=True)
 
     private_key = rsa.generate_private_key(
@@ -28,11 +30,27 @@ def generate_jwt_keys():
         format=serialization.PublicFormat.SubjectPublicKeyInfo,
     )
 
-    with open(settings.JWT_PRIVATE_KEY_PATH, "wb") as f:
-        f.write(private_pem)
+    # запись через временный файл: уже запущенный воркер не прочитает ключ наполовину
+    _write_atomic(settings.JWT_PRIVATE_KEY_PATH, private_pem)
+    _write_atomic(settings.JWT_PUBLIC_KEY_PATH, public_pem)
+
+def _write_atomic(path: str, content: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def ensure_jwt_keys() -> bool:
+    """
+    Генерирует пару ключей, только если её ещё нет. Ключи переживают перезапуск и деплой,
+    все воркеры подписывают и проверяют токены одной парой. Для ротации удалите файлы ключей.
+    Возвращает True, если пара создана заново.
+    """
+    if os.path.exists(settings.JWT_PRIVATE_KEY_PATH) and os.path.exists(settings.JWT_PUBLIC_KEY_PATH):
+        return False
 
-    with open(settings.JWT_PUBLIC_KEY_PATH, "wb") as f:
-        f.write(public_pem)
+    generate_jwt_keys()
+    return True
 
 @lru_cache(maxsize=1)
 def get_public_jwt_key() -> bytes:
@@ -44,6 +62,17 @@ def get_private_jwt_key() -> bytes:
     with open(settings.JWT_PRIVATE_KEY_PATH, "rb") as f:
         return f.read()
 
+def load_jwt_keys():
+    """
+    Проверка при старте воркера: пара ключей читается в кеш, первый запрос не ждёт диска.
+    Ключи не создаются - при нескольких воркерах каждый создал бы свою пару (это делает entrypoint).
+    """
+    try:
+        get_private_jwt_key()
+        get_public_jwt_key()
+    except OSError as e:
+        raise RuntimeError(f"Ключи JWT не найдены, создайте их через ensure_jwt_keys(): {e}") from e
+
 def reset_cached_keys():
     get_private_jwt_key.cache_clear()
     get_public_jwt_key.cache_clear()
@@ -1,10 +1,17 @@
-from passlib.context import CryptContext
+from functools import lru_cache
+from tracing.tracer import traced
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # passlib и argon2 подгружаются при первом хешировании, а не при старте воркера
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
+@traced("password.hash")
 def hash_pwd(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
+@traced("password.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
+    return get_pwd_context().verify(plain_password, hashed_password)
@@ -1,15 +1,25 @@
 from typing import List, Optional
 from datetime import datetime
 from app.core.exceptions import NotFoundError, PermissionDeniedError
+from sqlalchemy import func, select
+from app.discovery.events_discovery_index import events_discovery_index
+from app.profiling.request_profiler import PROFILING_CHANNEL, request_profiler
 from app.services.services_factory import BaseService, register_services
 from db.repositories.roles_repo import RolesRepo
 from db.repositories.user_repo import UserRepo
 from db.repositories.events_repo import EventsRepo
 from db.repositories.applications_repo import ApplicationsRepo
-from models.pydantic_response_request_models.role_dto import RoleRead
+from models.pydantic_response_request_models.role_dto import RoleRead, RolesBulkAssign
 from models.pydantic_response_request_models.user_dto import UserListResponse, UserCabinetInfo
 from models.pydantic_response_request_models.event_dto import EventStatus, EventFilters
 from models.pydantic_response_request_models.application_dto import ApplicationStatus
+from models.pydantic_response_request_models.profiling_dto import (
+    ProfileFormat,
+    ProfileListResponse,
+    ProfilingStatus,
+    ProfilingUpdate,
+)
+from settings import settings
 
 
 @register_services("admin")
@@ -96,7 +106,7 @@ class AdminService(BaseService):
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
             
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -113,7 +123,7 @@ class AdminService(BaseService):
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
             
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -138,29 +148,58 @@ class AdminService(BaseService):
             roles_repo: RolesRepo = self.uow.roles
             user_repo: UserRepo = self.uow.users
             
-            # 1. Получаем текущие роли
-            current_roles = await roles_repo.get_user_roles(user_id)
-            current_role_ids = {r.id for r in current_roles}
-            new_role_ids = {r.id for r in new_roles}
+            await roles_repo.set_user_roles(user_id, [role.id for role in new_roles])
 
-            # 2. Вычисляем разницу
-            roles_to_add = new_role_ids - current_role_ids
-            roles_to_remove = current_role_ids - new_role_ids
-
-            # 3. Применяем изменения
-            for role_id in roles_to_add:
-                await roles_repo.add_role_to_user(user_id, role_id)
-                
-            for role_id in roles_to_remove:
-                await roles_repo.remove_role_from_user(user_id, role_id)
-
-            # 4. Возвращаем обновленного пользователя
             new_user = await user_repo.get_user_cabinet_info(user_id)
             await self.uow.commit()
             
         return new_user
 
+    async def assign_roles(self, data: RolesBulkAssign) -> dict:
+        """Выдает роли сразу многим пользователям (одним выражением, уже выданные пропускаются)"""
+        async with self.uow:
+            roles_repo: RolesRepo = self.uow.roles
+            assigned = await roles_repo.add_roles_to_users(data.user_ids, data.role_ids)
+            await self.uow.commit()
+
+        return {"message": f"Назначено ролей: {assigned}", "assigned": assigned}
+
     async def get_all_roles(self):
         async with self.uow:
             roles_repo: RolesRepo = self.uow.roles
             return await roles_repo.get_all_roles()
+
+    async def rebuild_discovery_index(self) -> dict:
+        """Полностью перестраивает in-memory индекс публичных мероприятий"""
+        indexed_count = await events_discovery_index.rebuild()
+        return {"message": "Индекс мероприятий перестроен", "indexed_events": indexed_count}
+
+    async def get_profiling_status(self) -> ProfilingStatus:
+        """Текущая настройка профилирования запросов"""
+        return request_profiler.status()
+
+    async def set_profiling(self, config: ProfilingUpdate) -> ProfilingStatus:
+        """Включает/выключает профилирование запросов во всех воркерах"""
+        request_profiler.configure(config)
+        if settings.CHANGE_BROADCAST_ENABLED:
+            async with self.uow:
+                await self.uow.session.execute(
+                    select(func.pg_notify(PROFILING_CHANNEL, request_profiler.broadcast_payload()))
+                )
+                await self.uow.commit()
+        return request_profiler.status()
+
+    async def get_profiles(self) -> ProfileListResponse:
+        """Профили запросов из буфера воркера"""
+        return ProfileListResponse(items=request_profiler.list_profiles(), worker=request_profiler.status().worker)
+
+    async def get_profile(self, profile_id: int, profile_format: ProfileFormat) -> tuple[str, str]:
+        """Профиль запроса в формате выгрузки: (содержимое, media type)"""
+        rendered = request_profiler.render(profile_id, profile_format)
+        if rendered is None:
+            raise NotFoundError(f"Профиль с ID {profile_id} не найден в буфере воркера")
+        return rendered
+
+    async def clear_profiles(self) -> dict:
+        """Очищает буфер профилей воркера"""
+        return {"message": "Буфер профилей очищен", "deleted": request_profiler.clear()}
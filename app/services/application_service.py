@@ -1,3 +1,6 @@
+from typing import AsyncIterator, Optional
+from app.admission.event_admission import admit_applications, reject_applications, cancel_application
+from app.bulk_io.bulk_formats import BulkFormat, stream_rows
 from app.core.exceptions import NotFoundError, PermissionDeniedError, AlreadyExistsError, BadRequestError
 from app.services.services_factory import BaseService, register_services
 from db.repositories.applications_repo import ApplicationsRepo
@@ -9,9 +12,11 @@ from models.pydantic_response_request_models.application_dto import (
     ApplicationFilters,
     ApplicationListResponse,
     ApplicationBulkApprove,
-    ApplicationBulkReject
+    ApplicationBulkReject,
+    ApplicationExportRow
 )
 from sqlalchemy.exc import IntegrityError
+from settings import settings
 
 
 @register_services("applications")
@@ -24,7 +29,7 @@ class ApplicationService(BaseService):
             applications_repo: ApplicationsRepo = self.uow.applications
             
             # Проверяем, что мероприятие существует и имеет статус approved
-            event = await events_repo.get_event_by_id(app_data.event_id)
+            event = await events_repo.get_event_header(app_data.event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {app_data.event_id} не найдено")
             
@@ -71,7 +76,7 @@ class ApplicationService(BaseService):
                 raise NotFoundError(f"Заявка с ID {app_id} не найдена")
             
             # Получаем мероприятие для проверки прав
-            event = await events_repo.get_event_by_id(application.event_id)
+            event = await events_repo.get_event_header(application.event_id)
             
             # Проверка прав
             if status in [ApplicationStatus.APPROVED, ApplicationStatus.REJECTED]:
@@ -85,9 +90,25 @@ class ApplicationService(BaseService):
             else:
                 raise BadRequestError(f"Недопустимый статус: {status}")
             
-            success = await applications_repo.update_application_status(app_id, status)
-            await self.uow.commit()
-            
+            if status == ApplicationStatus.APPROVED:
+                result = await admit_applications(self.uow, user_id, [app_id])
+                await self.uow.commit()
+                waitlisted = app_id in result.waitlisted or application.status == ApplicationStatus.WAITLISTED
+                if app_id not in result.approved and waitlisted:
+                    return {
+                        "message": "Свободных мест нет, заявка добавлена в лист ожидания",
+                        "success": False,
+                        "status": ApplicationStatus.WAITLISTED
+                    }
+                success = app_id in result.approved
+            else:
+                if status == ApplicationStatus.REJECTED:
+                    result = await reject_applications(self.uow, user_id, [app_id])
+                else:
+                    result = await cancel_application(self.uow, application.event_id, app_id)
+                await self.uow.commit()
+                success = app_id in result.released
+
             return {"message": f"Статус заявки изменён на {status}", "success": success}
     
     async def get_my_applications(self, volunteer_id: int, page: int = 1, page_size: int = 20) -> ApplicationListResponse:
@@ -112,7 +133,7 @@ class ApplicationService(BaseService):
             applications_repo: ApplicationsRepo = self.uow.applications
             
             # Проверяем, что пользователь - организатор этого мероприятия
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -128,46 +149,69 @@ class ApplicationService(BaseService):
             applications = await applications_repo.get_paginated_applications(filters)
             return applications
     
-    async def bulk_approve_applications(self, data: ApplicationBulkApprove, organizer_id: int) -> dict:
-        """Массовое одобрение заявок (только организатор)"""
+    async def export_event_applications(
+        self,
+        event_id: int,
+        organizer_id: int,
+        status: Optional[ApplicationStatus],
+        file_format: BulkFormat
+    ) -> AsyncIterator[bytes]:
+        """
+        Выгрузка всех заявок на мероприятие с контактами волонтёров (только для организатора).
+        Права проверяются до начала выдачи - ошибка возвращается обычным ответом, а не обрывом потока.
+        """
         async with self.uow:
-            applications_repo: ApplicationsRepo = self.uow.applications
             events_repo: EventsRepo = self.uow.events
-            
-            # Проверяем права для каждой заявки (берём первую для проверки мероприятия)
-            if data.application_ids:
-                first_app = await applications_repo.get_application_by_id(data.application_ids[0])
-                if first_app:
-                    event = await events_repo.get_event_by_id(first_app.event_id)
-                    if event.organizer_id != organizer_id:
-                        raise PermissionDeniedError("Вы можете одобрять заявки только на свои мероприятия")
-            
-            approved_count = await applications_repo.bulk_approve_applications(data.application_ids)
+
+            event = await events_repo.get_event_header(event_id)
+            if not event:
+                raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
+
+            if event.organizer_id != organizer_id:
+                raise PermissionDeniedError("Вы можете выгружать заявки только своих мероприятий")
+
+        return self._stream_event_applications(event_id, status, file_format)
+
+    async def _stream_event_applications(
+        self,
+        event_id: int,
+        status: Optional[ApplicationStatus],
+        file_format: BulkFormat
+    ) -> AsyncIterator[bytes]:
+        async with self.uow:
+            applications_repo: ApplicationsRepo = self.uow.applications
+            chunks = applications_repo.stream_event_applications(
+                event_id, status, settings.APPLICATIONS_EXPORT_CHUNK_SIZE
+            )
+            async for data in stream_rows(chunks, file_format, ApplicationExportRow):
+                yield data
+
+    async def bulk_approve_applications(self, data: ApplicationBulkApprove, organizer_id: int) -> dict:
+        """
+        Массовое одобрение заявок (только организатор).
+        Владение проверяется для каждой заявки в самом UPDATE - заявки чужих мероприятий не изменяются.
+        Одобряется не больше свободных мест мероприятия, остальные заявки - в лист ожидания.
+        """
+        async with self.uow:
+            result = await admit_applications(self.uow, organizer_id, data.application_ids)
             await self.uow.commit()
-            
+
             return {
-                "message": f"Одобрено заявок: {approved_count}",
-                "approved_count": approved_count
+                "message": f"Одобрено заявок: {len(result.approved)}, в листе ожидания: {len(result.waitlisted)}",
+                "approved_count": len(result.approved),
+                "waitlisted_count": len(result.waitlisted)
             }
-    
+
     async def bulk_reject_applications(self, data: ApplicationBulkReject, organizer_id: int) -> dict:
-        """Массовое отклонение заявок (только организатор)"""
+        """
+        Массовое отклонение заявок (только организатор).
+        Владение проверяется для каждой заявки в самом UPDATE, освободившиеся места занимает лист ожидания.
+        """
         async with self.uow:
-            applications_repo: ApplicationsRepo = self.uow.applications
-            events_repo: EventsRepo = self.uow.events
-            
-            # Проверяем права
-            if data.application_ids:
-                first_app = await applications_repo.get_application_by_id(data.application_ids[0])
-                if first_app:
-                    event = await events_repo.get_event_by_id(first_app.event_id)
-                    if event.organizer_id != organizer_id:
-                        raise PermissionDeniedError("Вы можете отклонять заявки только на свои мероприятия")
-            
-            rejected_count = await applications_repo.bulk_reject_applications(data.application_ids)
+            result = await reject_applications(self.uow, organizer_id, data.application_ids)
             await self.uow.commit()
-            
+
             return {
-                "message": f"Отклонено заявок: {rejected_count}",
-                "rejected_count": rejected_count
+                "message": f"Отклонено заявок: {len(result.released)}",
+                "rejected_count": len(result.released)
             }
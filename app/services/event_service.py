@@ -1,6 +1,16 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterable, AsyncIterator, List, Tuple
+from pydantic import ValidationError
+from app.admission.event_admission import fill_from_waitlist
+from app.bulk_io.bulk_formats import BulkFormat, iter_records, stream_rows, format_validation_errors
 from app.core.exceptions import NotFoundError, PermissionDeniedError, BadRequestError
+from app.recurrence.event_recurrence import parse_rrule, materialize_series
+from app.response_cache.single_flight import single_flight
 from app.services.services_factory import BaseService, register_services
 from db.repositories.events_repo import EventsRepo
+from db.repositories.event_series_repo import EventSeriesRepo
+from db.repositories.tags_repo import TagsRepo
+from db.repositories.skills_repo import SkillsRepo
 from models.pydantic_response_request_models.event_dto import (
     EventCreate,
     EventUpdate,
@@ -8,13 +18,22 @@ from models.pydantic_response_request_models.event_dto import (
     EventWithDetails,
     EventFilters,
     EventListResponse,
-    EventStatus
+    EventStatus,
+    EventImportRow,
+    EventImportRowError,
+    EventImportResult,
+    EventExportRow,
+    EventSeriesCreate,
+    EventSeriesUpdate,
+    EventSeriesRead
 )
+from settings import settings
 
 
 @register_services("events")
 class EventService(BaseService):
-    
+
+    @single_flight()
     async def get_event_by_id(self, event_id: int) -> EventWithDetails:
         """Получает детальную информацию о мероприятии"""
         async with self.uow:
@@ -32,13 +51,161 @@ class EventService(BaseService):
             await self.uow.commit()
             return new_event
     
+    async def create_series(self, series_data: EventSeriesCreate, organizer_id: int) -> EventSeriesRead:
+        """
+        Создаёт серию повторяющихся мероприятий.
+        start_date/end_date задают первое вхождение, остальные создаются до горизонта
+        EVENTS_RECURRENCE_HORIZON_DAYS и дальше досоздаются фоновой задачей.
+        """
+        parse_rrule(series_data.rrule, series_data.start_date)
+        duration_minutes = int((series_data.end_date - series_data.start_date).total_seconds() // 60)
+
+        async with self.uow:
+            events_repo: EventsRepo = self.uow.events
+            series_repo: EventSeriesRepo = self.uow.event_series
+
+            series = await series_repo.create_series(
+                organizer_id, series_data.rrule, series_data.start_date, duration_minutes
+            )
+            first_occurrence = EventCreate.model_construct(**series_data.model_dump(exclude={"rrule"}))
+            await events_repo.bulk_create_events([first_occurrence], organizer_id, series_id=series.id)
+
+            horizon = datetime.now() + timedelta(days=settings.EVENTS_RECURRENCE_HORIZON_DAYS)
+            await materialize_series(self.uow, max(horizon, series_data.start_date), series_id=series.id)
+
+            series = await series_repo.get_series(series.id)
+            await self.uow.commit()
+            return series
+
+    async def update_series(self, series_id: int, series_data: EventSeriesUpdate, user_id: int) -> dict:
+        """
+        Изменяет все вхождения серии, начинающиеся с from_date (только организатор).
+        Поля обновляются одним UPDATE, теги и навыки - одним DELETE и одним INSERT на все вхождения.
+        Вхождения, которые будут созданы позже, копируют данные с последнего - изменения сохраняются.
+        """
+        async with self.uow:
+            series_repo: EventSeriesRepo = self.uow.event_series
+
+            series = await series_repo.get_series(series_id)
+            if not series:
+                raise NotFoundError(f"Серия мероприятий с ID {series_id} не найдена")
+
+            if series.organizer_id != user_id:
+                raise PermissionDeniedError("Вы не можете редактировать чужую серию мероприятий")
+
+            occurrence_ids = await series_repo.get_occurrence_ids(series_id, series_data.from_date or datetime.now())
+            values = series_data.model_dump(exclude_unset=True, exclude={"tag_ids", "skill_ids", "from_date"})
+            await series_repo.update_occurrences(occurrence_ids, values)
+            if series_data.required_volunteers is not None:
+                await fill_from_waitlist(self.uow, occurrence_ids)
+            if series_data.tag_ids is not None:
+                await series_repo.replace_occurrences_tags(occurrence_ids, series_data.tag_ids)
+            if series_data.skill_ids is not None:
+                await series_repo.replace_occurrences_skills(occurrence_ids, series_data.skill_ids)
+
+            await self.uow.commit()
+            return {"message": "Серия мероприятий обновлена", "updated": len(occurrence_ids)}
+
+    async def end_series(self, series_id: int, user_id: int) -> dict:
+        """Завершает серию (только организатор): новые вхождения не создаются, будущие отменяются."""
+        async with self.uow:
+            series_repo: EventSeriesRepo = self.uow.event_series
+
+            series = await series_repo.get_series(series_id)
+            if not series:
+                raise NotFoundError(f"Серия мероприятий с ID {series_id} не найдена")
+
+            if series.organizer_id != user_id:
+                raise PermissionDeniedError("Вы не можете завершить чужую серию мероприятий")
+
+            await series_repo.deactivate_series(series_id)
+            occurrence_ids = await series_repo.get_occurrence_ids(series_id, datetime.now())
+            canceled = await series_repo.cancel_occurrences(occurrence_ids)
+
+            await self.uow.commit()
+            return {"message": "Серия мероприятий завершена", "canceled": canceled}
+
+    async def import_events(self, body: AsyncIterable[bytes], file_format: BulkFormat, organizer_id: int) -> EventImportResult:
+        """
+        Массовый импорт мероприятий из CSV/NDJSON.
+        Тело читается потоком, строки валидируются и вставляются пачками по EVENTS_BULK_CHUNK_SIZE.
+        Строки с ошибками пропускаются и попадают в отчёт, остальные создаются одной транзакцией.
+        """
+        result = EventImportResult(created=0)
+
+        async with self.uow:
+            chunk: List[Tuple[int, EventImportRow]] = []
+            rows_count = 0
+
+            async for line, record, error in iter_records(body, file_format):
+                rows_count += 1
+                if rows_count > settings.EVENTS_BULK_MAX_ROWS:
+                    raise BadRequestError(f"Слишком много строк для импорта, максимум {settings.EVENTS_BULK_MAX_ROWS}")
+
+                if error:
+                    result.errors.append(EventImportRowError(line=line, errors=[error]))
+                    continue
+                try:
+                    chunk.append((line, EventImportRow.model_validate(record)))
+                except ValidationError as e:
+                    result.errors.append(EventImportRowError(line=line, errors=format_validation_errors(e)))
+                    continue
+
+                if len(chunk) >= settings.EVENTS_BULK_CHUNK_SIZE:
+                    await self._import_chunk(chunk, organizer_id, result)
+                    chunk = []
+
+            await self._import_chunk(chunk, organizer_id, result)
+            await self.uow.commit()
+
+        return result
+
+    async def _import_chunk(self, chunk: List[Tuple[int, EventImportRow]], organizer_id: int, result: EventImportResult):
+        """Резолвит названия тегов/навыков пачки одним обращением к справочнику и вставляет события"""
+        if not chunk:
+            return
+
+        events_repo: EventsRepo = self.uow.events
+        tags_repo: TagsRepo = self.uow.tags
+        skills_repo: SkillsRepo = self.uow.skills
+
+        tag_ids = await tags_repo.get_tag_ids_by_names([name for _, row in chunk for name in row.tags])
+        skill_ids = await skills_repo.get_skill_ids_by_names([name for _, row in chunk for name in row.skills])
+
+        events_in: List[EventCreate] = []
+        for line, row in chunk:
+            errors = [f"Неизвестный тег: {name}" for name in row.tags if name not in tag_ids]
+            errors += [f"Неизвестный навык: {name}" for name in row.skills if name not in skill_ids]
+            if errors:
+                result.errors.append(EventImportRowError(line=line, errors=errors))
+                continue
+
+            # строка уже провалидирована как EventBase - повторная валидация не нужна
+            events_in.append(EventCreate.model_construct(
+                **row.model_dump(exclude={"tags", "skills"}),
+                tag_ids=list(dict.fromkeys(tag_ids[name] for name in row.tags)),
+                skill_ids=list(dict.fromkeys(skill_ids[name] for name in row.skills))
+            ))
+
+        event_ids = await events_repo.bulk_create_events(events_in, organizer_id)
+        result.event_ids.extend(event_ids)
+        result.created += len(event_ids)
+
+    async def export_events(self, organizer_id: int, file_format: BulkFormat) -> AsyncIterator[bytes]:
+        """Потоковый экспорт мероприятий организатора в формате, совместимом с импортом"""
+        async with self.uow:
+            events_repo: EventsRepo = self.uow.events
+            chunks = events_repo.stream_organizer_events(organizer_id, settings.EVENTS_BULK_CHUNK_SIZE)
+            async for data in stream_rows(chunks, file_format, EventExportRow):
+                yield data
+
     async def update_event(self, event_id: int, event_data: EventUpdate, user_id: int) -> EventRead:
         """Обновляет мероприятие (только организатор этого мероприятия)"""
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
             
             # Проверяем, что мероприятие существует и пользователь - его организатор
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -46,6 +213,9 @@ class EventService(BaseService):
                 raise PermissionDeniedError("Вы не можете редактировать чужое мероприятие")
             
             updated_event = await events_repo.update_event(event_id, event_data)
+            if event_data.required_volunteers is not None:
+                # лимит вырос - свободные места занимает лист ожидания
+                await fill_from_waitlist(self.uow, [event_id])
             await self.uow.commit()
             return updated_event
     
@@ -54,7 +224,7 @@ class EventService(BaseService):
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
             
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -89,7 +259,7 @@ class EventService(BaseService):
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
             
-            event = await events_repo.get_event_by_id(event_id)
+            event = await events_repo.get_event_header(event_id)
             if not event:
                 raise NotFoundError(f"Мероприятие с ID {event_id} не найдено")
             
@@ -1,4 +1,7 @@
+from datetime import datetime
 from app.core.exceptions import NotFoundError
+from app.discovery.events_discovery_index import events_discovery_index
+from app.response_cache.single_flight import single_flight
 from app.services.services_factory import BaseService, register_services
 from db.repositories.user_repo import UserRepo
 from db.repositories.events_repo import EventsRepo
@@ -13,32 +16,57 @@ from typing import List
 
 @register_services("public")
 class PublicService(BaseService):
-    
+
+    @single_flight()
     async def get_public_events(
         self,
         location: str = None,
+        search: str = None,
         tag_ids: list[int] = None,
+        skill_ids: list[int] = None,
+        start_date_from: datetime = None,
+        start_date_to: datetime = None,
         page: int = 1,
         page_size: int = 20
     ) -> EventListResponse:
         """
         Получает список одобренных мероприятий для публичной страницы.
         Показываются только мероприятия со статусом 'approved'.
+        Фильтрация идёт по in-memory индексу (из БД читается только страница),
+        полнотекстовый поиск и случай непостроенного индекса обслуживает БД.
         """
         async with self.uow:
             events_repo: EventsRepo = self.uow.events
-            
+
+            if events_discovery_index.is_ready and not search:
+                event_ids, total = events_discovery_index.search(
+                    location=location,
+                    tag_ids=tag_ids,
+                    skill_ids=skill_ids,
+                    start_date_from=start_date_from,
+                    start_date_to=start_date_to,
+                    offset=(page - 1) * page_size,
+                    limit=page_size
+                )
+                events = await events_repo.get_event_list_items_by_ids(event_ids)
+                return EventListResponse(events=events, total=total, page=page, page_size=page_size)
+
             filters = EventFilters(
                 status=EventStatus.APPROVED,
                 location=location,
+                search=search,
                 tag_ids=tag_ids,
+                skill_ids=skill_ids,
+                start_date_from=start_date_from,
+                start_date_to=start_date_to,
                 page=page,
                 page_size=page_size
             )
             
             events = await events_repo.get_paginated_events(filters)
             return events
-    
+
+    @single_flight()
     async def get_public_user_profile(self, user_id: int) -> UserPublic:
         """Получает публичный профиль пользователя"""
         async with self.uow:
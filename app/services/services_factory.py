@@ -3,6 +3,8 @@ from typing import Dict, Type
 from fastapi import Depends
 from loguru import logger
 from db.unit_of_work import UnitOfWork, get_uow
+from app.metrics.red_metrics import measure_service_calls
+from tracing.tracer import instrument_class
 
 
 class BaseService(ABC):
@@ -36,8 +38,8 @@ SERVICES_REGISTRY = {}
 
 def register_services(name:str):
     def decorator(cls:Type[BaseService]):
-        SERVICES_REGISTRY[name] = cls
-        return cls
+        SERVICES_REGISTRY[name] = instrument_class(measure_service_calls(cls, name), {"app.service": name})
+        return SERVICES_REGISTRY[name]
     return decorator
 
 async def get_services(
@@ -30,8 +30,7 @@ class UserService(BaseService):
 
             await user_repo.update_user(user_update)
             await user_skills_repo.update_user_skills(user_update.id, user_update.skills)
-            for role in user_update.roles:
-                await roles_repo.add_role_to_user(user_update.id, role.id)
+            await roles_repo.add_roles_to_users([user_update.id], [role.id for role in user_update.roles])
 
             new_user_info = await user_repo.get_user_cabinet_info(user_update.id)
             await self.uow.commit()
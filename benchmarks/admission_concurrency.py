@@ -0,0 +1,103 @@
+"""
+Проверка одобрения заявок под нагрузкой: сотни параллельных одобрений
+на мероприятие с лимитом волонтёров не должны превышать required_volunteers.
+
+Нужна БД из настроек (.env) с применёнными миграциями. Скрипт создаёт организатора,
+волонтёров, мероприятие и заявки, одобряет все заявки параллельно (каждое одобрение -
+отдельная сессия и транзакция, как отдельный HTTP-запрос), проверяет итог и удаляет данные.
+
+Запуск из корня репозитория:
+    python -m benchmarks.admission_concurrency --applications 300 --capacity 25
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from app.services.application_service import ApplicationService
+from db.manager import db_manager
+from db.unit_of_work import UnitOfWork, REPOSITORY_REGISTRY
+from models.orm_db_models.tables import Applications, Events, Users
+from models.pydantic_response_request_models.application_dto import ApplicationStatus
+
+
+async def create_fixture(applications: int, capacity: int) -> tuple[int, int, list[int], list[int]]:
+    marker = uuid.uuid4().hex[:8]
+    async with db_manager.get_session() as session:
+        user_ids = (await session.scalars(
+            insert(Users).returning(Users.id),
+            [
+                {"fullname": f"admission-{marker}-{i}", "hashed_password": "-", "email": f"admission-{marker}-{i}@example.com"}
+                for i in range(applications + 1)
+            ]
+        )).all()
+        organizer_id, volunteer_ids = user_ids[0], user_ids[1:]
+
+        start = datetime.now() + timedelta(days=7)
+        event_id = await session.scalar(
+            insert(Events).returning(Events.id).values(
+                organizer_id=organizer_id,
+                title=f"admission-{marker}",
+                description="Проверка одобрения заявок",
+                location="Москва",
+                required_volunteers=capacity,
+                start_date=start,
+                end_date=start + timedelta(hours=4),
+                status="approved"
+            )
+        )
+        app_ids = (await session.scalars(
+            insert(Applications).returning(Applications.id),
+            [{"event_id": event_id, "volunteer_id": volunteer_id} for volunteer_id in volunteer_ids]
+        )).all()
+        await session.commit()
+    return organizer_id, event_id, list(app_ids), list(user_ids)
+
+
+async def approve(app_id: int, organizer_id: int) -> dict:
+    async with db_manager.get_session() as session:
+        service = ApplicationService(UnitOfWork(session, REPOSITORY_REGISTRY))
+        return await service.update_application_status(app_id, ApplicationStatus.APPROVED, organizer_id)
+
+
+async def main(applications: int, capacity: int):
+    async with db_manager:
+        organizer_id, event_id, app_ids, user_ids = await create_fixture(applications, capacity)
+        try:
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(approve(app_id, organizer_id) for app_id in app_ids), return_exceptions=True
+            )
+            elapsed = time.perf_counter() - started
+
+            async with db_manager.get_session() as session:
+                approved = await session.scalar(
+                    select(func.count()).select_from(Applications)
+                    .where(Applications.event_id == event_id, Applications.status == ApplicationStatus.APPROVED)
+                )
+                waitlisted = await session.scalar(
+                    select(func.count()).select_from(Applications)
+                    .where(Applications.event_id == event_id, Applications.status == ApplicationStatus.WAITLISTED)
+                )
+                counter = await session.scalar(select(Events.approved_volunteers_count).where(Events.id == event_id))
+        finally:
+            async with db_manager.get_session() as session:
+                await session.execute(delete(Users).where(Users.id.in_(user_ids)))
+                await session.commit()
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    print(f"одобрений: {len(app_ids)} за {elapsed:.2f} с ({len(app_ids) / elapsed:.0f} в секунду), ошибок: {len(errors)}")
+    print(f"одобрено: {approved}, в листе ожидания: {waitlisted}, счётчик: {counter}, лимит: {capacity}")
+    assert approved == counter == min(capacity, len(app_ids)), "Лимит волонтёров превышен или счётчик разошёлся"
+    assert approved + waitlisted == len(app_ids), "Часть заявок не обработана"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=300)
+    parser.add_argument("--capacity", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(main(args.applications, args.capacity))
@@ -0,0 +1,290 @@
+"""
+Сценарная нагрузка на ключевые эндпоинты API: публичный список мероприятий, карточка мероприятия,
+кабинет, список заявок волонтёра, вход.
+
+Для каждого сценария считаются p50/p95/p99 задержки, RPS, доля ошибок и SQL-запросов на HTTP-запрос.
+По умолчанию приложение работает in-process (httpx.ASGITransport, с lifespan) - тогда запросы
+к БД считаются по каждому HTTP-запросу. С --base-url нагрузка идёт на запущенный сервер,
+SQL-запросы не считаются.
+
+Результат сохраняется в JSON (benchmarks/results/<время>-<коммит>.json); --compare
+сравнивает прогон с сохранённым результатом другого коммита.
+
+Нужна БД из настроек (.env) с данными benchmarks.seed_data.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api_load --requests 2000 --concurrency 32
+    python -m benchmarks.api_load --scenarios public_events event_details --compare benchmarks/results/<файл>.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func, select
+
+from app.security.generate_jwt_keys import create_jwt_token
+from benchmarks.query_counter import count_queries, install_query_counter
+from benchmarks.seed_data import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD
+from db.manager import db_manager
+from models.orm_db_models.tables import Events, Tags, Users
+from models.pydantic_response_request_models.event_dto import EventStatus
+from settings import settings
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+SAMPLE_SIZE = 1000
+
+Request = Tuple[str, str, dict]
+
+
+@dataclass
+class LoadContext:
+    """Данные, из которых сценарии собирают запросы"""
+    event_ids: List[int]
+    locations: List[str]
+    tag_ids: List[int]
+    users: List[Tuple[int, str]]
+    access_tokens: List[str] = field(default_factory=list)
+
+
+def _auth(rnd: random.Random, context: LoadContext) -> dict:
+    return {"headers": {"Cookie": f"{settings.ACCESS_TOKEN_NAME}={rnd.choice(context.access_tokens)}"}}
+
+
+def _login_request(email: str) -> Request:
+    verify_token = create_jwt_token(claims={"email": email}, type=settings.VERIFY_TOKEN_NAME)
+    return "POST", "/v1/auth/login/", {
+        "json": {"email": email, "hashed_password": BENCH_PASSWORD},
+        "headers": {"Cookie": f"{settings.VERIFY_TOKEN_NAME}={verify_token}"},
+    }
+
+
+def public_events(rnd: random.Random, context: LoadContext) -> Request:
+    params = {"page": rnd.randint(1, 20), "page_size": 20}
+    if rnd.random() < 0.3:
+        params["location"] = rnd.choice(context.locations)
+    if rnd.random() < 0.2:
+        params["tag_ids"] = str(rnd.choice(context.tag_ids))
+    return "GET", "/v1/public/events", {"params": params}
+
+
+def event_details(rnd: random.Random, context: LoadContext) -> Request:
+    return "GET", f"/v1/events/{rnd.choice(context.event_ids)}", _auth(rnd, context)
+
+
+def cabinet(rnd: random.Random, context: LoadContext) -> Request:
+    return "GET", "/v1/users/info", _auth(rnd, context)
+
+
+def applications_list(rnd: random.Random, context: LoadContext) -> Request:
+    return "GET", "/v1/applications/my/list", {"params": {"page": 1, "page_size": 20}, **_auth(rnd, context)}
+
+
+def login(rnd: random.Random, context: LoadContext) -> Request:
+    return _login_request(rnd.choice(context.users)[1])
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, LoadContext], Request]] = {
+    "public_events": public_events,
+    "event_details": event_details,
+    "cabinet": cabinet,
+    "applications_list": applications_list,
+    "login": login,
+}
+
+
+async def load_context(client: httpx.AsyncClient, sessions: int) -> LoadContext:
+    async with db_manager.get_session() as session:
+        event_rows = (await session.execute(
+            select(Events.id, Events.location)
+            .where(Events.status == EventStatus.APPROVED)
+            .order_by(func.random())
+            .limit(SAMPLE_SIZE)
+        )).all()
+        tag_ids = list((await session.scalars(select(Tags.id))).all())
+        users = [tuple(row) for row in (await session.execute(
+            select(Users.id, Users.email)
+            .where(Users.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+            .order_by(func.random())
+            .limit(SAMPLE_SIZE)
+        )).all()]
+
+    if not event_rows or not users:
+        raise RuntimeError("Нет данных для нагрузки - запустите python -m benchmarks.seed_data")
+
+    context = LoadContext(
+        event_ids=[row.id for row in event_rows],
+        locations=list({row.location for row in event_rows}),
+        tag_ids=tag_ids,
+        users=users,
+    )
+    for _, email in users[:sessions]:
+        method, url, kwargs = _login_request(email)
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        context.access_tokens.append(response.json()["token"])
+    return context
+
+
+def percentile(sorted_values: List[float], share: float) -> float:
+    """Перцентиль по ближайшему рангу"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(share * len(sorted_values)) - 1)]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    build: Callable[[random.Random, LoadContext], Request],
+    context: LoadContext,
+    requests: int,
+    concurrency: int,
+    seed: int,
+    count_sql: bool
+) -> dict:
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker(rnd: random.Random):
+        nonlocal errors
+        for _ in remaining:
+            method, url, kwargs = build(rnd, context)
+            with count_queries() as statements:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, url, **kwargs)
+                    failed = response.status_code >= 400
+                except httpx.TransportError:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+            queries.append(len(statements))
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(seed + i)) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if count_sql and queries else None,
+        "max_queries_per_request": max(queries) if count_sql and queries else None,
+    }
+
+
+async def run_load(client: httpx.AsyncClient, args, count_sql: bool) -> Dict[str, dict]:
+    context = await load_context(client, args.sessions)
+    results = {}
+    for name in args.scenarios:
+        build = SCENARIOS[name]
+        # прогрев: кеши, пул соединений, JIT планов запросов
+        await run_scenario(client, build, context, args.warmup, args.concurrency, args.seed, count_sql)
+        results[name] = await run_scenario(
+            client, build, context, args.requests, args.concurrency, args.seed, count_sql
+        )
+        print_row(name, results[name])
+    return results
+
+
+async def run_in_process(args) -> Dict[str, dict]:
+    from main import app, lifespan
+
+    async with lifespan(app):
+        install_query_counter(db_manager.engine)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            return await run_load(client, args, count_sql=True)
+
+
+async def run_against_server(args) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with db_manager:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            return await run_load(client, args, count_sql=False)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_header():
+    print(f"{'сценарий':<18} {'запросов':>8} {'ошибок':>6} {'rps':>8} {'p50 мс':>8} {'p95 мс':>8} {'p99 мс':>8} {'SQL/запрос':>10}")
+
+
+def print_row(name: str, result: dict, baseline: Optional[dict] = None):
+    queries = "-" if result["queries_per_request"] is None else f"{result['queries_per_request']:.1f}"
+    print(
+        f"{name:<18} {result['requests']:>8} {result['errors']:>6} {result['rps']:>8.0f} "
+        f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {queries:>10}"
+    )
+    if baseline:
+        changes = [
+            f"{metric} {(result[metric] - baseline[metric]) / baseline[metric] * 100:+.0f}%"
+            for metric in ("rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+            if result.get(metric) is not None and baseline.get(metric)
+        ]
+        print(f"{'':<18} к базовому: {', '.join(changes)}")
+
+
+def compare(results: Dict[str, dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nСравнение с {baseline['commit']} ({baseline['timestamp']}):")
+    print_header()
+    for name, result in results.items():
+        print_row(name, result, baseline["scenarios"].get(name))
+
+
+def main(args):
+    print_header()
+    runner = run_against_server if args.base_url else run_in_process
+    results = asyncio.run(runner(args))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.base_url or "in-process",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{report['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультат: {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="запросов на сценарий")
+    parser.add_argument("--warmup", type=int, default=50, help="запросов прогрева на сценарий")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sessions", type=int, default=50, help="пользователей, под которыми идут запросы с авторизацией")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="адрес запущенного сервера вместо in-process приложения")
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="JSON прошлого прогона для сравнения")
+    main(parser.parse_args())
@@ -0,0 +1,117 @@
+"""
+Нагрузочный тест масштабирования по воркерам: запускает uvicorn с 1, 2, ... N воркерами
+и сравнивает пропускную способность (запросов в секунду) на одном маршруте.
+
+По умолчанию нагружается /v1/public/events: после первого запроса ответ отдаётся из кеша
+ответов, поэтому тест измеряет именно процессную модель, а не БД. При близком к линейному
+масштабировании эффективность (rps_N / (N * rps_1)) держится около 1.
+Генератор нагрузки - несколько процессов, чтобы клиент не стал узким местом;
+запускайте на машине, где ядер хватает и серверу, и клиенту.
+
+Нужна БД из настроек (.env) с применёнными миграциями и Redis (REDIS_URL): при нескольких
+воркерах коды верификации хранятся только в Redis, с VERIFY_CODES_BACKEND=memory воркеры не стартуют.
+
+Запуск из корня репозитория:
+    python -m benchmarks.multi_worker_scaling --workers 1 2 4 --duration 15
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.core.deployment import available_cpus
+from settings import settings
+
+
+async def wait_ready(url: str, timeout: float, server: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn завершился с кодом {server.returncode}, см. лог выше")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Сервер не ответил за {timeout} с: {url}")
+
+
+async def generate_load(url: str, concurrency: int, duration: float) -> tuple[int, int]:
+    deadline = time.monotonic() + duration
+    done = failed = 0
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal done, failed
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(url)
+                if response.status_code == 200:
+                    done += 1
+                else:
+                    failed += 1
+            except httpx.TransportError:
+                failed += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return done, failed
+
+
+def load_process(args: tuple[str, int, float]) -> tuple[int, int]:
+    return asyncio.run(generate_load(*args))
+
+
+def measure(workers: int, args) -> tuple[float, int]:
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env={
+            **os.environ,
+            "WEB_CONCURRENCY": str(workers),
+            "VERIFY_CODES_BACKEND": "redis",
+            "REDIS_URL": settings.REDIS_URL,
+        },
+    )
+    try:
+        asyncio.run(wait_ready(url, args.startup_timeout, server))
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(load_process, [(url, args.concurrency, args.duration)] * args.clients)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    done = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    return done / args.duration, failed
+
+
+def main(args):
+    print(f"CPU доступно: {available_cpus()}, маршрут: {args.path}")
+    print(f"{'воркеров':>8} {'rps':>10} {'ошибок':>8} {'эффективность':>14}")
+
+    base_rps = None
+    for workers in args.workers:
+        rps, failed = measure(workers, args)
+        base_rps = base_rps or rps / workers
+        print(f"{workers:>8} {rps:>10.0f} {failed:>8} {rps / (workers * base_rps):>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/v1/public/events")
+    parser.add_argument("--port", type=int, default=8061)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--clients", type=int, default=4, help="процессов генератора нагрузки")
+    parser.add_argument("--concurrency", type=int, default=32, help="параллельных запросов на процесс")
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    main(parser.parse_args())
@@ -0,0 +1,37 @@
+"""
+Подсчёт SQL-запросов на единицу работы (HTTP-запрос, вызов репозитория).
+
+Счётчик кладётся в contextvar: задачи, созданные внутри запроса (middleware, single-flight),
+наследуют контекст и считаются вместе с ним, а параллельные запросы не смешиваются.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_current_statements: ContextVar[Optional[List[str]]] = ContextVar("benchmark_statements", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statements = _current_statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def install_query_counter(engine: AsyncEngine):
+    """Подписывается на выполнение запросов движка (один раз на движок)."""
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """Собирает SQL, выполненные в текущем контексте; len(результата) - число запросов."""
+    statements: List[str] = []
+    token = _current_statements.set(statements)
+    try:
+        yield statements
+    finally:
+        _current_statements.reset(token)
@@ -0,0 +1,844 @@
+"""
+Микробенчмарки методов репозиториев (db/repositories) с бюджетом SQL-запросов.
+
+Каждый случай вызывает один метод репозитория на данных benchmarks.seed_data в отдельной
+сессии; транзакция затем откатывается, так что пишущие методы БД не меняют. Для случая
+замеряется время (min / медиана / среднее по --rounds повторам после прогрева) и число
+выполненных выражений. Бюджет - максимум выражений на вызов: если он превышен хотя бы в одном
+повторе, скрипт завершается с кодом 1. Списочные методы прогоняются на нескольких размерах
+страницы с одним бюджетом - N+1 ломает контракт сразу.
+
+Справочники (reference_data) загружаются до замера: их чтение - не работа метода.
+Методы репозиториев без объявленного бюджета перечисляются в конце отчёта; с --strict
+это тоже ошибка.
+
+Нужна БД из настроек (.env) с данными benchmarks.seed_data.
+
+Запуск из корня репозитория:
+    python -m benchmarks.repository_budgets --rounds 20
+    python -m benchmarks.repository_budgets --match EventsRepo ApplicationsRepo --json budgets.json
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import secrets
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import select
+
+from benchmarks.query_counter import count_queries, install_query_counter
+from benchmarks.seed_data import BENCH_EMAIL_DOMAIN
+from db.manager import db_manager
+from db.reference_data import reference_data
+from db.repositories.applications_repo import ApplicationsRepo
+from db.repositories.event_series_repo import EventSeriesRepo
+from db.repositories.events_repo import EventsRepo
+from db.repositories.notifications_repo import NotificationsRepo
+from db.repositories.reviews_repo import ReviewsRepo
+from db.repositories.roles_repo import RolesRepo
+from db.repositories.skills_repo import SkillsRepo
+from db.repositories.tags_repo import TagsRepo
+from db.repositories.user_repo import UserRepo
+from db.repositories.user_skills_repo import UserSkillsRepo
+from db.unit_of_work import REPOSITORY_REGISTRY, UnitOfWork
+from models.orm_db_models.tables import Applications, Events, RolesInfo, Users
+from models.pydantic_response_request_models.application_dto import (
+    ApplicationCreate, ApplicationFilters, ApplicationStatus
+)
+from models.pydantic_response_request_models.event_dto import EventCreate, EventFilters, EventStatus, EventUpdate
+from models.pydantic_response_request_models.notification_dto import (
+    NotificationCreate, NotificationFilters, NotificationType
+)
+from models.pydantic_response_request_models.review_dto import ReviewCreate, ReviewFilters
+from models.pydantic_response_request_models.skill_dto import SkillCreate, SkillUpdate
+from models.pydantic_response_request_models.tag_dto import TagCreate, TagUpdate
+from models.pydantic_response_request_models.user_dto import UserRegister, UserUpdate
+
+PAGE_SIZES = {"page_size=1": 1, "page_size=20": 20, "page_size=100": 100}
+ADMITTABLE = [ApplicationStatus.PENDING, ApplicationStatus.WAITLISTED]
+# импорт регистрирует репозитории в UnitOfWork
+REPOSITORIES = (
+    ApplicationsRepo, EventSeriesRepo, EventsRepo, NotificationsRepo, ReviewsRepo,
+    RolesRepo, SkillsRepo, TagsRepo, UserRepo, UserSkillsRepo,
+)
+
+
+@dataclass
+class Fixture:
+    """Существующие строки, на которых вызываются методы"""
+    event_id: int  # одобренное мероприятие с заявками на рассмотрении
+    organizer_id: int
+    location: str
+    app_ids: List[int]  # заявки event_id в статусе pending
+    volunteer_id: int  # волонтёр с заявкой на event_id
+    volunteer_email: str
+    outsider_id: int  # пользователь без заявки на event_id
+    event_ids: List[int]
+    user_ids: List[int]
+    tag_ids: List[int]
+    skill_ids: List[int]
+    role_ids: List[int]
+
+
+class SkipCase(Exception):
+    """Случай неприменим к текущим данным"""
+
+
+Run = Callable[[UnitOfWork, Fixture, Any], Awaitable[Any]]
+Setup = Callable[[UnitOfWork, Fixture], Awaitable[Any]]
+
+
+@dataclass
+class Case:
+    method: str  # EventsRepo.get_event_by_id - как __qualname__ метода
+    budget: int
+    run: Run
+    variant: str = ""
+    param: Any = None
+    setup: Optional[Setup] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} [{self.variant}]" if self.variant else self.method
+
+
+CASES: List[Case] = []
+
+
+def budget(method: str, statements: int, variants: Optional[Dict[str, Any]] = None, setup: Optional[Setup] = None):
+    """
+    Регистрирует случай с бюджетом statements выражений на вызов.
+    variants - подпись -> параметр (например, размер страницы), бюджет общий для всех;
+    run получает параметр варианта либо результат setup (setup не замеряется).
+    """
+    def decorator(run: Run) -> Run:
+        for variant, param in (variants or {"": None}).items():
+            CASES.append(Case(method, statements, run, variant, param, setup))
+        return run
+    return decorator
+
+
+def event_create(fx: Fixture, start: datetime) -> EventCreate:
+    return EventCreate(
+        title="Замер бюджета репозитория",
+        description="Мероприятие создаётся внутри откатываемой транзакции бенчмарка",
+        location=fx.location,
+        required_volunteers=10,
+        start_date=start,
+        end_date=start + timedelta(hours=3),
+        tag_ids=fx.tag_ids[:2],
+        skill_ids=fx.skill_ids[:2],
+    )
+
+
+def unique_name() -> str:
+    return f"budget-{secrets.token_hex(4)}"
+
+
+async def role_for_case(uow: UnitOfWork, fx: Fixture) -> int:
+    if fx.role_ids:
+        return fx.role_ids[0]
+    role = RolesInfo(role_name=unique_name())
+    uow.session.add(role)
+    await uow.session.flush()
+    return role.id
+
+
+async def series_for_case(uow: UnitOfWork, fx: Fixture) -> tuple:
+    start = datetime.now().replace(microsecond=0) + timedelta(days=7)
+    series = await uow.event_series.create_series(fx.organizer_id, "FREQ=WEEKLY", start, 180)
+    event_ids = await uow.events.bulk_create_events(
+        [event_create(fx, start + timedelta(weeks=week)) for week in range(4)], fx.organizer_id, series.id
+    )
+    return series, event_ids, start
+
+
+# ============= EventsRepo =============
+@budget("EventsRepo.get_event_by_id", 1)
+async def _(uow, fx, _param):
+    return await uow.events.get_event_by_id(fx.event_id)
+
+
+@budget("EventsRepo.get_event_header", 1)
+async def _(uow, fx, _param):
+    return await uow.events.get_event_header(fx.event_id)
+
+
+@budget("EventsRepo.get_paginated_events", 4, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.events.get_paginated_events(EventFilters(status=EventStatus.APPROVED, page_size=page_size))
+
+
+@budget("EventsRepo.get_paginated_events", 4, {"фильтры, page_size=100": 100})
+async def _(uow, fx, page_size):
+    return await uow.events.get_paginated_events(EventFilters(
+        status=EventStatus.APPROVED, location=fx.location, tag_ids=fx.tag_ids[:2], page_size=page_size
+    ))
+
+
+@budget("EventsRepo.get_event_list_items_by_ids", 3)
+async def _(uow, fx, _param):
+    return await uow.events.get_event_list_items_by_ids(fx.event_ids)
+
+
+@budget("EventsRepo.get_events_by_organizer", 3)
+async def _(uow, fx, _param):
+    return await uow.events.get_events_by_organizer(fx.organizer_id)
+
+
+@budget("EventsRepo.get_index_entries", 3)
+async def _(uow, fx, _param):
+    return await uow.events.get_index_entries(EventStatus.APPROVED, fx.event_ids)
+
+
+@budget("EventsRepo.stream_organizer_events", 3)
+async def _(uow, fx, _param):
+    return uow.events.stream_organizer_events(fx.organizer_id, 1000)
+
+
+@budget("EventsRepo.create_event", 3)
+async def _(uow, fx, _param):
+    return await uow.events.create_event(event_create(fx, datetime.now() + timedelta(days=7)), fx.organizer_id)
+
+
+@budget("EventsRepo.bulk_create_events", 3)
+async def _(uow, fx, _param):
+    start = datetime.now() + timedelta(days=7)
+    return await uow.events.bulk_create_events(
+        [event_create(fx, start + timedelta(days=day)) for day in range(50)], fx.organizer_id
+    )
+
+
+@budget("EventsRepo.update_event", 6)
+async def _(uow, fx, _param):
+    return await uow.events.update_event(fx.event_id, EventUpdate(
+        title="Новое название мероприятия", tag_ids=fx.tag_ids[-2:], skill_ids=fx.skill_ids[-2:]
+    ))
+
+
+@budget("EventsRepo.delete_event", 1)
+async def _(uow, fx, _param):
+    return await uow.events.delete_event(fx.event_id)
+
+
+@budget("EventsRepo.update_event_status", 1)
+async def _(uow, fx, _param):
+    return await uow.events.update_event_status(fx.event_id, EventStatus.CANCELED)
+
+
+@budget("EventsRepo.lock_event_capacity", 1)
+async def _(uow, fx, _param):
+    return await uow.events.lock_event_capacity(fx.event_id)
+
+
+@budget("EventsRepo.lock_events_capacity", 1)
+async def _(uow, fx, _param):
+    return await uow.events.lock_events_capacity(fx.event_ids)
+
+
+@budget("EventsRepo.lock_owned_events_capacity", 1)
+async def _(uow, fx, _param):
+    return await uow.events.lock_owned_events_capacity(fx.organizer_id, fx.app_ids)
+
+
+@budget("EventsRepo.change_approved_counts", 1)
+async def _(uow, fx, _param):
+    return await uow.events.change_approved_counts({event_id: 1 for event_id in fx.event_ids})
+
+
+@budget("EventsRepo.complete_finished_events", 1)
+async def _(uow, fx, _param):
+    return await uow.events.complete_finished_events(datetime.now(), 100)
+
+
+@budget("EventsRepo.mark_reminders_due", 1)
+async def _(uow, fx, _param):
+    now = datetime.now()
+    return await uow.events.mark_reminders_due(now, now + timedelta(days=1), 100)
+
+
+# ============= ApplicationsRepo =============
+@budget("ApplicationsRepo.create_application", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.create_application(
+        ApplicationCreate(event_id=fx.event_id, message="Хочу помочь"), fx.outsider_id
+    )
+
+
+@budget("ApplicationsRepo.get_application_by_id", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.get_application_by_id(fx.app_ids[0])
+
+
+@budget("ApplicationsRepo.approve_owned_applications", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.approve_owned_applications(fx.organizer_id, fx.app_ids, ADMITTABLE)
+
+
+@budget("ApplicationsRepo.approve_waitlisted", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.approve_waitlisted(fx.event_ids, ADMITTABLE)
+
+
+@budget("ApplicationsRepo.set_owned_applications_status", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.set_owned_applications_status(
+        fx.organizer_id, fx.app_ids, ApplicationStatus.REJECTED, ADMITTABLE
+    )
+
+
+@budget("ApplicationsRepo.approve_in_queue_order", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.approve_in_queue_order(fx.event_id, 5, ADMITTABLE)
+
+
+@budget("ApplicationsRepo.set_status", 1)
+async def _(uow, fx, _param):
+    return await uow.applications.set_status(fx.app_ids, ApplicationStatus.CANCELED, ADMITTABLE)
+
+
+@budget("ApplicationsRepo.stream_event_applications", 1)
+async def _(uow, fx, _param):
+    return uow.applications.stream_event_applications(fx.event_id, None, 1000)
+
+
+@budget("ApplicationsRepo.get_paginated_applications", 4, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.applications.get_paginated_applications(
+        ApplicationFilters(volunteer_id=fx.volunteer_id, page_size=page_size)
+    )
+
+
+@budget("ApplicationsRepo.get_paginated_applications", 4, {"по мероприятию, page_size=100": 100})
+async def _(uow, fx, page_size):
+    return await uow.applications.get_paginated_applications(
+        ApplicationFilters(event_id=fx.event_id, page_size=page_size)
+    )
+
+
+# ============= UserRepo =============
+@budget("UserRepo.get_user", 1)
+async def _(uow, fx, _param):
+    return await uow.users.get_user(fx.volunteer_id)
+
+
+@budget("UserRepo.create_user", 1)
+async def _(uow, fx, _param):
+    return await uow.users.create_user(UserRegister(
+        fullname="Пользователь бенчмарка", email=f"{unique_name()}@{BENCH_EMAIL_DOMAIN}", hashed_password="x" * 60
+    ))
+
+
+@budget("UserRepo.update_user", 1)
+async def _(uow, fx, _param):
+    return await uow.users.update_user(UserUpdate(id=fx.volunteer_id, fullname="Новое имя", location=fx.location))
+
+
+@budget("UserRepo.delete_by_id", 1)
+async def _(uow, fx, _param):
+    return await uow.users.delete_by_id(fx.outsider_id)
+
+
+@budget("UserRepo.get_user_by_email", 1)
+async def _(uow, fx, _param):
+    return await uow.users.get_user_by_email(fx.volunteer_email)
+
+
+@budget("UserRepo.change_password", 1)
+async def _(uow, fx, _param):
+    return await uow.users.change_password(fx.volunteer_id, "x" * 60)
+
+
+@budget("UserRepo.get_user_public_profile", 1)
+async def _(uow, fx, _param):
+    return await uow.users.get_user_public_profile(fx.volunteer_id)
+
+
+@budget("UserRepo.get_total_users_count", 1)
+async def _(uow, fx, _param):
+    return await uow.users.get_total_users_count()
+
+
+@budget("UserRepo.get_paginated_users", 3, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.users.get_paginated_users(1, page_size)
+
+
+@budget("UserRepo.exists_user", 1)
+async def _(uow, fx, _param):
+    return await uow.users.exists_user(fx.volunteer_email)
+
+
+@budget("UserRepo.get_user_statistics", 4)
+async def _(uow, fx, _param):
+    return await uow.users.get_user_statistics(fx.volunteer_id)
+
+
+@budget("UserRepo.get_user_events", 1)
+async def _(uow, fx, _param):
+    return await uow.users.get_user_events(fx.volunteer_id)
+
+
+@budget("UserRepo.get_user_cabinet_info", 9)
+async def _(uow, fx, _param):
+    return await uow.users.get_user_cabinet_info(fx.organizer_id)
+
+
+@budget("UserRepo.reactivate_user", 1)
+async def _(uow, fx, _param):
+    return await uow.users.reactivate_user(fx.volunteer_id)
+
+
+@budget("UserRepo.set_user_active_status", 1)
+async def _(uow, fx, _param):
+    return await uow.users.set_user_active_status(fx.volunteer_id, False)
+
+
+# ============= NotificationsRepo =============
+def notification(fx: Fixture, user_id: int) -> NotificationCreate:
+    return NotificationCreate(
+        user_id=user_id, title="Напоминание", message="Мероприятие начнётся завтра",
+        type=NotificationType.EVENT_REMINDER, related_event_id=fx.event_id
+    )
+
+
+@budget("NotificationsRepo.create_notification", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.create_notification(notification(fx, fx.volunteer_id))
+
+
+@budget("NotificationsRepo.bulk_create_notifications", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.bulk_create_notifications([notification(fx, user_id) for user_id in fx.user_ids])
+
+
+@budget("NotificationsRepo.get_my_notifications", 3, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.notifications.get_my_notifications(fx.volunteer_id, NotificationFilters(page_size=page_size))
+
+
+@budget("NotificationsRepo.mark_as_read", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.mark_as_read(list(range(1, 101)), fx.volunteer_id)
+
+
+@budget("NotificationsRepo.mark_all_as_read", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.mark_all_as_read(fx.volunteer_id)
+
+
+@budget("NotificationsRepo.delete_notification", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.delete_notification(list(range(1, 101)), fx.volunteer_id)
+
+
+@budget("NotificationsRepo.enqueue_event_reminders", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.enqueue_event_reminders(fx.event_ids)
+
+
+@budget("NotificationsRepo.get_oldest_archivable_date", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.get_oldest_archivable_date(datetime.now() - timedelta(days=90))
+
+
+@budget("NotificationsRepo.ensure_archive_partition", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.ensure_archive_partition(datetime(2099, 1, 1), datetime(2099, 2, 1))
+
+
+@budget("NotificationsRepo.archive_read_notifications", 1)
+async def _(uow, fx, _param):
+    return await uow.notifications.archive_read_notifications(datetime.now() - timedelta(days=90), 1000)
+
+
+# ============= ReviewsRepo =============
+@budget("ReviewsRepo.create_review", 1)
+async def _(uow, fx, _param):
+    return await uow.reviews.create_review(
+        ReviewCreate(rating=5, comment="Всё отлично", event_id=fx.event_id, to_user_id=fx.organizer_id),
+        fx.volunteer_id
+    )
+
+
+@budget("ReviewsRepo.get_review_by_id", 1)
+async def _(uow, fx, _param):
+    return await uow.reviews.get_review_by_id(1)
+
+
+@budget("ReviewsRepo.get_paginated_reviews", 4, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.reviews.get_paginated_reviews(ReviewFilters(page_size=page_size))
+
+
+@budget("ReviewsRepo.get_user_rating_stats", 3)
+async def _(uow, fx, _param):
+    return await uow.reviews.get_user_rating_stats(fx.organizer_id)
+
+
+# ============= RolesRepo =============
+@budget("RolesRepo.get_all_roles", 0)
+async def _(uow, fx, _param):
+    return await uow.roles.get_all_roles()
+
+
+@budget("RolesRepo.get_role_by_id", 0)
+async def _(uow, fx, _param):
+    if not fx.role_ids:
+        raise SkipCase("в БД нет ролей")
+    return await uow.roles.get_role_by_id(fx.role_ids[0])
+
+
+@budget("RolesRepo.get_role_by_name", 0)
+async def _(uow, fx, _param):
+    if not fx.role_ids:
+        raise SkipCase("в БД нет ролей")
+    return await uow.roles.get_role_by_name(reference_data.roles[fx.role_ids[0]].role_name)
+
+
+@budget("RolesRepo.add_role_to_user", 1, setup=role_for_case)
+async def _(uow, fx, role_id):
+    return await uow.roles.add_role_to_user(fx.outsider_id, role_id)
+
+
+@budget("RolesRepo.set_user_roles", 2, setup=role_for_case)
+async def _(uow, fx, role_id):
+    return await uow.roles.set_user_roles(fx.outsider_id, [role_id])
+
+
+@budget("RolesRepo.add_roles_to_users", 1, setup=role_for_case)
+async def _(uow, fx, role_id):
+    return await uow.roles.add_roles_to_users(fx.user_ids, [role_id])
+
+
+@budget("RolesRepo.remove_role_from_user", 1, setup=role_for_case)
+async def _(uow, fx, role_id):
+    return await uow.roles.remove_role_from_user(fx.volunteer_id, role_id)
+
+
+@budget("RolesRepo.get_user_roles", 1)
+async def _(uow, fx, _param):
+    return await uow.roles.get_user_roles(fx.organizer_id)
+
+
+# ============= TagsRepo / SkillsRepo =============
+@budget("TagsRepo.get_all_tags", 0)
+async def _(uow, fx, _param):
+    return await uow.tags.get_all_tags()
+
+
+@budget("TagsRepo.get_tag_by_id", 0)
+async def _(uow, fx, _param):
+    return await uow.tags.get_tag_by_id(fx.tag_ids[0])
+
+
+@budget("TagsRepo.get_tags_by_ids", 0)
+async def _(uow, fx, _param):
+    return await uow.tags.get_tags_by_ids(fx.tag_ids)
+
+
+@budget("TagsRepo.get_tag_ids_by_names", 0)
+async def _(uow, fx, _param):
+    return await uow.tags.get_tag_ids_by_names([tag.name for tag in reference_data.tags.values()])
+
+
+@budget("TagsRepo.create_tag", 1)
+async def _(uow, fx, _param):
+    return await uow.tags.create_tag(TagCreate(name=unique_name()))
+
+
+@budget("TagsRepo.update_tag", 1)
+async def _(uow, fx, _param):
+    return await uow.tags.update_tag(fx.tag_ids[0], TagUpdate(description="Новое описание"))
+
+
+@budget("TagsRepo.delete_tag", 1)
+async def _(uow, fx, _param):
+    return await uow.tags.delete_tag(fx.tag_ids[0])
+
+
+@budget("TagsRepo.get_paginated_tags", 2, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.tags.get_paginated_tags(1, page_size)
+
+
+@budget("SkillsRepo.get_all_skills", 0)
+async def _(uow, fx, _param):
+    return await uow.skills.get_all_skills()
+
+
+@budget("SkillsRepo.get_skill_by_id", 0)
+async def _(uow, fx, _param):
+    return await uow.skills.get_skill_by_id(fx.skill_ids[0])
+
+
+@budget("SkillsRepo.get_skills_by_ids", 0)
+async def _(uow, fx, _param):
+    return await uow.skills.get_skills_by_ids(fx.skill_ids)
+
+
+@budget("SkillsRepo.get_skill_ids_by_names", 0)
+async def _(uow, fx, _param):
+    return await uow.skills.get_skill_ids_by_names([skill.name for skill in reference_data.skills.values()])
+
+
+@budget("SkillsRepo.create_skill", 1)
+async def _(uow, fx, _param):
+    return await uow.skills.create_skill(SkillCreate(name=unique_name()))
+
+
+@budget("SkillsRepo.update_skill", 1)
+async def _(uow, fx, _param):
+    return await uow.skills.update_skill(fx.skill_ids[0], SkillUpdate(description="Новое описание"))
+
+
+@budget("SkillsRepo.delete_skill", 1)
+async def _(uow, fx, _param):
+    return await uow.skills.delete_skill(fx.skill_ids[0])
+
+
+@budget("SkillsRepo.get_paginated_skills", 2, PAGE_SIZES)
+async def _(uow, fx, page_size):
+    return await uow.skills.get_paginated_skills(1, page_size)
+
+
+@budget("UserSkillsRepo.update_user_skills", 2)
+async def _(uow, fx, _param):
+    skills = [reference_data.skills[skill_id] for skill_id in fx.skill_ids[:3]]
+    return await uow.user_skills.update_user_skills(fx.volunteer_id, skills)
+
+
+# ============= EventSeriesRepo =============
+@budget("EventSeriesRepo.create_series", 1)
+async def _(uow, fx, _param):
+    return await uow.event_series.create_series(fx.organizer_id, "FREQ=WEEKLY", datetime.now(), 180)
+
+
+@budget("EventSeriesRepo.get_series", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.get_series(prepared[0].id)
+
+
+@budget("EventSeriesRepo.lock_series_to_materialize", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.lock_series_to_materialize(datetime.now() + timedelta(days=365), prepared[0].id)
+
+
+@budget("EventSeriesRepo.materialize_occurrences", 4, setup=series_for_case)
+async def _(uow, fx, prepared):
+    series, _event_ids, start = prepared
+    starts = [start + timedelta(weeks=week) for week in range(4, 30)]
+    return await uow.event_series.materialize_occurrences(series.id, starts, 180)
+
+
+@budget("EventSeriesRepo.set_materialized_until", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.set_materialized_until(prepared[0].id, datetime.now() + timedelta(days=90))
+
+
+@budget("EventSeriesRepo.get_occurrence_ids", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.get_occurrence_ids(prepared[0].id, prepared[2])
+
+
+@budget("EventSeriesRepo.update_occurrences", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.update_occurrences(prepared[1], {"title": "Новое название серии"})
+
+
+@budget("EventSeriesRepo.replace_occurrences_tags", 2, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.replace_occurrences_tags(prepared[1], fx.tag_ids[-2:])
+
+
+@budget("EventSeriesRepo.replace_occurrences_skills", 2, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.replace_occurrences_skills(prepared[1], fx.skill_ids[-2:])
+
+
+@budget("EventSeriesRepo.cancel_occurrences", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.cancel_occurrences(prepared[1])
+
+
+@budget("EventSeriesRepo.deactivate_series", 1, setup=series_for_case)
+async def _(uow, fx, prepared):
+    return await uow.event_series.deactivate_series(prepared[0].id)
+
+
+# ============= BaseRepo =============
+@budget("BaseRepo.try_advisory_xact_lock", 1)
+async def _(uow, fx, _param):
+    return await uow.events.try_advisory_xact_lock(0x62756467)
+
+
+async def load_fixture() -> Fixture:
+    async with db_manager.get_session() as session:
+        await reference_data.load(session)
+        pending = select(Applications.event_id).where(Applications.status == ApplicationStatus.PENDING)
+        event = (await session.execute(
+            select(Events.id, Events.organizer_id, Events.location)
+            .where(Events.status == EventStatus.APPROVED, Events.id.in_(pending))
+            .limit(1)
+        )).first()
+        if event is None or not reference_data.tags or not reference_data.skills:
+            raise RuntimeError("Нет данных для замера - запустите python -m benchmarks.seed_data")
+
+        app_ids = list((await session.scalars(
+            select(Applications.id)
+            .where(Applications.event_id == event.id, Applications.status == ApplicationStatus.PENDING)
+            .limit(20)
+        )).all())
+        volunteer = (await session.execute(
+            select(Users.id, Users.email)
+            .join(Applications, Applications.volunteer_id == Users.id)
+            .where(Applications.event_id == event.id)
+            .limit(1)
+        )).first()
+        outsider_id = await session.scalar(
+            select(Users.id)
+            .where(
+                Users.id != event.organizer_id,
+                Users.id.not_in(select(Applications.volunteer_id).where(Applications.event_id == event.id)),
+            )
+            .limit(1)
+        )
+        event_ids = list((await session.scalars(
+            select(Events.id).where(Events.status == EventStatus.APPROVED).limit(100)
+        )).all())
+        user_ids = list((await session.scalars(select(Users.id).limit(100))).all())
+
+    return Fixture(
+        event_id=event.id,
+        organizer_id=event.organizer_id,
+        location=event.location,
+        app_ids=app_ids,
+        volunteer_id=volunteer.id,
+        volunteer_email=volunteer.email,
+        outsider_id=outsider_id,
+        event_ids=event_ids,
+        user_ids=user_ids,
+        tag_ids=sorted(reference_data.tags),
+        skill_ids=sorted(reference_data.skills),
+        role_ids=sorted(reference_data.roles),
+    )
+
+
+async def call_once(case: Case, fx: Fixture) -> tuple[float, int]:
+    """Один вызов метода в откатываемой транзакции: (секунды, выражений)."""
+    async with db_manager.get_session() as session:
+        uow = UnitOfWork(session, REPOSITORY_REGISTRY)
+        try:
+            await reference_data.ensure_loaded()
+            param = await case.setup(uow, fx) if case.setup else case.param
+            with count_queries() as statements:
+                started = time.perf_counter()
+                result = await case.run(uow, fx, param)
+                if hasattr(result, "__aiter__"):
+                    async for _ in result:
+                        pass
+                elapsed = time.perf_counter() - started
+        finally:
+            await uow.rollback()
+    return elapsed, len(statements)
+
+
+async def measure(case: Case, fx: Fixture, rounds: int, warmup: int) -> dict:
+    timings: List[float] = []
+    statements: List[int] = []
+    for round_number in range(warmup + rounds):
+        elapsed, executed = await call_once(case, fx)
+        if round_number >= warmup:
+            timings.append(elapsed)
+            statements.append(executed)
+
+    return {
+        "method": case.method,
+        "variant": case.variant,
+        "budget": case.budget,
+        "statements": max(statements),
+        "min_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "status": "OK" if max(statements) <= case.budget else "FAIL",
+    }
+
+
+def repository_methods() -> List[str]:
+    """Публичные async-методы репозиториев (с унаследованными из BaseRepo)."""
+    methods = set()
+    for repo_class in REPOSITORIES:
+        for name, member in inspect.getmembers(repo_class):
+            if name.startswith("_"):
+                continue
+            if inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member):
+                methods.add(member.__qualname__)
+    return sorted(methods)
+
+
+def print_row(result: dict):
+    name = f"{result['method']} [{result['variant']}]" if result["variant"] else result["method"]
+    if result["status"] == "SKIP":
+        print(f"{name:<62} {'':>9} {'':>9} {'':>9} {'':>9}  SKIP ({result['reason']})")
+        return
+    print(
+        f"{name:<62} {result['statements']:>4}/{result['budget']:<4} {result['min_ms']:>9.2f} "
+        f"{result['median_ms']:>9.2f} {result['mean_ms']:>9.2f}  {result['status']}"
+    )
+
+
+async def run(args) -> List[dict]:
+    cases = [case for case in CASES if not args.match or any(part in case.name for part in args.match)]
+    results = []
+    async with db_manager:
+        install_query_counter(db_manager.engine)
+        fx = await load_fixture()
+        print(f"{'метод':<62} {'SQL/бюд.':>9} {'min мс':>9} {'мед. мс':>9} {'сред. мс':>9}")
+        for case in cases:
+            try:
+                result = await measure(case, fx, args.rounds, args.warmup)
+            except SkipCase as e:
+                result = {"method": case.method, "variant": case.variant, "budget": case.budget,
+                          "status": "SKIP", "reason": str(e)}
+            print_row(result)
+            results.append(result)
+    return results
+
+
+def main(args) -> int:
+    # логи репозиториев и UnitOfWork на каждый вызов забивают отчёт
+    logger.disable("db")
+    results = asyncio.run(run(args))
+
+    failed = [result for result in results if result["status"] == "FAIL"]
+    covered = {case.method for case in CASES}
+    uncovered = [method for method in repository_methods() if method not in covered]
+
+    if uncovered:
+        print("\nМетоды без бюджета:", ", ".join(uncovered))
+    if failed:
+        print(f"\nПревышен бюджет SQL-запросов: {len(failed)}")
+        for result in failed:
+            print(f"  {result['method']} {result['variant']}: {result['statements']} > {result['budget']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed or (args.strict and uncovered) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20, help="замеряемых вызовов на случай")
+    parser.add_argument("--warmup", type=int, default=3, help="вызовов прогрева на случай")
+    parser.add_argument("--match", nargs="+", help="только случаи, в имени которых есть одна из подстрок")
+    parser.add_argument("--json", help="сохранить результаты в JSON")
+    parser.add_argument("--strict", action="store_true", help="ошибка, если у метода репозитория нет бюджета")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,216 @@
+"""
+Генератор данных для нагрузочных тестов: пользователи, мероприятия с тегами и навыками, заявки.
+
+Данные похожи на реальные (Faker, ru_RU): ограниченный набор городов, статусы мероприятий
+и заявок в правдоподобных пропорциях, одобренных заявок не больше required_volunteers,
+approved_volunteers_count согласован с заявками. Строки загружаются через COPY.
+
+У всех сгенерированных пользователей email на домене BENCH_EMAIL_DOMAIN и пароль BENCH_PASSWORD
+(их использует benchmarks.api_load для входа); --clean удаляет их вместе с мероприятиями
+и заявками (ON DELETE CASCADE).
+
+Нужна БД из настроек (.env) с применёнными миграциями.
+
+Запуск из корня репозитория:
+    python -m benchmarks.seed_data --users 100000 --events 50000 --applications 1000000
+    python -m benchmarks.seed_data --clean
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from datetime import datetime, timedelta
+
+from faker import Faker
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.security.passwords import hash_pwd
+from db.manager import db_manager
+from models.orm_db_models.tables import Events, Skills, Tags, Users
+from models.pydantic_response_request_models.application_dto import ApplicationStatus
+from models.pydantic_response_request_models.event_dto import EventStatus
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password"
+
+TAG_NAMES = [
+    "Экология", "Дети", "Животные", "Пожилые люди", "Спорт", "Культура", "Образование",
+    "Медицина", "Городская среда", "Донорство", "Поиск людей", "Фестивали", "IT", "Инклюзия",
+]
+SKILL_NAMES = [
+    "Первая помощь", "Вождение", "Фотография", "Работа с детьми", "Английский язык",
+    "Организация мероприятий", "SMM", "Дизайн", "Психологическая поддержка", "Уход за животными",
+]
+CITIES_COUNT = 40
+ORGANIZERS_SHARE = 0.05
+COPY_CHUNK_SIZE = 50000
+
+EVENT_STATUSES = [EventStatus.APPROVED, EventStatus.PENDING, EventStatus.COMPLETED, EventStatus.CANCELED]
+EVENT_STATUS_WEIGHTS = [70, 10, 15, 5]
+
+
+async def copy_rows(connection, table: str, columns: list[str], rows: list[tuple]):
+    for start in range(0, len(rows), COPY_CHUNK_SIZE):
+        await connection.copy_records_to_table(table, records=rows[start:start + COPY_CHUNK_SIZE], columns=columns)
+
+
+async def ensure_reference(session, model, names: list[str]) -> list[int]:
+    await session.execute(
+        postgresql.insert(model).values([{"name": name} for name in names]).on_conflict_do_nothing()
+    )
+    return list((await session.scalars(select(model.id).where(model.name.in_(names)))).all())
+
+
+def generate_users(fake: Faker, rnd: random.Random, count: int, marker: str, cities: list[str]) -> list[tuple]:
+    hashed_password = hash_pwd(BENCH_PASSWORD)
+    now = datetime.now()
+    return [
+        (
+            fake.name(),
+            hashed_password,
+            f"{marker}-{i}@{BENCH_EMAIL_DOMAIN}",
+            rnd.choice(cities),
+            now - timedelta(days=rnd.randint(18 * 365, 70 * 365)),
+            now - timedelta(days=rnd.randint(0, 3 * 365)),
+            True,
+        )
+        for i in range(count)
+    ]
+
+
+def plan_applications(rnd: random.Random, volunteers: list[int], required: int, count: int, past: bool) -> list[tuple]:
+    """(volunteer_id, status) заявок одного мероприятия: одобрено не больше required."""
+    approved_share = 0.8 if past else 0.5
+    approved = min(required, int(count * approved_share))
+    planned = []
+    for position, volunteer_id in enumerate(rnd.sample(volunteers, count)):
+        if position < approved:
+            status = ApplicationStatus.APPROVED
+        elif approved == required and rnd.random() < 0.5:
+            status = ApplicationStatus.WAITLISTED
+        else:
+            status = rnd.choices(
+                [ApplicationStatus.PENDING, ApplicationStatus.REJECTED, ApplicationStatus.CANCELED], [6, 3, 1]
+            )[0]
+        planned.append((volunteer_id, status.value))
+    return planned
+
+
+async def seed(users: int, events: int, applications: int, seed_value: int):
+    fake = Faker("ru_RU")
+    fake.seed_instance(seed_value)
+    rnd = random.Random(seed_value)
+    marker = secrets.token_hex(3)
+    cities = list(dict.fromkeys(fake.city() for _ in range(CITIES_COUNT * 2)))[:CITIES_COUNT]
+    started = time.perf_counter()
+
+    async with db_manager.get_session() as session:
+        tag_ids = await ensure_reference(session, Tags, TAG_NAMES)
+        skill_ids = await ensure_reference(session, Skills, SKILL_NAMES)
+
+        connection = (await (await session.connection()).get_raw_connection()).driver_connection
+
+        await copy_rows(
+            connection, "users",
+            ["fullname", "hashed_password", "email", "location", "date_birth", "date_created", "is_active"],
+            generate_users(fake, rnd, users, marker, cities)
+        )
+        user_ids = list((await session.scalars(
+            select(Users.id).where(Users.email.like(f"{marker}-%@{BENCH_EMAIL_DOMAIN}")).order_by(Users.id)
+        )).all())
+        organizers = user_ids[:max(1, int(len(user_ids) * ORGANIZERS_SHARE))]
+        print(f"Пользователей: {len(user_ids)} ({time.perf_counter() - started:.1f} с)")
+
+        now = datetime.now()
+        average_applications = applications / max(events, 1)
+        event_rows, applications_plan = [], []
+        for _ in range(events):
+            status = rnd.choices(EVENT_STATUSES, EVENT_STATUS_WEIGHTS)[0]
+            past = status == EventStatus.COMPLETED
+            start = now + timedelta(days=rnd.randint(-180, -1) if past else rnd.randint(1, 180), hours=rnd.randint(8, 18))
+            required = rnd.randint(5, 50)
+            count = min(len(user_ids), rnd.randint(0, int(2 * average_applications)))
+            planned = plan_applications(rnd, user_ids, required, count, past) if status != EventStatus.PENDING else []
+            applications_plan.append(planned)
+            event_rows.append((
+                rnd.choice(organizers),
+                fake.sentence(nb_words=rnd.randint(3, 7)).rstrip(".")[:255],
+                fake.paragraph(nb_sentences=rnd.randint(3, 8)),
+                rnd.choice(cities),
+                required,
+                sum(1 for _, application_status in planned if application_status == ApplicationStatus.APPROVED),
+                start,
+                start + timedelta(hours=rnd.randint(2, 8)),
+                status.value,
+                start - timedelta(days=rnd.randint(7, 60)),
+            ))
+
+        await copy_rows(
+            connection, "events",
+            ["organizer_id", "title", "description", "location", "required_volunteers",
+             "approved_volunteers_count", "start_date", "end_date", "status", "date_created"],
+            event_rows
+        )
+        # COPY выдаёт ID из последовательности в порядке строк
+        event_ids = list((await session.scalars(
+            select(Events.id).where(Events.organizer_id.in_(organizers)).order_by(Events.id)
+        )).all())
+        print(f"Мероприятий: {len(event_ids)} ({time.perf_counter() - started:.1f} с)")
+
+        await copy_rows(connection, "event_tags", ["event_id", "tag_id"], [
+            (event_id, tag_id) for event_id in event_ids for tag_id in rnd.sample(tag_ids, rnd.randint(1, 3))
+        ])
+        await copy_rows(connection, "required_events_skills", ["event_id", "skill_id"], [
+            (event_id, skill_id) for event_id in event_ids for skill_id in rnd.sample(skill_ids, rnd.randint(0, 3))
+        ])
+
+        application_rows = [
+            (
+                event_id,
+                volunteer_id,
+                fake.sentence(nb_words=8) if rnd.random() < 0.3 else None,
+                status,
+                event_row[9] + timedelta(hours=rnd.randint(1, 24 * 7)),
+            )
+            for event_id, event_row, planned in zip(event_ids, event_rows, applications_plan)
+            for volunteer_id, status in planned
+        ]
+        await copy_rows(
+            connection, "applications", ["event_id", "volunteer_id", "message", "status", "date_created"],
+            application_rows
+        )
+        print(f"Заявок: {len(application_rows)} ({time.perf_counter() - started:.1f} с)")
+
+        await session.commit()
+
+    async with db_manager.engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE users, events, event_tags, required_events_skills, applications"))
+    print(f"Готово за {time.perf_counter() - started:.1f} с, пароль пользователей: {BENCH_PASSWORD}")
+
+
+async def clean():
+    async with db_manager.get_session() as session:
+        result = await session.execute(delete(Users).where(Users.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+        await session.commit()
+    print(f"Удалено пользователей (с мероприятиями и заявками): {result.rowcount}")
+
+
+async def main(args):
+    async with db_manager:
+        if args.clean:
+            await clean()
+        else:
+            await seed(args.users, args.events, args.applications, args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--applications", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clean", action="store_true", help="удалить ранее сгенерированные данные")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Сравнение пропускной способности списочного эндпоинта (страница из 100 мероприятий):
+
+- old: from_orm + EventListItem(**event.__dict__) + повторная валидация по response_model
+- new: to_dto + DTOResponse (pydantic-core сразу в байты)
+
+БД не нужна: страница собирается из transient ORM-объектов, запросы идут
+в приложение in-process через httpx.ASGITransport.
+
+Запуск из корня репозитория:
+    python -m benchmarks.serialization_benchmark --requests 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.responses import DTOResponse
+from db.repositories.base_repo import to_dto
+from models.orm_db_models.tables import Events, Users
+from models.pydantic_response_request_models.event_dto import EventListItem, EventListResponse, OrganizerRead
+from models.pydantic_response_request_models.tag_dto import TagRead
+
+PAGE_SIZE = 100
+
+
+def build_page():
+    organizer = Users(id=1, fullname="Организатор", email="org@example.com", avatar_url=None)
+    tags = [TagRead(id=i, name=f"tag-{i}") for i in range(1, 4)]
+    start = datetime(2026, 1, 1, 10, 0)
+    events = [
+        Events(
+            id=i,
+            organizer_id=organizer.id,
+            title=f"Мероприятие {i}",
+            description="Описание мероприятия " * 20,
+            location="Москва",
+            required_volunteers=10,
+            start_date=start + timedelta(days=i),
+            end_date=start + timedelta(days=i, hours=4),
+            status="approved",
+            event_image_url=None,
+        )
+        for i in range(1, PAGE_SIZE + 1)
+    ]
+    return organizer, tags, events
+
+
+def create_app() -> FastAPI:
+    organizer, tags, events = build_page()
+    app = FastAPI()
+
+    @app.get("/old", response_model=EventListResponse)
+    async def old_path():
+        organizer_dto = OrganizerRead.from_orm(organizer)
+        items = [
+            EventListItem(**event.__dict__, organizer=organizer_dto, tags=tags, approved_volunteers_count=0)
+            for event in events
+        ]
+        return EventListResponse(events=items, total=len(items), page=1, page_size=PAGE_SIZE)
+
+    @app.get("/new", response_model=EventListResponse)
+    async def new_path():
+        organizer_dto = to_dto(OrganizerRead, organizer)
+        items = [
+            to_dto(EventListItem, event, organizer=organizer_dto, tags=tags, approved_volunteers_count=0)
+            for event in events
+        ]
+        return DTOResponse(EventListResponse(events=items, total=len(items), page=1, page_size=PAGE_SIZE))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    await client.get(path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int):
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        old_body = (await client.get("/old")).json()
+        new_body = (await client.get("/new")).json()
+        assert old_body == new_body, "Ответы старого и нового пути различаются"
+
+        old_rps = await measure(client, "/old", requests)
+        new_rps = await measure(client, "/new", requests)
+
+    print(f"old: {old_rps:8.1f} req/s")
+    print(f"new: {new_rps:8.1f} req/s  (x{new_rps / old_rps:.2f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
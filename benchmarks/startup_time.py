@@ -0,0 +1,130 @@
+"""
+Холодный старт воркера: сколько занимает импорт приложения и через сколько воркер принимает запросы.
+
+Импорт замеряется в отдельных процессах (как у нового воркера): время по часам и разбор
+python -X importtime - какие модули дороже всего по собственному и накопленному времени.
+С --serve запускается uvicorn и замеряется время от запуска процесса до первого ответа
+(импорт + lifespan); для этого нужна БД из настроек (.env).
+
+Бюджет - STARTUP_TIME_BUDGET (по умолчанию 1 с) или --budget; при превышении скрипт
+завершается с кодом 1 и годится как проверка в CI.
+
+Запуск из корня репозитория:
+    python -m benchmarks.startup_time --runs 5 --top 15
+    python -m benchmarks.startup_time --serve --budget 1.0
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from settings import settings
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_wall_time() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def import_profile() -> List[Tuple[str, int, int, int]]:
+    """(модуль, глубина, собственное мкс, накопленное мкс) по выводу -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], check=True, capture_output=True, text=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def print_top(title: str, values: Dict[str, List[int]], top: int):
+    print(f"\n{title}")
+    medians = sorted(((statistics.median(samples), name) for name, samples in values.items()), reverse=True)
+    for value, name in medians[:top]:
+        print(f"  {name:<60} {value / 1000:>9.1f} мс")
+
+
+def measure_imports(args) -> float:
+    wall_times = [import_wall_time() for _ in range(args.runs)]
+
+    self_times: Dict[str, List[int]] = defaultdict(list)
+    direct_imports: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        for name, depth, self_us, cumulative_us in import_profile():
+            self_times[name].append(self_us)
+            # глубина 1 - модули, которые main импортирует напрямую
+            if depth == 1:
+                direct_imports[name].append(cumulative_us)
+
+    print_top("Прямые импорты main (накопленное время):", direct_imports, args.top)
+    print_top("Модули по собственному времени:", self_times, args.top)
+
+    wall_time = statistics.median(wall_times)
+    print(f"\nИмпорт main: медиана {wall_time:.3f} с, min {min(wall_times):.3f} с, max {max(wall_times):.3f} с")
+    return wall_time
+
+
+def measure_serve(args) -> float:
+    """От запуска uvicorn до первого ответа: uvicorn принимает соединения после lifespan."""
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--log-level", "warning"],
+    )
+    try:
+        deadline = started + args.startup_timeout
+        with httpx.Client() as client:
+            while time.perf_counter() < deadline:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn завершился с кодом {server.returncode}")
+                try:
+                    client.get(url)
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            else:
+                raise RuntimeError(f"Сервер не ответил за {args.startup_timeout} с: {url}")
+        ready_time = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"Первый ответ через {ready_time:.3f} с после запуска процесса")
+    return ready_time
+
+
+def main(args):
+    budget = args.budget if args.budget is not None else settings.STARTUP_TIME_BUDGET
+    startup_time = measure_imports(args)
+    if args.serve:
+        startup_time = measure_serve(args)
+
+    if startup_time > budget:
+        print(f"Превышен бюджет старта: {startup_time:.3f} с > {budget} с")
+        sys.exit(1)
+    print(f"В бюджете старта: {startup_time:.3f} с <= {budget} с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="сколько самых дорогих модулей показать")
+    parser.add_argument("--budget", type=float, help="секунд, по умолчанию STARTUP_TIME_BUDGET")
+    parser.add_argument("--serve", action="store_true", help="замерить время до первого ответа uvicorn")
+    parser.add_argument("--path", default="/metrics")
+    parser.add_argument("--port", type=int, default=8062)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    main(parser.parse_args())
@@ -0,0 +1,161 @@
+"""
+Локальная замена коллектора OpenTelemetry и просмотр трасс.
+
+Принимает OTLP/HTTP (POST /v1/traces, protobuf или JSON), дописывает пачки в файл OTLP/JSON
+(тот же формат, что TRACING_EXPORTER=file) и печатает дерево каждой трассы: спан, длительность,
+собственное время (без дочерних спанов) и число строк - видно, на что ушла каждая миллисекунда
+запроса.
+
+Запуск из корня репозитория:
+    python -m benchmarks.trace_collector --port 4318 --output traces.jsonl  # при TRACING_EXPORTER=otlp
+    python -m benchmarks.trace_collector --read logs/traces.jsonl          # при TRACING_EXPORTER=file
+"""
+import argparse
+import gzip
+import json
+import sys
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from tracing.exporters import otlp_json
+
+ROW_ATTRIBUTES = ("app.rows", "db.rows")
+
+
+def _attribute_value(value: dict):
+    for kind in ("stringValue", "intValue", "doubleValue", "boolValue"):
+        if kind in value:
+            return value[kind]
+    return None
+
+
+def iter_spans(batch: dict):
+    """Спаны пачки OTLP/JSON в виде плоских словарей."""
+    for resource_spans in batch.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                yield {
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_id": span.get("parentSpanId") or None,
+                    "name": span["name"],
+                    "kind": span.get("kind"),
+                    "start": int(span["startTimeUnixNano"]),
+                    "end": int(span["endTimeUnixNano"]),
+                    "attributes": {
+                        attribute["key"]: _attribute_value(attribute["value"])
+                        for attribute in span.get("attributes", [])
+                    },
+                }
+
+
+def print_trace(spans: List[dict]):
+    by_id = {span["span_id"]: span for span in spans}
+    children: Dict[Optional[str], List[dict]] = defaultdict(list)
+    for span in spans:
+        parent_id = span["parent_id"] if span["parent_id"] in by_id else None
+        children[parent_id].append(span)
+
+    def print_span(span: dict, depth: int):
+        duration = (span["end"] - span["start"]) / 1e6
+        nested = sum((child["end"] - child["start"]) / 1e6 for child in children[span["span_id"]])
+        rows = next((span["attributes"][key] for key in ROW_ATTRIBUTES if key in span["attributes"]), None)
+        line = f"{'  ' * depth}{span['name']:<{max(60 - 2 * depth, 20)}} {duration:>9.2f} мс  своё {max(duration - nested, 0):>8.2f}"
+        print(line + (f"  строк {rows}" if rows is not None else ""))
+        for child in sorted(children[span["span_id"]], key=lambda item: item["start"]):
+            print_span(child, depth + 1)
+
+    print(f"\nТрасса {spans[0]['trace_id']}")
+    for root in sorted(children[None], key=lambda item: item["start"]):
+        print_span(root, 0)
+
+
+def read_file(path: str):
+    traces: Dict[str, List[dict]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                for span in iter_spans(json.loads(line)):
+                    traces[span["trace_id"]].append(span)
+    for spans in traces.values():
+        print_trace(spans)
+
+
+class Collector:
+    """
+    Копит спаны по трассам; трасса печатается, когда пришёл её корневой спан
+    (без родителя или спан HTTP-запроса, продолжающий чужую трассу).
+    """
+
+    def __init__(self, output: Optional[str]):
+        self._output = output
+        self._lock = threading.Lock()
+        self._traces: Dict[str, List[dict]] = defaultdict(list)
+
+    def receive(self, batch: dict):
+        with self._lock:
+            if self._output:
+                with open(self._output, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(batch, ensure_ascii=False) + "\n")
+
+            completed = set()
+            for span in iter_spans(batch):
+                self._traces[span["trace_id"]].append(span)
+                if span["parent_id"] is None or span["kind"] == "SPAN_KIND_SERVER":
+                    completed.add(span["trace_id"])
+            for trace_id in completed:
+                print_trace(self._traces.pop(trace_id))
+            sys.stdout.flush()
+
+
+def make_handler(collector: Collector):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+
+            if "json" in self.headers.get("Content-Type", ""):
+                batch = json.loads(body)
+            else:
+                request = ExportTraceServiceRequest()
+                request.ParseFromString(body)
+                batch = json.loads(otlp_json(request))
+            collector.receive(batch)
+
+            # пустой ExportTraceServiceResponse
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-protobuf")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(args):
+    if args.read:
+        read_file(args.read)
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(Collector(args.output)))
+    print(f"OTLP/HTTP: http://{args.host}:{args.port}/v1/traces")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", help="дописывать принятые пачки в файл OTLP/JSON")
+    parser.add_argument("--read", help="напечатать трассы из файла OTLP/JSON и выйти")
+    main(parser.parse_args())
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import secrets
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+import asyncpg
+from loguru import logger
+from sqlalchemy.engine import URL
+
+CHANGES_CHANNEL = "entity_changes"
+# payload NOTIFY ограничен 8000 байтами
+MAX_PAYLOAD_BYTES = 7900
+RECONNECT_DELAY = 5
+HEALTH_CHECK_INTERVAL = 30
+# сущности, по которым подписчики коммита держат состояние в памяти воркера
+RESYNC_ENTITIES = ("events", "tags", "skills", "roles", "users")
+
+_WORKER_TOKEN = secrets.token_hex(4)
+
+Changes = Dict[str, Set[Optional[int]]]
+
+
+def worker_id() -> str:
+    """Идентификатор процесса; pid в составе - после fork воркеры gunicorn получают разные ID."""
+    return f"{os.getpid()}-{_WORKER_TOKEN}"
+
+
+def encode_changes(changes: Changes) -> str:
+    """
+    Payload уведомления об изменениях. Если ID не помещаются в лимит NOTIFY,
+    передаётся только список сущностей (ID = None - "изменения без конкретного ID").
+    """
+    payload = json.dumps({"worker": worker_id(), "changes": {entity: list(ids) for entity, ids in changes.items()}})
+    if len(payload.encode()) <= MAX_PAYLOAD_BYTES:
+        return payload
+    return json.dumps({"worker": worker_id(), "changes": {entity: [None] for entity in changes}})
+
+
+def decode_changes(payload: str) -> Optional[Changes]:
+    """Изменения из уведомления другого процесса; собственные уведомления пропускаются (None)."""
+    message = json.loads(payload)
+    if message["worker"] == worker_id():
+        return None
+    return {entity: set(ids) for entity, ids in message["changes"].items()}
+
+
+class ChangeBroadcastListener:
+    """
+    Рассылка изменений между воркерами и экземплярами приложения через LISTEN/NOTIFY Postgres.
+
+    UnitOfWork.commit отправляет NOTIFY в той же транзакции, поэтому уведомление уходит
+    только после успешного коммита. Слушатель каждого процесса передаёт чужие изменения
+    тем же подписчикам коммита (register_commit_listener), что и локальные: индекс публичных
+    мероприятий, справочники, кеш ответов и single-flight в памяти воркера не расходятся с БД.
+
+    Слушает отдельное соединение вне пула. После переподключения пропущенные уведомления
+    не восстановить - подписчики получают полный сброс по RESYNC_ENTITIES.
+
+    На том же соединении слушаются дополнительные каналы (subscribe) - служебные сообщения
+    воркерам, не связанные с изменениями сущностей.
+    """
+
+    def __init__(self, channel: str):
+        self._channel = channel
+        self._task: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+        self._subscriptions: Dict[str, Callable[[str], None]] = {}
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]):
+        """Передаёт payload уведомлений канала в callback (подписка до start)."""
+        self._subscriptions[channel] = callback
+
+    async def start(self, db_url: URL, dispatch: Callable[[Changes], Awaitable[None]]):
+        if self._task is not None:
+            raise RuntimeError("Change broadcast listener is already started")
+
+        dsn = db_url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._task = asyncio.create_task(self._listen(dsn, dispatch))
+
+    async def stop(self):
+        tasks = [task for task in (self._task, *self._dispatches) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _listen(self, dsn: str, dispatch: Callable[[Changes], Awaitable[None]]):
+        def on_notification(connection, pid, channel, payload):
+            changes = decode_changes(payload)
+            if changes:
+                self._dispatch(dispatch, changes)
+
+        connected_before = False
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as e:
+                logger.error(f"Нет соединения для рассылки изменений: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            try:
+                await connection.add_listener(self._channel, on_notification)
+                for channel, callback in self._subscriptions.items():
+                    await connection.add_listener(channel, self._subscription_listener(callback))
+                if connected_before:
+                    self._dispatch(dispatch, {entity: {None} for entity in RESYNC_ENTITIES})
+                connected_before = True
+                logger.info(f"Подписка на изменения других воркеров: канал {self._channel}")
+
+                while True:
+                    await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+                    await connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Соединение рассылки изменений потеряно: {e}")
+            finally:
+                # соединение только слушает - закрываем без ожидания ответа сервера
+                connection.terminate()
+
+    @staticmethod
+    def _subscription_listener(callback: Callable[[str], None]):
+        def on_notification(connection, pid, channel, payload):
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Ошибка обработки уведомления канала {channel}: {e}")
+        return on_notification
+
+    def _dispatch(self, dispatch: Callable[[Changes], Awaitable[None]], changes: Changes):
+        task = asyncio.create_task(dispatch(changes))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+
+change_broadcast_listener = ChangeBroadcastListener(CHANGES_CHANNEL)
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.manager import db_manager
+from db.repositories.base_repo import to_dto
+from db.unit_of_work import register_commit_listener
+from models.orm_db_models.tables import Tags, Skills, RolesInfo
+from models.pydantic_response_request_models.tag_dto import TagRead
+from models.pydantic_response_request_models.skill_dto import SkillRead
+from models.pydantic_response_request_models.role_dto import RoleRead
+from settings import settings
+
+
+class ReferenceDataRegistry:
+    """
+    Справочники тегов, навыков и ролей в памяти процесса (id -> DTO).
+
+    Загружается в lifespan и перечитывается:
+    - после коммита изменений тегов/навыков (reload_reference_data; коммиты других воркеров
+      приходят через рассылку изменений),
+    - по истечении REFERENCE_DATA_TTL - на случай выключенной или прерванной рассылки.
+    Неизвестные ID и названия справочник не перечитывают: они приходят от клиента, и каждый
+    такой запрос читал бы все три таблицы. Перечитывание идёт в своей сессии, а не в сессии
+    запроса - в реестр не попадут незакоммиченные строки.
+    Репозитории резолвят названия по ID через реестр вместо JOIN со справочниками.
+    """
+
+    def __init__(self):
+        self.tags: Dict[int, TagRead] = {}
+        self.skills: Dict[int, SkillRead] = {}
+        self.roles: Dict[int, RoleRead] = {}
+        self._loaded_at: Optional[float] = None
+        self._reload_lock = asyncio.Lock()
+
+    async def load(self, session: AsyncSession):
+        tags_result = await session.execute(select(Tags))
+        skills_result = await session.execute(select(Skills))
+        roles_result = await session.execute(select(RolesInfo))
+
+        self.tags = {t.id: to_dto(TagRead, t) for t in tags_result.scalars().all()}
+        self.skills = {s.id: to_dto(SkillRead, s) for s in skills_result.scalars().all()}
+        self.roles = {r.id: to_dto(RoleRead, r) for r in roles_result.scalars().all()}
+        self._loaded_at = time.monotonic()
+
+        logger.info(
+            f"Справочники загружены: тегов {len(self.tags)}, "
+            f"навыков {len(self.skills)}, ролей {len(self.roles)}"
+        )
+
+    async def ensure_loaded(self):
+        if not self._is_stale():
+            return
+        # параллельные запросы после истечения TTL ждут одно перечитывание
+        async with self._reload_lock:
+            if self._is_stale():
+                async with db_manager.get_session() as session:
+                    await self.load(session)
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > settings.REFERENCE_DATA_TTL
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def resolve_tags(self, tag_ids: Iterable[int]) -> List[TagRead]:
+        return await self._resolve("tags", tag_ids)
+
+    async def resolve_skills(self, skill_ids: Iterable[int]) -> List[SkillRead]:
+        return await self._resolve("skills", skill_ids)
+
+    async def resolve_roles(self, role_ids: Iterable[int]) -> List[RoleRead]:
+        return await self._resolve("roles", role_ids)
+
+    async def tag_ids_by_names(self, names: Iterable[str]) -> Dict[str, int]:
+        return await self._ids_by_names("tags", names)
+
+    async def skill_ids_by_names(self, names: Iterable[str]) -> Dict[str, int]:
+        return await self._ids_by_names("skills", names)
+
+    async def _ids_by_names(self, kind: str, names: Iterable[str]) -> Dict[str, int]:
+        """Название -> ID; неизвестные названия в результат не попадают."""
+        await self.ensure_loaded()
+        by_name = {item.name: item_id for item_id, item in getattr(self, kind).items()}
+        return {name: by_name[name] for name in set(names) if name in by_name}
+
+    async def _resolve(self, kind: str, ids: Iterable[int]) -> list:
+        """DTO по ID; неизвестные ID в результат не попадают."""
+        await self.ensure_loaded()
+        mapping = getattr(self, kind)
+        return [mapping[item_id] for item_id in ids if item_id in mapping]
+
+reference_data = ReferenceDataRegistry()
+
+
+@register_commit_listener
+async def reload_reference_data(changes: Dict[str, Set[Optional[int]]]):
+    """Перечитывает справочники после коммита изменений тегов или навыков."""
+    if "tags" in changes or "skills" in changes or "roles" in changes:
+        reference_data.invalidate()
+        async with db_manager.get_session() as session:
+            await reference_data.load(session)
@@ -1,8 +1,10 @@
 from sqlalchemy import select, delete, update, func, insert
-from typing import List, Optional
+from typing import AsyncIterator, Iterable, List, Optional
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
 
 from models.orm_db_models.tables import Applications, Events, Users
-from db.repositories.base_repo import BaseRepo
+from db.repositories.base_repo import BaseRepo, to_dto, dto_columns
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.application_dto import (
     ApplicationRead,
@@ -11,7 +13,8 @@ from models.pydantic_response_request_models.application_dto import (
     ApplicationListResponse,
     ApplicationWithEvent,
     ApplicationWithVolunteer,
-    ApplicationFilters
+    ApplicationFilters,
+    ApplicationExportRow
 )
 from models.pydantic_response_request_models.event_dto import EventListItem
 from models.pydantic_response_request_models.user_dto import UserListItem, OrganizerRead
@@ -25,42 +28,203 @@ class ApplicationsRepo(BaseRepo):
         app_orm = Applications(**app_in.model_dump(), volunteer_id=volunteer_id)
         self.session.add(app_orm)
         await self.session.flush()
-        return ApplicationRead.from_orm(app_orm)
+        return to_dto(ApplicationRead, app_orm)
 
     async def get_application_by_id(self, app_id: int) -> ApplicationRead | None:
         """Получает заявку по ID."""
         app = await self.session.get(Applications, app_id)
-        return ApplicationRead.from_orm(app) if app else None
+        return to_dto(ApplicationRead, app) if app else None
 
-    async def update_application_status(self, app_id: int, status: ApplicationStatus) -> bool:
-        """Обновляет статус заявки."""
-        stmt = update(Applications).where(Applications.id == app_id).values(status=status)
-        result = await self.session.execute(stmt)
-        return result.rowcount == 1
+    async def approve_owned_applications(
+        self,
+        organizer_id: int,
+        app_ids: List[int],
+        from_statuses: Iterable[ApplicationStatus]
+    ) -> List[Row]:
+        """
+        Одобряет заявки app_ids на мероприятия организатора одним UPDATE ... FROM:
+        владение проверяется для каждой строки, на каждое мероприятие одобряется
+        не больше свободных мест в порядке подачи. Заявки чужих мероприятий не изменяются.
+        Строки мероприятий должны быть заблокированы (EventsRepo.lock_owned_events_capacity).
+        Возвращает (id, event_id, volunteer_id) одобренных.
+        """
+        queue = (
+            select(
+                Applications.id,
+                func.row_number().over(
+                    partition_by=Applications.event_id,
+                    order_by=(Applications.date_created, Applications.id)
+                ).label("place"),
+                (Events.required_volunteers - Events.approved_volunteers_count).label("free_seats"),
+            )
+            .join(Events, Events.id == Applications.event_id)
+            .where(
+                Events.organizer_id == organizer_id,
+                Applications.id.in_(app_ids),
+                Applications.status.in_(list(from_statuses))
+            )
+            .subquery("queue")
+        )
+        result = await self.session.execute(
+            update(Applications)
+            .where(Applications.id == queue.c.id, queue.c.place <= queue.c.free_seats)
+            .values(status=ApplicationStatus.APPROVED)
+            .returning(Applications.id, Applications.event_id, Applications.volunteer_id)
+        )
+        return list(result.all())
 
-    async def bulk_approve_applications(self, app_ids: List[int]) -> int:
-        """Массовое одобрение заявок."""
-        stmt = (
+    async def approve_waitlisted(self, event_ids: List[int], from_statuses: Iterable[ApplicationStatus]) -> List[Row]:
+        """
+        Занимает свободные места мероприятий event_ids заявками в статусах from_statuses одним UPDATE ... FROM:
+        на каждое мероприятие одобряется не больше свободных мест в порядке подачи.
+        Строки мероприятий должны быть заблокированы (EventsRepo.lock_events_capacity).
+        Возвращает (id, event_id, volunteer_id) одобренных.
+        """
+        if not event_ids:
+            return []
+
+        queue = (
+            select(
+                Applications.id,
+                func.row_number().over(
+                    partition_by=Applications.event_id,
+                    order_by=(Applications.date_created, Applications.id)
+                ).label("place"),
+                (Events.required_volunteers - Events.approved_volunteers_count).label("free_seats"),
+            )
+            .join(Events, Events.id == Applications.event_id)
+            .where(
+                Applications.event_id.in_(event_ids),
+                Applications.status.in_(list(from_statuses))
+            )
+            .subquery("queue")
+        )
+        result = await self.session.execute(
             update(Applications)
-            .where(Applications.id.in_(app_ids))
+            .where(Applications.id == queue.c.id, queue.c.place <= queue.c.free_seats)
             .values(status=ApplicationStatus.APPROVED)
+            .returning(Applications.id, Applications.event_id, Applications.volunteer_id)
         )
-        result = await self.session.execute(stmt)
-        return result.rowcount
+        return list(result.all())
 
-    async def bulk_reject_applications(self, app_ids: List[int]) -> int:
-        """Массовое отклонение заявок."""
-        stmt = (
+    async def set_owned_applications_status(
+        self,
+        organizer_id: int,
+        app_ids: List[int],
+        status: ApplicationStatus,
+        from_statuses: Iterable[ApplicationStatus]
+    ) -> List[Row]:
+        """
+        Переводит заявки app_ids на мероприятия организатора из from_statuses в status
+        одним UPDATE ... FROM events - владение проверяется для каждой строки.
+        Возвращает (id, event_id, volunteer_id, previous_status) изменённых заявок.
+        """
+        previous = aliased(Applications, name="previous")
+        result = await self.session.execute(
+            update(Applications)
+            .where(
+                Events.id == Applications.event_id,
+                Events.organizer_id == organizer_id,
+                previous.id == Applications.id,
+                Applications.id.in_(app_ids),
+                Applications.status.in_(list(from_statuses))
+            )
+            .values(status=status)
+            .returning(
+                Applications.id,
+                Applications.event_id,
+                Applications.volunteer_id,
+                previous.status.label("previous_status")
+            )
+        )
+        return list(result.all())
+
+    async def approve_in_queue_order(
+        self,
+        event_id: int,
+        limit: int,
+        from_statuses: Iterable[ApplicationStatus],
+        app_ids: Optional[List[int]] = None
+    ) -> List[Row]:
+        """
+        Одобряет не больше limit заявок мероприятия в статусах from_statuses
+        в порядке подачи (лист ожидания - FIFO) одним UPDATE.
+        app_ids = None - любые заявки мероприятия. Возвращает (id, event_id, volunteer_id) одобренных.
+        """
+        if limit <= 0:
+            return []
+
+        queue = (
+            select(Applications.id)
+            .where(Applications.event_id == event_id, Applications.status.in_(list(from_statuses)))
+            .order_by(Applications.date_created, Applications.id)
+            .limit(limit)
+        )
+        if app_ids is not None:
+            queue = queue.where(Applications.id.in_(app_ids))
+
+        result = await self.session.execute(
             update(Applications)
-            .where(Applications.id.in_(app_ids))
-            .values(status=ApplicationStatus.REJECTED)
+            .where(Applications.id.in_(queue.scalar_subquery()))
+            .values(status=ApplicationStatus.APPROVED)
+            .returning(Applications.id, Applications.event_id, Applications.volunteer_id)
         )
-        result = await self.session.execute(stmt)
-        return result.rowcount
+        return list(result.all())
+
+    async def set_status(
+        self,
+        app_ids: List[int],
+        status: ApplicationStatus,
+        from_statuses: Iterable[ApplicationStatus]
+    ) -> List[int]:
+        """Переводит заявки из статусов from_statuses в status одним UPDATE. Возвращает ID изменённых."""
+        if not app_ids:
+            return []
+
+        result = await self.session.execute(
+            update(Applications)
+            .where(Applications.id.in_(app_ids), Applications.status.in_(list(from_statuses)))
+            .values(status=status)
+            .returning(Applications.id)
+        )
+        return list(result.scalars().all())
+
+    async def stream_event_applications(
+        self,
+        event_id: int,
+        status: Optional[ApplicationStatus],
+        chunk_size: int
+    ) -> AsyncIterator[List[ApplicationExportRow]]:
+        """
+        Отдаёт заявки мероприятия с контактами волонтёров пачками по chunk_size
+        через серверный курсор - память не зависит от размера мероприятия.
+        """
+        stmt = (
+            select(
+                Applications.id,
+                Applications.status,
+                Applications.message,
+                Applications.date_created,
+                Applications.volunteer_id,
+                Users.fullname.label("volunteer_fullname"),
+                Users.email.label("volunteer_email"),
+                Users.location.label("volunteer_location"),
+            )
+            .join(Users, Users.id == Applications.volunteer_id)
+            .where(Applications.event_id == event_id)
+            .order_by(Applications.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if status:
+            stmt = stmt.where(Applications.status == status)
+
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield [to_dto(ApplicationExportRow, row) for row in partition]
 
     async def get_paginated_applications(self, filters: ApplicationFilters) -> ApplicationListResponse:
         """Пагинированный список заявок."""
-        query = select(Applications)
+        query = select(*dto_columns(Applications, ApplicationRead))
 
         if filters.event_id:
             query = query.where(Applications.event_id == filters.event_id)
@@ -78,81 +242,75 @@ class ApplicationsRepo(BaseRepo):
         query = query.limit(filters.page_size).offset(offset)
 
         result = await self.session.execute(query)
-        apps_orm = result.scalars().all()
+        apps_rows = result.all()
+
+        # Связанные данные страницы - по одному запросу, только колонки нужных DTO
+        events_by_id = {}
+        organizers_by_id = {}
+        volunteers_by_id = {}
+        if filters.volunteer_id and apps_rows:
+            events_result = await self.session.execute(
+                select(*dto_columns(Events, EventListItem, "organizer_id"))
+                .where(Events.id.in_({app.event_id for app in apps_rows}))
+            )
+            events_by_id = {event.id: event for event in events_result.all()}
+            if events_by_id:
+                organizers_result = await self.session.execute(
+                    select(*dto_columns(Users, OrganizerRead))
+                    .where(Users.id.in_({event.organizer_id for event in events_by_id.values()}))
+                )
+                organizers_by_id = {user.id: user for user in organizers_result.all()}
+        elif filters.event_id and apps_rows:
+            volunteers_result = await self.session.execute(
+                select(*dto_columns(Users, UserListItem))
+                .where(Users.id.in_({app.volunteer_id for app in apps_rows}))
+            )
+            volunteers_by_id = {user.id: user for user in volunteers_result.all()}
 
         # Enrich data based on context (volunteer or organizer view)
         apps_list = []
-        for app in apps_orm:
+        for app in apps_rows:
             # If filtering by volunteer, we likely want to see event details
             if filters.volunteer_id:
-                event = await self.session.get(Events, app.event_id)
+                event = events_by_id.get(app.event_id)
                 if event:
-                    organizer = await self.session.get(Users, event.organizer_id)
+                    organizer = organizers_by_id.get(event.organizer_id)
                     if organizer:
-                        organizer_dto = OrganizerRead(
-                            id=organizer.id,
-                            fullname=organizer.fullname,
-                            avatar_url=organizer.avatar_url
-                        )
-                        
-                        event_dto = EventListItem(
-                            id=event.id,
-                            title=event.title,
-                            location=event.location,
-                            start_date=event.start_date,
-                            end_date=event.end_date,
-                            required_volunteers=event.required_volunteers,
-                            status=event.status,
-                            event_image_url=event.event_image_url,
-                            organizer=organizer_dto,
-                            tags=[], 
-                            approved_volunteers_count=0
+                        event_dto = to_dto(
+                            EventListItem, event,
+                            organizer=to_dto(OrganizerRead, organizer),
+                            tags=[]
                         )
                         
-                        apps_list.append(ApplicationWithEvent(
-                            id=app.id,
-                            event_id=app.event_id,
-                            volunteer_id=app.volunteer_id,
-                            status=app.status,
-                            message=app.message,
-                            date_created=app.date_created,
+                        apps_list.append(to_dto(
+                            ApplicationWithEvent, app,
                             date_updated=app.date_created, # Fallback
                             event=event_dto
                         ))
                     else:
-                        apps_list.append(ApplicationRead.from_orm(app))
+                        apps_list.append(to_dto(ApplicationRead, app))
                 else:
-                    apps_list.append(ApplicationRead.from_orm(app))
+                    apps_list.append(to_dto(ApplicationRead, app))
             
             # If filtering by event, we likely want to see volunteer details
             elif filters.event_id:
-                volunteer = await self.session.get(Users, app.volunteer_id)
+                volunteer = volunteers_by_id.get(app.volunteer_id)
                 if volunteer:
-                    volunteer_dto = UserListItem(
-                        id=volunteer.id,
-                        fullname=volunteer.fullname,
-                        email=volunteer.email,
-                        avatar_url=volunteer.avatar_url,
-                        location=volunteer.location,
-                        date_created=volunteer.date_created,
+                    volunteer_dto = to_dto(
+                        UserListItem, volunteer,
                         roles=[] # Explicit empty list since ORM relations are missing
                     )
-                    apps_list.append(ApplicationWithVolunteer(
-                        id=app.id,
-                        event_id=app.event_id,
-                        volunteer_id=app.volunteer_id,
-                        status=app.status,
-                        message=app.message,
-                        date_created=app.date_created,
+                    apps_list.append(to_dto(
+                        ApplicationWithVolunteer, app,
                         date_updated=app.date_created,
                         volunteer=volunteer_dto
                     ))
                 else:
-                    apps_list.append(ApplicationRead.from_orm(app))
+                    apps_list.append(to_dto(ApplicationRead, app))
             
             # Default fallback
             else:
-                apps_list.append(ApplicationRead.from_orm(app))
+                apps_list.append(to_dto(ApplicationRead, app))
 
         return ApplicationListResponse(
             applications=apps_list,
@@ -1,6 +1,139 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import inspect, func, select, delete, literal, bindparam, all_, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# ключ в session.info, под которым копятся изменения до коммита
+CHANGED_ENTITIES_KEY = "changed_entities"
+# ключ в session.info для кэша чтений в пределах одной транзакции (UnitOfWork)
+READ_CACHE_KEY = "read_cache"
+
+DTO = TypeVar("DTO", bound=BaseModel)
+
+
+def to_dto(model_cls:Type[DTO], source:Any, **overrides) -> DTO:
+    """
+    Собирает DTO из ORM-объекта, Row или dict одним вызовом model_validate по словарю.
+    Заменяет from_orm(...) и Model(**orm.__dict__, ...): валидация словаря идёт в pydantic-core,
+    вложенные DTO из overrides не перевалидируются.
+    У ORM-объектов берутся загруженные атрибуты; просроченные колонки (после flush)
+    дочитываются как раньше через getattr, связи не загружаются.
+    """
+    if isinstance(source, Row):
+        data = dict(source._mapping)
+    elif isinstance(source, dict):
+        data = dict(source)
+    else:
+        state = inspect(source)
+        data = dict(state.dict)
+        for name in state.unloaded & set(state.mapper.column_attrs.keys()):
+            if name in model_cls.model_fields and name not in overrides:
+                data[name] = getattr(source, name)
+
+    data.update(overrides)
+    return model_cls.model_validate(data)
+
+
+@lru_cache(maxsize=None)
+def dto_columns(orm_cls:type, model_cls:Type[BaseModel], *extra:str) -> Tuple:
+    """
+    Колонки orm_cls, которые нужны DTO model_cls (совпадающие по имени с полями модели),
+    плюс служебные extra (например, внешние ключи для догрузки связанных данных).
+
+    Для списочных запросов: select(*dto_columns(Events, EventListItem)) вернёт Row
+    только с нужными колонками - крупные Text-поля, которых нет в DTO, из БД не читаются.
+    Row, а не частично загруженные сущности (load_only), чтобы в identity map сессии
+    не попадали объекты с незагруженными атрибутами - их ленивая догрузка в async невозможна.
+    """
+    names = set(model_cls.model_fields) | set(extra)
+    return tuple(
+        attr.class_attribute
+        for attr in inspect(orm_cls).column_attrs
+        if attr.key in names
+    )
+
 
 class BaseRepo:
     def __init__(self, session:AsyncSession):
         self.session: AsyncSession = session
+
+    def _register_change(self, entity:str, entity_id:int|None = None):
+        """
+        Помечает сущность как изменённую в текущей транзакции.
+        После успешного коммита UnitOfWork передаст изменения подписчикам (register_commit_listener).
+        entity_id = None означает "изменения без конкретного ID".
+        """
+        changes = self.session.info.setdefault(CHANGED_ENTITIES_KEY, {})
+        changes.setdefault(entity, set()).add(entity_id)
+
+        cached = self.session.info.get(READ_CACHE_KEY, {}).get(entity)
+        if cached:
+            if entity_id is None:
+                cached.clear()
+            else:
+                cached.pop(entity_id, None)
+
+    def _read_cache(self, entity:str) -> dict:
+        """
+        Кэш чтений сущности в пределах текущей транзакции: {entity_id: DTO}.
+        Запись сбрасывается при _register_change той же сущности, весь кэш - при откате.
+        """
+        return self.session.info.setdefault(READ_CACHE_KEY, {}).setdefault(entity, {})
+
+    async def try_advisory_xact_lock(self, key:int) -> bool:
+        """
+        Пытается взять транзакционную advisory-блокировку Postgres с ключом key (без ожидания).
+        Блокировка снимается при коммите/откате - так фоновую задачу в каждый момент
+        выполняет только один воркер.
+        """
+        return bool(await self.session.scalar(select(func.pg_try_advisory_xact_lock(key))))
+
+    async def _sync_links(
+        self,
+        owner_column,
+        owner_id:int,
+        target_column,
+        target_ids:Iterable[int]
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Приводит связи owner_id в таблице-связке (модель колонок owner_column/target_column) к набору target_ids.
+        Разница множеств считается в БД двумя выражениями: DELETE лишних (target <> ALL(:target_ids))
+        и INSERT ... SELECT unnest(:target_ids) ON CONFLICT DO NOTHING для недостающих.
+        Совпадающие строки не трогаются - нет мёртвых кортежей и лишних каскадов.
+        Нужен уникальный индекс (owner, target). Возвращает (добавленные, удалённые) ID.
+        """
+        link_model = owner_column.class_
+        target_ids = list(dict.fromkeys(target_ids))
+
+        removed = await self.session.scalars(
+            delete(link_model)
+            .where(
+                owner_column == owner_id,
+                target_column != all_(bindparam("target_ids", target_ids, type_=postgresql.ARRAY(Integer)))
+            )
+            .returning(target_column)
+        )
+        removed_ids = list(removed.all())
+
+        if not target_ids:
+            return [], removed_ids
+
+        wanted = (
+            func.unnest(bindparam("target_ids", target_ids, type_=postgresql.ARRAY(Integer)))
+            .table_valued(target_column.key)
+            .render_derived()
+            .alias("wanted")
+        )
+        added = await self.session.scalars(
+            postgresql.insert(link_model)
+            .from_select(
+                [owner_column.key, target_column.key],
+                select(literal(owner_id, Integer), wanted.c[target_column.key])
+            )
+            .on_conflict_do_nothing()
+            .returning(target_column)
+        )
+        return list(added.all()), removed_ids
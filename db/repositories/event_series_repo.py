@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, insert, func, case, bindparam, true, DateTime, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
+from typing import List, Optional
+
+from models.orm_db_models.tables import EventSeries, Events, EventTags, RequiredEventsSkills
+from db.repositories.base_repo import BaseRepo, to_dto
+from db.unit_of_work import register_repository
+from models.pydantic_response_request_models.event_dto import EventSeriesRead, EventStatus
+
+
+@register_repository("event_series")
+class EventSeriesRepo(BaseRepo):
+
+    async def create_series(self, organizer_id: int, rrule: str, dtstart: datetime, duration_minutes: int) -> EventSeriesRead:
+        """Создает серию; первое вхождение (dtstart) создаётся отдельно как обычное событие."""
+        series_orm = EventSeries(
+            organizer_id=organizer_id,
+            rrule=rrule,
+            dtstart=dtstart,
+            duration_minutes=duration_minutes,
+            materialized_until=dtstart,
+            is_active=True
+        )
+        self.session.add(series_orm)
+        await self.session.flush()
+        return to_dto(EventSeriesRead, series_orm)
+
+    async def get_series(self, series_id: int) -> EventSeriesRead | None:
+        """Получает серию по ID."""
+        # горизонт меняется UPDATE-ами в обход ORM - перечитываем строку
+        series = await self.session.get(EventSeries, series_id, populate_existing=True)
+        return to_dto(EventSeriesRead, series) if series else None
+
+    async def lock_series_to_materialize(self, until: datetime, series_id: Optional[int] = None) -> List[EventSeriesRead]:
+        """
+        Активные серии, вхождения которых созданы не до until.
+        Строки блокируются до конца транзакции, занятые другой транзакцией пропускаются (SKIP LOCKED) -
+        одну серию одновременно материализует только один воркер.
+        """
+        stmt = (
+            select(EventSeries)
+            .where(EventSeries.is_active.is_(True), EventSeries.materialized_until < until)
+            .order_by(EventSeries.id)
+            .with_for_update(skip_locked=True)
+        )
+        if series_id is not None:
+            stmt = stmt.where(EventSeries.id == series_id)
+
+        result = await self.session.execute(stmt)
+        return [to_dto(EventSeriesRead, series) for series in result.scalars().all()]
+
+    async def materialize_occurrences(self, series_id: int, starts: List[datetime], duration_minutes: int) -> List[int]:
+        """
+        Создает вхождения серии на моменты starts одним INSERT ... SELECT.
+        Поля, теги и навыки копируются с последнего неотменённого вхождения серии (шаблон),
+        уже существующие вхождения пропускаются (ON CONFLICT по series_id, start_date).
+        Возвращает ID созданных событий.
+        """
+        if not starts:
+            return []
+
+        template_id = await self.session.scalar(
+            select(Events.id)
+            .where(Events.series_id == series_id, Events.status != EventStatus.CANCELED)
+            .order_by(Events.start_date.desc())
+            .limit(1)
+        )
+        if template_id is None:
+            # все вхождения отменены - копировать не с чего
+            return []
+
+        template = aliased(Events)
+        occurrence = (
+            func.unnest(bindparam("starts", starts, type_=postgresql.ARRAY(DateTime)))
+            .table_valued("start_date")
+            .render_derived()
+            .alias("occurrence")
+        )
+
+        occurrences_select = (
+            select(
+                template.organizer_id,
+                template.series_id,
+                template.title,
+                template.description,
+                template.location,
+                template.required_volunteers,
+                template.event_image_url,
+                # завершённое вхождение было одобрено - новые вхождения тоже одобрены
+                case((template.status == EventStatus.COMPLETED, EventStatus.APPROVED), else_=template.status),
+                occurrence.c.start_date,
+                occurrence.c.start_date + timedelta(minutes=duration_minutes),
+            )
+            .select_from(template)
+            .join(occurrence, true())
+            .where(template.id == template_id)
+        )
+        result = await self.session.execute(
+            postgresql.insert(Events)
+            .from_select(
+                [
+                    "organizer_id", "series_id", "title", "description", "location",
+                    "required_volunteers", "event_image_url", "status", "start_date", "end_date",
+                ],
+                occurrences_select
+            )
+            .on_conflict_do_nothing(constraint="uq_events_series_start")
+            .returning(Events.id)
+        )
+        event_ids = list(result.scalars().all())
+        if not event_ids:
+            return []
+
+        new_event = aliased(Events)
+        await self.session.execute(
+            insert(EventTags).from_select(
+                ["event_id", "tag_id"],
+                select(new_event.id, EventTags.tag_id)
+                .join(EventTags, true())
+                .where(EventTags.event_id == template_id, new_event.id.in_(event_ids))
+            )
+        )
+        await self.session.execute(
+            insert(RequiredEventsSkills).from_select(
+                ["event_id", "skill_id"],
+                select(new_event.id, RequiredEventsSkills.skill_id)
+                .join(RequiredEventsSkills, true())
+                .where(RequiredEventsSkills.event_id == template_id, new_event.id.in_(event_ids))
+            )
+        )
+
+        for event_id in event_ids:
+            self._register_change("events", event_id)
+        return event_ids
+
+    async def set_materialized_until(self, series_id: int, materialized_until: datetime, is_active: bool = True):
+        """Сдвигает горизонт материализации серии; is_active = False - правило исчерпано."""
+        await self.session.execute(
+            update(EventSeries)
+            .where(EventSeries.id == series_id)
+            .values(
+                materialized_until=func.greatest(EventSeries.materialized_until, materialized_until),
+                is_active=is_active
+            )
+        )
+
+    async def get_occurrence_ids(self, series_id: int, from_date: datetime) -> List[int]:
+        """ID вхождений серии, начинающихся не раньше from_date."""
+        result = await self.session.scalars(
+            select(Events.id).where(Events.series_id == series_id, Events.start_date >= from_date)
+        )
+        return list(result.all())
+
+    async def update_occurrences(self, event_ids: List[int], values: dict) -> int:
+        """Обновляет поля вхождений одним UPDATE."""
+        if not event_ids or not values:
+            return 0
+
+        result = await self.session.execute(
+            update(Events).where(Events.id.in_(event_ids)).values(**values)
+        )
+        for event_id in event_ids:
+            self._register_change("events", event_id)
+        return result.rowcount
+
+    async def replace_occurrences_tags(self, event_ids: List[int], tag_ids: List[int]):
+        """Заменяет теги вхождений: один DELETE и один INSERT ... SELECT на все вхождения."""
+        await self._replace_occurrences_links(EventTags, "tag_id", event_ids, tag_ids)
+
+    async def replace_occurrences_skills(self, event_ids: List[int], skill_ids: List[int]):
+        """Заменяет требуемые навыки вхождений: один DELETE и один INSERT ... SELECT на все вхождения."""
+        await self._replace_occurrences_links(RequiredEventsSkills, "skill_id", event_ids, skill_ids)
+
+    async def _replace_occurrences_links(self, link_model, link_name: str, event_ids: List[int], link_ids: List[int]):
+        if not event_ids:
+            return
+
+        await self.session.execute(delete(link_model).where(link_model.event_id.in_(event_ids)))
+        if link_ids:
+            linked = (
+                func.unnest(bindparam(link_name, list(dict.fromkeys(link_ids)), type_=postgresql.ARRAY(Integer)))
+                .table_valued(link_name)
+                .render_derived()
+                .alias("linked")
+            )
+            await self.session.execute(
+                insert(link_model).from_select(
+                    ["event_id", link_name],
+                    select(Events.id, linked.c[link_name]).join(linked, true()).where(Events.id.in_(event_ids))
+                )
+            )
+
+        for event_id in event_ids:
+            self._register_change("events", event_id)
+
+    async def cancel_occurrences(self, event_ids: List[int]) -> int:
+        """Отменяет вхождения одним UPDATE."""
+        return await self.update_occurrences(event_ids, {"status": EventStatus.CANCELED})
+
+    async def deactivate_series(self, series_id: int):
+        """Завершает серию - новые вхождения больше не создаются."""
+        await self.session.execute(
+            update(EventSeries).where(EventSeries.id == series_id).values(is_active=False)
+        )
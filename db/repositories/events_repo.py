@@ -1,9 +1,13 @@
-from sqlalchemy import select, delete, update, func, insert, and_
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import select, delete, update, func, insert, and_, bindparam, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.engine import Row
+from typing import AsyncIterator, Dict, List, Optional, Set
 
-from models.orm_db_models.tables import Events, Users, EventTags, RequiredEventsSkills, Tags, Skills, Applications
-from db.repositories.base_repo import BaseRepo
+from models.orm_db_models.tables import Events, Users, EventTags, RequiredEventsSkills, Applications
+from db.repositories.base_repo import BaseRepo, to_dto, dto_columns
+from db.reference_data import reference_data
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.event_dto import (
     EventRead,
@@ -13,7 +17,10 @@ from models.pydantic_response_request_models.event_dto import (
     EventListItem,
     EventStatus,
     EventWithDetails,
-    EventFilters
+    EventFilters,
+    EventIndexEntry,
+    EventExportRow,
+    EventHeader
 )
 from models.pydantic_response_request_models.user_dto import OrganizerRead
 from models.pydantic_response_request_models.tag_dto import TagRead
@@ -24,52 +31,63 @@ from models.pydantic_response_request_models.skill_dto import SkillRead
 class EventsRepo(BaseRepo):
 
     async def get_event_by_id(self, event_id: int) -> EventWithDetails | None:
-        """Получает событие по ID с деталями (организатор, теги, навыки)."""
-        stmt = (
-            select(Events)
-            .options(
-                selectinload(Events.organizer_id),
-            )
-            .where(Events.id == event_id)
+        """
+        Событие с деталями одним запросом: событие, организатор (JOIN по связи Events.organizer),
+        ID тегов и навыков (подзапросы array_agg) и количество заявок. Одобренные - счётчик в самом событии,
+        названия тегов и навыков - из справочников в памяти.
+        """
+        tag_ids = (
+            select(func.array_agg(EventTags.tag_id))
+            .where(EventTags.event_id == Events.id)
+            .scalar_subquery()
+            .label("tag_ids")
         )
-        event = await self.session.get(Events, event_id)
-        if not event:
-            return None
-
-        organizer = await self.session.get(Users, event.organizer_id)
-        organizer_dto = OrganizerRead.from_orm(organizer)
-
-        tags_stmt = (
-            select(Tags)
-            .join(EventTags, EventTags.tag_id == Tags.id)
-            .where(EventTags.event_id == event_id)
+        skill_ids = (
+            select(func.array_agg(RequiredEventsSkills.skill_id))
+            .where(RequiredEventsSkills.event_id == Events.id)
+            .scalar_subquery()
+            .label("skill_ids")
         )
-        tags_result = await self.session.execute(tags_stmt)
-        tags_list = [TagRead.from_orm(t) for t in tags_result.scalars().all()]
-
-        skills_stmt = (
-            select(Skills)
-            .join(RequiredEventsSkills, RequiredEventsSkills.skill_id == Skills.id)
-            .where(RequiredEventsSkills.event_id == event_id)
+        applications_count = (
+            select(func.count())
+            .where(Applications.event_id == Events.id)
+            .scalar_subquery()
+            .label("applications_count")
         )
-        skills_result = await self.session.execute(skills_stmt)
-        skills_list = [SkillRead.from_orm(s) for s in skills_result.scalars().all()]
-        
-        return EventWithDetails(
-            **event.__dict__,
-            organizer=organizer_dto,
-            tags=tags_list,
-            required_skills=skills_list,
-            applications_count=0,
-            approved_volunteers_count=await self._count_approved_volunteers(event_id)
+
+        result = await self.session.execute(
+            select(Events, tag_ids, skill_ids, applications_count)
+            .join(Events.organizer)
+            .options(contains_eager(Events.organizer))
+            .where(Events.id == event_id)
+            .execution_options(populate_existing=True)
         )
+        row = result.first()
+        if not row:
+            return None
 
-    async def _count_approved_volunteers(self, event_id: int) -> int:
-        stmt = select(func.count()).select_from(Applications).where(
-            Applications.event_id == event_id,
-            Applications.status == 'approved'
+        event = row.Events
+        return to_dto(
+            EventWithDetails, event,
+            organizer=to_dto(OrganizerRead, event.organizer),
+            tags=await reference_data.resolve_tags(row.tag_ids or []),
+            required_skills=await reference_data.resolve_skills(row.skill_ids or []),
+            applications_count=row.applications_count
         )
-        return await self.session.scalar(stmt) or 0
+
+    async def get_event_header(self, event_id: int) -> EventHeader | None:
+        """
+        (id, organizer_id, status, required_volunteers) события одним запросом - для проверок прав.
+        Кэшируется в пределах UnitOfWork, изменение события через репозитории сбрасывает запись.
+        """
+        cached = self._read_cache("events")
+        if event_id not in cached:
+            result = await self.session.execute(
+                select(*dto_columns(Events, EventHeader)).where(Events.id == event_id)
+            )
+            row = result.first()
+            cached[event_id] = to_dto(EventHeader, row) if row else None
+        return cached[event_id]
 
     async def create_event(self, event_in: EventCreate, organizer_id: int) -> EventRead:
         """Создает новое событие."""
@@ -95,8 +113,75 @@ class EventsRepo(BaseRepo):
                     [{"event_id": event_orm.id, "skill_id": sid} for sid in event_in.skill_ids]
                 )
             )
-            
-        return EventRead.from_orm(event_orm)
+
+        self._register_change("events", event_orm.id)
+        return to_dto(EventRead, event_orm)
+
+    async def bulk_create_events(
+        self,
+        events_in: List[EventCreate],
+        organizer_id: int,
+        series_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Массовое создание событий: один multi-row INSERT ... RETURNING на события
+        и по одному INSERT на их теги и навыки. Возвращает ID в порядке events_in.
+        """
+        if not events_in:
+            return []
+
+        result = await self.session.execute(
+            insert(Events).returning(Events.id, sort_by_parameter_order=True),
+            [
+                {**event_in.model_dump(exclude={"tag_ids", "skill_ids"}), "organizer_id": organizer_id, "series_id": series_id}
+                for event_in in events_in
+            ]
+        )
+        event_ids = list(result.scalars().all())
+
+        tag_rows = [
+            {"event_id": event_id, "tag_id": tid}
+            for event_id, event_in in zip(event_ids, events_in)
+            for tid in event_in.tag_ids
+        ]
+        if tag_rows:
+            await self.session.execute(insert(EventTags), tag_rows)
+
+        skill_rows = [
+            {"event_id": event_id, "skill_id": sid}
+            for event_id, event_in in zip(event_ids, events_in)
+            for sid in event_in.skill_ids
+        ]
+        if skill_rows:
+            await self.session.execute(insert(RequiredEventsSkills), skill_rows)
+
+        for event_id in event_ids:
+            self._register_change("events", event_id)
+        return event_ids
+
+    async def stream_organizer_events(self, organizer_id: int, chunk_size: int) -> AsyncIterator[List[EventExportRow]]:
+        """
+        Отдаёт события организатора пачками по chunk_size через серверный курсор,
+        не загружая всю выборку в память. Теги и навыки - по запросу на пачку.
+        """
+        result = await self.session.stream(
+            select(*dto_columns(Events, EventExportRow))
+            .where(Events.organizer_id == organizer_id)
+            .order_by(Events.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            event_ids = [row.id for row in partition]
+            tags_by_event = await self._get_tags_by_event(event_ids)
+            skills_by_event = await self._get_skills_by_event(event_ids)
+            yield [
+                to_dto(
+                    EventExportRow, row,
+                    tags=[tag.name for tag in tags_by_event.get(row.id, [])],
+                    skills=[skill.name for skill in skills_by_event.get(row.id, [])]
+                )
+                for row in partition
+            ]
 
     async def update_event(self, event_id: int, event_in: EventUpdate) -> EventRead | None:
         """Обновляет событие."""
@@ -109,42 +194,158 @@ class EventsRepo(BaseRepo):
             setattr(event, key, value)
 
         if event_in.tag_ids is not None:
-            await self.session.execute(delete(EventTags).where(EventTags.event_id == event_id))
-            if event_in.tag_ids:
-                await self.session.execute(
-                    insert(EventTags).values(
-                        [{"event_id": event_id, "tag_id": tid} for tid in event_in.tag_ids]
-                    )
-                )
+            await self._sync_links(EventTags.event_id, event_id, EventTags.tag_id, event_in.tag_ids)
 
         if event_in.skill_ids is not None:
-            await self.session.execute(delete(RequiredEventsSkills).where(RequiredEventsSkills.event_id == event_id))
-            if event_in.skill_ids:
-                await self.session.execute(
-                    insert(RequiredEventsSkills).values(
-                        [{"event_id": event_id, "skill_id": sid} for sid in event_in.skill_ids]
-                    )
-                )
+            await self._sync_links(
+                RequiredEventsSkills.event_id, event_id, RequiredEventsSkills.skill_id, event_in.skill_ids
+            )
 
-        return EventRead.from_orm(event)
+        self._register_change("events", event_id)
+        return to_dto(EventRead, event)
 
     async def delete_event(self, event_id: int) -> int:
         """Удаляет событие."""
         stmt = delete(Events).where(Events.id == event_id)
         result = await self.session.execute(stmt)
+        self._register_change("events", event_id)
         return result.rowcount
 
     async def update_event_status(self, event_id: int, status: EventStatus) -> bool:
         """Обновляет статус события."""
         stmt = update(Events).where(Events.id == event_id).values(status=status)
         result = await self.session.execute(stmt)
+        self._register_change("events", event_id)
         return result.rowcount == 1
 
+    async def lock_event_capacity(self, event_id: int) -> Row | None:
+        """
+        Блокирует строку события (SELECT ... FOR UPDATE) и возвращает
+        (id, title, required_volunteers, approved_volunteers_count).
+        Все изменения одобренных заявок мероприятия идут под этой блокировкой - без гонок COUNT(*).
+        """
+        result = await self.session.execute(
+            select(Events.id, Events.title, Events.required_volunteers, Events.approved_volunteers_count)
+            .where(Events.id == event_id)
+            .with_for_update()
+        )
+        return result.first()
+
+    async def lock_events_capacity(self, event_ids: List[int]) -> List[Row]:
+        """
+        Блокирует строки событий event_ids одним SELECT ... FOR UPDATE (в порядке ID - без взаимоблокировок)
+        и возвращает их (id, title, required_volunteers, approved_volunteers_count).
+        """
+        if not event_ids:
+            return []
+
+        result = await self.session.execute(
+            select(Events.id, Events.title, Events.required_volunteers, Events.approved_volunteers_count)
+            .where(Events.id.in_(event_ids))
+            .order_by(Events.id)
+            .with_for_update()
+        )
+        return list(result.all())
+
+    async def lock_owned_events_capacity(self, organizer_id: int, app_ids: List[int]) -> List[Row]:
+        """
+        Блокирует (в порядке ID - без взаимоблокировок) мероприятия организатора, к которым относятся заявки app_ids,
+        и возвращает их (id, title, required_volunteers, approved_volunteers_count).
+        Чужие мероприятия не блокируются и не возвращаются.
+        """
+        result = await self.session.execute(
+            select(Events.id, Events.title, Events.required_volunteers, Events.approved_volunteers_count)
+            .where(
+                Events.organizer_id == organizer_id,
+                Events.id.in_(select(Applications.event_id).where(Applications.id.in_(app_ids)))
+            )
+            .order_by(Events.id)
+            .with_for_update()
+        )
+        return list(result.all())
+
+    async def change_approved_counts(self, deltas: Dict[int, int]):
+        """Сдвигает счётчики одобренных волонтёров событий ({event_id: delta}) одним UPDATE."""
+        deltas = {event_id: delta for event_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        changes = (
+            func.unnest(
+                bindparam("event_ids", list(deltas), type_=postgresql.ARRAY(Integer)),
+                bindparam("deltas", list(deltas.values()), type_=postgresql.ARRAY(Integer))
+            )
+            .table_valued("event_id", "delta")
+            .render_derived()
+            .alias("changes")
+        )
+        await self.session.execute(
+            update(Events)
+            .where(Events.id == changes.c.event_id)
+            .values(approved_volunteers_count=Events.approved_volunteers_count + changes.c.delta)
+        )
+        for event_id in deltas:
+            self._register_change("events", event_id)
+
+    async def complete_finished_events(self, now: datetime, batch_size: int) -> List[int]:
+        """
+        Переводит одну пачку одобренных событий с end_date < now в completed одним UPDATE
+        (по индексу ix_events_status_end_date). Строки, заблокированные другими транзакциями,
+        пропускаются. Возвращает ID завершённых событий.
+        """
+        batch_ids = (
+            select(Events.id)
+            .where(Events.status == EventStatus.APPROVED, Events.end_date < now)
+            .order_by(Events.end_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(Events)
+            .where(Events.id.in_(batch_ids.scalar_subquery()))
+            .values(status=EventStatus.COMPLETED)
+            .returning(Events.id)
+        )
+        event_ids = list(result.scalars().all())
+        for event_id in event_ids:
+            self._register_change("events", event_id)
+        return event_ids
+
+    async def mark_reminders_due(self, now: datetime, starts_before: datetime, batch_size: int) -> List[int]:
+        """
+        Отмечает одну пачку одобренных событий, начинающихся в [now, starts_before),
+        как получивших напоминание (reminder_sent_at). Повторно событие не попадёт в выборку.
+        Возвращает ID отмеченных событий.
+        """
+        batch_ids = (
+            select(Events.id)
+            .where(
+                Events.status == EventStatus.APPROVED,
+                Events.reminder_sent_at.is_(None),
+                Events.start_date >= now,
+                Events.start_date < starts_before
+            )
+            .order_by(Events.start_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(Events)
+            .where(Events.id.in_(batch_ids.scalar_subquery()))
+            .values(reminder_sent_at=now)
+            .returning(Events.id)
+        )
+        return list(result.scalars().all())
+
     async def get_paginated_events(self, filters: EventFilters) -> EventListResponse:
         """Пагинированный поиск событий с фильтрами."""
-        query = select(Events)
+        query = select(*dto_columns(Events, EventListItem, "organizer_id"))
 
+        if filters.search:
+            ts_query = func.websearch_to_tsquery('russian', filters.search)
+            query = query.where(Events.search_vector.op('@@')(ts_query))
         if filters.location:
+            # ILIKE с ведущим '%' обслуживается триграммным индексом ix_events_location_trgm
             query = query.where(Events.location.ilike(f"%{filters.location}%"))
         if filters.status:
             query = query.where(Events.status == filters.status)
@@ -156,40 +357,30 @@ class EventsRepo(BaseRepo):
             query = query.where(Events.organizer_id == filters.organizer_id)
 
         if filters.tag_ids:
-            query = query.join(EventTags).where(EventTags.tag_id.in_(filters.tag_ids)).distinct()
+            query = query.where(Events.id.in_(
+                select(EventTags.event_id).where(EventTags.tag_id.in_(filters.tag_ids))
+            ))
 
         if filters.skill_ids:
-            query = query.join(RequiredEventsSkills).where(RequiredEventsSkills.skill_id.in_(filters.skill_ids)).distinct()
+            query = query.where(Events.id.in_(
+                select(RequiredEventsSkills.event_id).where(RequiredEventsSkills.skill_id.in_(filters.skill_ids))
+            ))
 
         count_stmt = select(func.count()).select_from(query.subquery())
         total = await self.session.scalar(count_stmt) or 0
 
+        if filters.search:
+            query = query.order_by(func.ts_rank(Events.search_vector, ts_query).desc(), Events.id)
+        else:
+            # тот же порядок, что у EventsDiscoveryIndex.search - страницы совпадают при любом пути
+            query = query.order_by(Events.start_date, Events.id)
+
         offset = (filters.page - 1) * filters.page_size
         query = query.limit(filters.page_size).offset(offset)
         
         result = await self.session.execute(query)
-        events_orm = result.scalars().all()
+        events_list = await self._to_list_items(result.all())
 
-        events_list = []
-        for event in events_orm:
-            organizer = await self.session.get(Users, event.organizer_id)
-            organizer_dto = OrganizerRead.from_orm(organizer)
-
-            tags_stmt = (
-                select(Tags)
-                .join(EventTags, EventTags.tag_id == Tags.id)
-                .where(EventTags.event_id == event.id)
-            )
-            tags_res = await self.session.execute(tags_stmt)
-            tags_list = [TagRead.from_orm(t) for t in tags_res.scalars().all()]
-            
-            events_list.append(EventListItem(
-                **event.__dict__,
-                organizer=organizer_dto,
-                tags=tags_list,
-                approved_volunteers_count=await self._count_approved_volunteers(event.id)
-            ))
-            
         return EventListResponse(
             events=events_list,
             total=total,
@@ -199,28 +390,137 @@ class EventsRepo(BaseRepo):
 
     async def get_events_by_organizer(self, organizer_id: int) -> List[EventListItem]:
         """Получает все события организатора."""
-        stmt = select(Events).where(Events.organizer_id == organizer_id).order_by(Events.start_date.desc())
+        stmt = (
+            select(*dto_columns(Events, EventListItem))
+            .where(Events.organizer_id == organizer_id)
+            .order_by(Events.start_date.desc())
+        )
         result = await self.session.execute(stmt)
-        events_orm = result.scalars().all()
+        events_rows = result.all()
 
         organizer = await self.session.get(Users, organizer_id)
-        organizer_dto = OrganizerRead.from_orm(organizer) if organizer else None
+        organizer_dto = to_dto(OrganizerRead, organizer) if organizer else None
+        tags_by_event = await self._get_tags_by_event([event.id for event in events_rows])
         
         events_list = []
-        for event in events_orm:
-            tags_stmt = (
-                select(Tags)
-                .join(EventTags, EventTags.tag_id == Tags.id)
-                .where(EventTags.event_id == event.id)
-            )
-            tags_res = await self.session.execute(tags_stmt)
-            tags_list = [TagRead.from_orm(t) for t in tags_res.scalars().all()]
-            
-            events_list.append(EventListItem(
-                **event.__dict__,
+        for event in events_rows:
+            events_list.append(to_dto(
+                EventListItem, event,
                 organizer=organizer_dto,
-                tags=tags_list,
-                approved_volunteers_count=await self._count_approved_volunteers(event.id)
+                tags=tags_by_event.get(event.id, [])
             ))
             
         return events_list
+
+    async def _to_list_items(self, events_rows: List[Row]) -> List[EventListItem]:
+        """
+        Собирает элементы списка событий (организатор, теги, одобренные волонтёры)
+        из строк select(*dto_columns(Events, EventListItem, "organizer_id")).
+        """
+        tags_by_event = await self._get_tags_by_event([event.id for event in events_rows])
+        organizers = await self._get_organizers({event.organizer_id for event in events_rows})
+
+        events_list = []
+        for event in events_rows:
+            events_list.append(to_dto(
+                EventListItem, event,
+                organizer=organizers[event.organizer_id],
+                tags=tags_by_event.get(event.id, [])
+            ))
+
+        return events_list
+
+    async def _get_organizers(self, organizer_ids: Set[int]) -> Dict[int, OrganizerRead]:
+        """Организаторы для набора событий одним запросом, только колонки OrganizerRead."""
+        if not organizer_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(*dto_columns(Users, OrganizerRead)).where(Users.id.in_(organizer_ids))
+        )
+        return {row.id: to_dto(OrganizerRead, row) for row in result.all()}
+
+    async def _get_tags_by_event(self, event_ids: List[int]) -> Dict[int, List[TagRead]]:
+        """Теги для набора событий одним запросом, названия - из справочника."""
+        if not event_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(EventTags.event_id, EventTags.tag_id).where(EventTags.event_id.in_(event_ids))
+        )
+        tag_ids_by_event: Dict[int, List[int]] = {}
+        for event_id, tag_id in result.all():
+            tag_ids_by_event.setdefault(event_id, []).append(tag_id)
+
+        return {
+            event_id: await reference_data.resolve_tags(tag_ids)
+            for event_id, tag_ids in tag_ids_by_event.items()
+        }
+
+    async def _get_skills_by_event(self, event_ids: List[int]) -> Dict[int, List[SkillRead]]:
+        """Требуемые навыки для набора событий одним запросом, названия - из справочника."""
+        if not event_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(RequiredEventsSkills.event_id, RequiredEventsSkills.skill_id)
+            .where(RequiredEventsSkills.event_id.in_(event_ids))
+        )
+        skill_ids_by_event: Dict[int, List[int]] = {}
+        for event_id, skill_id in result.all():
+            skill_ids_by_event.setdefault(event_id, []).append(skill_id)
+
+        return {
+            event_id: await reference_data.resolve_skills(skill_ids)
+            for event_id, skill_ids in skill_ids_by_event.items()
+        }
+
+    async def get_event_list_items_by_ids(self, event_ids: List[int]) -> List[EventListItem]:
+        """Получает элементы списка событий по ID с сохранением порядка event_ids."""
+        if not event_ids:
+            return []
+
+        result = await self.session.execute(
+            select(*dto_columns(Events, EventListItem, "organizer_id")).where(Events.id.in_(event_ids))
+        )
+        events_by_id = {event.id: event for event in result.all()}
+        events_rows = [events_by_id[eid] for eid in event_ids if eid in events_by_id]
+        return await self._to_list_items(events_rows)
+
+    async def get_index_entries(self, status: EventStatus, event_ids: Optional[List[int]] = None) -> List[EventIndexEntry]:
+        """
+        Получает данные событий со статусом status для in-memory индекса поиска.
+        Если переданы event_ids - только для этих событий.
+        """
+        events_stmt = select(Events.id, Events.location, Events.start_date).where(Events.status == status)
+        if event_ids is not None:
+            events_stmt = events_stmt.where(Events.id.in_(event_ids))
+
+        events_result = await self.session.execute(events_stmt)
+        entries = {
+            row.id: EventIndexEntry(id=row.id, location=row.location, start_date=row.start_date)
+            for row in events_result.all()
+        }
+        if not entries:
+            return []
+
+        selected_ids = select(Events.id).where(Events.status == status)
+        if event_ids is not None:
+            selected_ids = selected_ids.where(Events.id.in_(event_ids))
+
+        tags_result = await self.session.execute(
+            select(EventTags.event_id, EventTags.tag_id).where(EventTags.event_id.in_(selected_ids))
+        )
+        for event_id, tag_id in tags_result.all():
+            if event_id in entries:
+                entries[event_id].tag_ids.append(tag_id)
+
+        skills_result = await self.session.execute(
+            select(RequiredEventsSkills.event_id, RequiredEventsSkills.skill_id)
+            .where(RequiredEventsSkills.event_id.in_(selected_ids))
+        )
+        for event_id, skill_id in skills_result.all():
+            if event_id in entries:
+                entries[event_id].skill_ids.append(skill_id)
+
+        return list(entries.values())
@@ -1,15 +1,21 @@
-from sqlalchemy import select, delete, update, func, insert
+from datetime import datetime
+from sqlalchemy import select, delete, update, func, insert, text, literal
 from typing import List
 
-from models.orm_db_models.tables import Notifications
-from db.repositories.base_repo import BaseRepo
+from models.orm_db_models.tables import Notifications, NotificationsArchive, Events, Applications
+from db.repositories.base_repo import BaseRepo, to_dto
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.notification_dto import (
     NotificationRead,
     NotificationCreate,
     NotificationListResponse,
-    NotificationFilters
+    NotificationFilters,
+    NotificationType
 )
+from models.pydantic_response_request_models.application_dto import ApplicationStatus
+
+# ссылки на мероприятие/заявку в таблице notifications не хранятся
+NOTIFICATION_LINK_FIELDS = {"related_event_id", "related_application_id"}
 
 
 @register_repository("notifications")
@@ -17,17 +23,17 @@ class NotificationsRepo(BaseRepo):
 
     async def create_notification(self, notif_in: NotificationCreate) -> NotificationRead:
         """Создает уведомление."""
-        notif_orm = Notifications(**notif_in.model_dump())
+        notif_orm = Notifications(**notif_in.model_dump(exclude=NOTIFICATION_LINK_FIELDS))
         self.session.add(notif_orm)
         await self.session.flush()
-        return NotificationRead.from_orm(notif_orm)
+        return to_dto(NotificationRead, notif_orm)
 
     async def bulk_create_notifications(self, notifs_in: List[NotificationCreate]) -> int:
         """Массовое создание уведомлений."""
         if not notifs_in:
             return 0
             
-        values = [n.model_dump() for n in notifs_in]
+        values = [n.model_dump(exclude=NOTIFICATION_LINK_FIELDS) for n in notifs_in]
         stmt = insert(Notifications).values(values)
         result = await self.session.execute(stmt)
         return result.rowcount
@@ -56,7 +62,7 @@ class NotificationsRepo(BaseRepo):
         notifs_orm = result.scalars().all()
 
         return NotificationListResponse(
-            notifications=[NotificationRead.from_orm(n) for n in notifs_orm],
+            notifications=[to_dto(NotificationRead, n) for n in notifs_orm],
             total=total,
             unread_count=unread_count,
             page=filters.page,
@@ -91,3 +97,87 @@ class NotificationsRepo(BaseRepo):
         )
         result = await self.session.execute(stmt)
         return result.rowcount
+
+    async def enqueue_event_reminders(self, event_ids: List[int]) -> int:
+        """
+        Создает напоминания EVENT_REMINDER одобренным волонтёрам событий event_ids
+        одним INSERT ... SELECT, без выборки заявок в приложение.
+        Возвращает количество созданных уведомлений.
+        """
+        if not event_ids:
+            return 0
+
+        message = func.left(
+            "«" + Events.title + "» начнётся " + func.to_char(Events.start_date, "DD.MM.YYYY HH24:MI"),
+            Notifications.message.type.length
+        )
+        reminders = (
+            select(
+                Applications.volunteer_id,
+                literal("Напоминание о мероприятии"),
+                message,
+                literal(NotificationType.EVENT_REMINDER.value),
+            )
+            .join(Events, Events.id == Applications.event_id)
+            .where(Applications.event_id.in_(event_ids), Applications.status == ApplicationStatus.APPROVED)
+        )
+        result = await self.session.execute(
+            insert(Notifications).from_select(["user_id", "title", "message", "type"], reminders)
+        )
+        return result.rowcount
+
+    async def get_oldest_archivable_date(self, older_than: datetime) -> datetime | None:
+        """Дата самого старого прочитанного уведомления, подлежащего архивации."""
+        stmt = select(func.min(Notifications.created_at)).where(
+            Notifications.is_read == True,
+            Notifications.created_at < older_than
+        )
+        return await self.session.scalar(stmt)
+
+    async def ensure_archive_partition(self, month_start: datetime, month_end: datetime) -> str:
+        """Создает секцию архива уведомлений за месяц [month_start, month_end), если её ещё нет."""
+        partition_name = f"{NotificationsArchive.__tablename__}_y{month_start:%Y}m{month_start:%m}"
+        await self.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name} "
+            f"PARTITION OF {NotificationsArchive.__tablename__} "
+            f"FOR VALUES FROM ('{month_start:%Y-%m-%d}') TO ('{month_end:%Y-%m-%d}')"
+        ))
+        return partition_name
+
+    async def archive_read_notifications(self, older_than: datetime, batch_size: int) -> int:
+        """
+        Переносит одну пачку прочитанных уведомлений старше older_than в архив.
+        Перенос выполняется одним выражением (DELETE ... RETURNING -> INSERT),
+        строки, заблокированные другими транзакциями, пропускаются.
+        Возвращает количество перенесенных строк.
+        """
+        archived_columns = [
+            Notifications.id,
+            Notifications.user_id,
+            Notifications.title,
+            Notifications.message,
+            Notifications.type,
+            Notifications.is_read,
+            Notifications.created_at,
+        ]
+
+        batch_ids = (
+            select(Notifications.id)
+            .where(Notifications.is_read == True, Notifications.created_at < older_than)
+            .order_by(Notifications.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Notifications)
+            .where(Notifications.id.in_(batch_ids.scalar_subquery()))
+            .returning(*archived_columns)
+            .cte("moved")
+        )
+        stmt = (
+            insert(NotificationsArchive)
+            .from_select([c.name for c in archived_columns], select(moved))
+            .add_cte(moved)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
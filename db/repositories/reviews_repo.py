@@ -2,7 +2,7 @@ from sqlalchemy import select, func
 from typing import List, Optional
 
 from models.orm_db_models.tables import Reviews, Users, Events
-from db.repositories.base_repo import BaseRepo
+from db.repositories.base_repo import BaseRepo, to_dto, dto_columns
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.review_dto import (
     ReviewRead,
@@ -23,12 +23,12 @@ class ReviewsRepo(BaseRepo):
         review_orm = Reviews(**review_in.model_dump(), from_user_id=from_user_id)
         self.session.add(review_orm)
         await self.session.flush()
-        return ReviewRead.from_orm(review_orm)
+        return to_dto(ReviewRead, review_orm)
 
     async def get_review_by_id(self, review_id: int) -> ReviewRead | None:
         """Получает отзыв по ID."""
         review = await self.session.get(Reviews, review_id)
-        return ReviewRead.from_orm(review) if review else None
+        return to_dto(ReviewRead, review) if review else None
 
     async def get_paginated_reviews(self, filters: ReviewFilters) -> ReviewListResponse:
         """Пагинированный список отзывов."""
@@ -55,15 +55,21 @@ class ReviewsRepo(BaseRepo):
         result = await self.session.execute(query)
         reviews_orm = result.scalars().all()
 
+        # авторы и адресаты страницы - одним запросом, только колонки UserListItem
+        users_by_id = {}
+        user_ids = {review.from_user_id for review in reviews_orm} | {review.to_user_id for review in reviews_orm}
+        if user_ids:
+            users_result = await self.session.execute(
+                select(*dto_columns(Users, UserListItem)).where(Users.id.in_(user_ids))
+            )
+            users_by_id = {user.id: to_dto(UserListItem, user) for user in users_result.all()}
+
         reviews_list = []
         for review in reviews_orm:
-            from_user = await self.session.get(Users, review.from_user_id)
-            to_user = await self.session.get(Users, review.to_user_id)
-            
-            reviews_list.append(ReviewWithUsers(
-                **review.__dict__,
-                from_user=UserListItem.from_orm(from_user),
-                to_user=UserListItem.from_orm(to_user)
+            reviews_list.append(to_dto(
+                ReviewWithUsers, review,
+                from_user=users_by_id[review.from_user_id],
+                to_user=users_by_id[review.to_user_id]
             ))
 
         return ReviewListResponse(
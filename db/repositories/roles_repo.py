@@ -1,8 +1,10 @@
-from sqlalchemy import select, delete, insert
-from typing import List
+from sqlalchemy import select, delete, func, bindparam, true, Integer
+from sqlalchemy.dialects import postgresql
+from typing import List, Tuple
 
-from models.orm_db_models.tables import Roles, RolesInfo
+from models.orm_db_models.tables import Roles
 from db.repositories.base_repo import BaseRepo
+from db.reference_data import reference_data
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.role_dto import (
     RoleRead,
@@ -14,36 +16,74 @@ from models.pydantic_response_request_models.role_dto import (
 class RolesRepo(BaseRepo):
 
     async def get_all_roles(self) -> RoleListResponse:
-        """Получает список всех доступных ролей."""
-        stmt = select(RolesInfo)
-        result = await self.session.execute(stmt)
-        roles_orm = result.scalars().all()
-        
-        roles_list = [RoleRead.from_orm(role) for role in roles_orm]
+        """Получает список всех доступных ролей (из справочника в памяти)."""
+        await reference_data.ensure_loaded()
+        roles_list = list(reference_data.roles.values())
         return RoleListResponse(roles=roles_list, total=len(roles_list))
 
     async def get_role_by_id(self, role_id: int) -> RoleRead | None:
         """Получает роль по ID."""
-        role = await self.session.get(RolesInfo, role_id)
-        return RoleRead.from_orm(role) if role else None
+        roles = await reference_data.resolve_roles([role_id])
+        return roles[0] if roles else None
 
     async def get_role_by_name(self, role_name: str) -> RoleRead | None:
         """Получает роль по названию."""
-        stmt = select(RolesInfo).where(RolesInfo.role_name == role_name)
-        result = await self.session.execute(stmt)
-        role = result.scalar_one_or_none()
-        return RoleRead.from_orm(role) if role else None
+        await reference_data.ensure_loaded()
+        return next((role for role in reference_data.roles.values() if role.role_name == role_name), None)
 
     async def add_role_to_user(self, user_id: int, role_id: int) -> bool:
-        """Добавляет роль пользователю."""
-        stmt = select(Roles).where(Roles.user_id == user_id, Roles.role_id == role_id)
-        result = await self.session.execute(stmt)
-        if result.scalar_one_or_none():
-            return False  # Уже есть
+        """Добавляет роль пользователю. False - роль уже была."""
+        result = await self.session.execute(
+            postgresql.insert(Roles)
+            .values(user_id=user_id, role_id=role_id)
+            .on_conflict_do_nothing(constraint="uq_user_role")
+            .returning(Roles.id)
+        )
+        added = result.first() is not None
+        if added:
+            self._register_change("users", user_id)
+        return added
+
+    async def set_user_roles(self, user_id: int, role_ids: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Приводит роли пользователя к role_ids двумя выражениями (INSERT ... ON CONFLICT DO NOTHING
+        и DELETE ... WHERE role_id <> ALL(...)). Возвращает (добавленные, снятые) ID ролей.
+        """
+        added, removed = await self._sync_links(Roles.user_id, user_id, Roles.role_id, role_ids)
+        if added or removed:
+            self._register_change("users", user_id)
+        return added, removed
 
-        stmt = insert(Roles).values(user_id=user_id, role_id=role_id)
-        await self.session.execute(stmt)
-        return True
+    async def add_roles_to_users(self, user_ids: List[int], role_ids: List[int]) -> int:
+        """
+        Выдает каждому из user_ids все роли role_ids одним INSERT ... SELECT (unnest x unnest)
+        ON CONFLICT DO NOTHING. Возвращает количество новых назначений.
+        """
+        if not user_ids or not role_ids:
+            return 0
+
+        granted_users = (
+            func.unnest(bindparam("user_ids", list(dict.fromkeys(user_ids)), type_=postgresql.ARRAY(Integer)))
+            .table_valued("user_id")
+            .render_derived()
+            .alias("granted_users")
+        )
+        granted_roles = (
+            func.unnest(bindparam("role_ids", list(dict.fromkeys(role_ids)), type_=postgresql.ARRAY(Integer)))
+            .table_valued("role_id")
+            .render_derived()
+            .alias("granted_roles")
+        )
+        result = await self.session.execute(
+            postgresql.insert(Roles)
+            .from_select(["user_id", "role_id"], select(granted_users.c.user_id, granted_roles.c.role_id).join(granted_roles, true()))
+            .on_conflict_do_nothing(constraint="uq_user_role")
+            .returning(Roles.user_id)
+        )
+        assigned_user_ids = result.scalars().all()
+        for user_id in set(assigned_user_ids):
+            self._register_change("users", user_id)
+        return len(assigned_user_ids)
 
     async def remove_role_from_user(self, user_id: int, role_id: int) -> bool:
         """Удаляет роль у пользователя."""
@@ -53,11 +93,6 @@ class RolesRepo(BaseRepo):
 
     async def get_user_roles(self, user_id: int) -> List[RoleRead]:
         """Получает список ролей пользователя."""
-        stmt = (
-            select(RolesInfo)
-            .join(Roles, Roles.role_id == RolesInfo.id)
-            .where(Roles.user_id == user_id)
-        )
+        stmt = select(Roles.role_id).where(Roles.user_id == user_id)
         result = await self.session.execute(stmt)
-        roles_orm = result.scalars().all()
-        return [RoleRead.from_orm(role) for role in roles_orm]
+        return await reference_data.resolve_roles(result.scalars().all())
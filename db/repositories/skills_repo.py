@@ -1,8 +1,9 @@
 from sqlalchemy import select, delete, update, func, bindparam
-from typing import List
+from typing import Dict, List
 
 from models.orm_db_models.tables import Skills
-from db.repositories.base_repo import BaseRepo
+from db.repositories.base_repo import BaseRepo, to_dto
+from db.reference_data import reference_data
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.skill_dto import (
     SkillRead,
@@ -16,26 +17,23 @@ from models.pydantic_response_request_models.skill_dto import (
 class SkillsRepo(BaseRepo):
 
     async def get_all_skills(self) -> SkillListResponse:
-        """Получает список всех навыков."""
-        stmt = select(Skills)
-        result = await self.session.execute(stmt)
-        skills_orm = result.scalars().all()
-        return SkillListResponse(
-            skills=[SkillRead.from_orm(s) for s in skills_orm],
-            total=len(skills_orm)
-        )
+        """Получает список всех навыков (из справочника в памяти)."""
+        await reference_data.ensure_loaded()
+        skills = list(reference_data.skills.values())
+        return SkillListResponse(skills=skills, total=len(skills))
 
     async def get_skill_by_id(self, skill_id: int) -> SkillRead | None:
         """Получает навык по ID."""
-        skill = await self.session.get(Skills, skill_id)
-        return SkillRead.from_orm(skill) if skill else None
+        skills = await reference_data.resolve_skills([skill_id])
+        return skills[0] if skills else None
 
     async def create_skill(self, skill_in: SkillCreate) -> SkillRead:
         """Создает новый навык."""
         skill_orm = Skills(**skill_in.model_dump())
         self.session.add(skill_orm)
         await self.session.flush()
-        return SkillRead.from_orm(skill_orm)
+        self._register_change("skills", skill_orm.id)
+        return to_dto(SkillRead, skill_orm)
 
     async def update_skill(self, skill_id: int, skill_in: SkillUpdate) -> SkillRead | None:
         """Обновляет навык."""
@@ -47,20 +45,23 @@ class SkillsRepo(BaseRepo):
         for key, value in update_data.items():
             setattr(skill, key, value)
 
-        return SkillRead.from_orm(skill)
+        self._register_change("skills", skill_id)
+        return to_dto(SkillRead, skill)
 
     async def delete_skill(self, skill_id: int) -> int:
         """Удаляет навык."""
         stmt = delete(Skills).where(Skills.id == skill_id)
         result = await self.session.execute(stmt)
+        self._register_change("skills", skill_id)
         return result.rowcount
 
     async def get_skills_by_ids(self, skill_ids: List[int]) -> List[SkillRead]:
         """Получает список навыков по списку ID."""
-        stmt = select(Skills).where(Skills.id.in_(skill_ids))
-        result = await self.session.execute(stmt)
-        skills_orm = result.scalars().all()
-        return [SkillRead.from_orm(skill) for skill in skills_orm]
+        return await reference_data.resolve_skills(skill_ids)
+
+    async def get_skill_ids_by_names(self, names: List[str]) -> Dict[str, int]:
+        """Получает ID навыков по названиям (название -> ID), неизвестные названия пропускаются."""
+        return await reference_data.skill_ids_by_names(names)
 
     async def get_paginated_skills(self, page: int, page_size: int) -> SkillListResponse:
         """Пагинированный список навыков."""
@@ -73,7 +74,7 @@ class SkillsRepo(BaseRepo):
         skills_orm = result.scalars().all()
 
         return SkillListResponse(
-            skills=[SkillRead.from_orm(s) for s in skills_orm],
+            skills=[to_dto(SkillRead, s) for s in skills_orm],
             total=total,
             page=page,
             page_size=page_size
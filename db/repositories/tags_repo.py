@@ -1,8 +1,9 @@
 from sqlalchemy import select, delete, update, func
-from typing import List
+from typing import Dict, List
 
 from models.orm_db_models.tables import Tags
-from db.repositories.base_repo import BaseRepo
+from db.repositories.base_repo import BaseRepo, to_dto
+from db.reference_data import reference_data
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.tag_dto import (
     TagRead,
@@ -16,23 +17,22 @@ from models.pydantic_response_request_models.tag_dto import (
 class TagsRepo(BaseRepo):
 
     async def get_all_tags(self) -> List[TagRead]:
-        """Получает список всех тегов."""
-        stmt = select(Tags)
-        result = await self.session.execute(stmt)
-        tags_orm = result.scalars().all()
-        return [TagRead.from_orm(tag) for tag in tags_orm]
+        """Получает список всех тегов (из справочника в памяти)."""
+        await reference_data.ensure_loaded()
+        return list(reference_data.tags.values())
 
     async def get_tag_by_id(self, tag_id: int) -> TagRead | None:
         """Получает тег по ID."""
-        tag = await self.session.get(Tags, tag_id)
-        return TagRead.from_orm(tag) if tag else None
+        tags = await reference_data.resolve_tags([tag_id])
+        return tags[0] if tags else None
 
     async def create_tag(self, tag_in: TagCreate) -> TagRead:
         """Создает новый тег."""
         tag_orm = Tags(**tag_in.model_dump())
         self.session.add(tag_orm)
         await self.session.flush()
-        return TagRead.from_orm(tag_orm)
+        self._register_change("tags", tag_orm.id)
+        return to_dto(TagRead, tag_orm)
 
     async def update_tag(self, tag_id: int, tag_in: TagUpdate) -> TagRead | None:
         """Обновляет тег."""
@@ -44,20 +44,23 @@ class TagsRepo(BaseRepo):
         for key, value in update_data.items():
             setattr(tag, key, value)
 
-        return TagRead.from_orm(tag)
+        self._register_change("tags", tag_id)
+        return to_dto(TagRead, tag)
 
     async def delete_tag(self, tag_id: int) -> int:
         """Удаляет тег."""
         stmt = delete(Tags).where(Tags.id == tag_id)
         result = await self.session.execute(stmt)
+        self._register_change("tags", tag_id)
         return result.rowcount
 
     async def get_tags_by_ids(self, tag_ids: List[int]) -> List[TagRead]:
         """Получает список тегов по списку ID."""
-        stmt = select(Tags).where(Tags.id.in_(tag_ids))
-        result = await self.session.execute(stmt)
-        tags_orm = result.scalars().all()
-        return [TagRead.from_orm(tag) for tag in tags_orm]
+        return await reference_data.resolve_tags(tag_ids)
+
+    async def get_tag_ids_by_names(self, names: List[str]) -> Dict[str, int]:
+        """Получает ID тегов по названиям (название -> ID), неизвестные названия пропускаются."""
+        return await reference_data.tag_ids_by_names(names)
 
     async def get_paginated_tags(self, page: int, page_size: int) -> TagListResponse:
         """Пагинированный список тегов."""
@@ -70,7 +73,7 @@ class TagsRepo(BaseRepo):
         tags_orm = result.scalars().all()
 
         return TagListResponse(
-            tags=[TagRead.from_orm(t) for t in tags_orm],
+            tags=[to_dto(TagRead, t) for t in tags_orm],
             total=total,
             page=page,
             page_size=page_size
@@ -1,8 +1,9 @@
 from sqlalchemy import delete, select, update, func
 from sqlalchemy.orm import selectinload
 
-from models.orm_db_models.tables import Users, Roles, RolesInfo, Applications, Events, Reviews, Skills, UserSkills
-from db.repositories.base_repo import BaseRepo
+from models.orm_db_models.tables import Users, Roles, Applications, Events, Reviews, UserSkills
+from db.repositories.base_repo import BaseRepo, to_dto, dto_columns
+from db.reference_data import reference_data
 from db.unit_of_work import register_repository
 from models.pydantic_response_request_models.user_dto import (
     UserRead,
@@ -12,9 +13,8 @@ from models.pydantic_response_request_models.user_dto import (
     UserPasswordChange,
     UserListResponse,
     UserListItem, UserRegister,
-    UserCabinetInfo, UserStatistics, UserEventsInfo, RoleRead
+    UserCabinetInfo, UserStatistics, UserEventsInfo
 )
-from models.pydantic_response_request_models.skill_dto import SkillRead
 
 
 @register_repository("users")
@@ -23,7 +23,7 @@ class UserRepo(BaseRepo):
     async def get_user(self, user_id: int) -> UserRead | None:
         """Получает пользователя по ID и возвращает UserRead."""
         data = await self.session.get(Users, user_id)
-        return UserRead.from_orm(data) if data else None
+        return to_dto(UserRead, data) if data else None
 
     async def create_user(self, user_in: UserRegister) -> UserRead:  # ИСПРАВЛЕНО: на UserInDB
         """Создает нового пользователя (ожидает хешированный пароль)."""
@@ -31,7 +31,7 @@ class UserRepo(BaseRepo):
         self.session.add(user_orm)
         await self.session.flush()
 
-        return UserRead.from_orm(user_orm)
+        return to_dto(UserRead, user_orm)
 
     async def update_user(self, user_in: UserUpdate) -> UserRead | None:
         """Обновляет поля пользователя по ID."""
@@ -45,7 +45,8 @@ class UserRepo(BaseRepo):
         for key, value in update_data.items():
             setattr(user, key, value)
 
-        return UserRead.from_orm(user)
+        self._register_change("users", user_in.id)
+        return to_dto(UserRead, user)
 
     async def delete_by_id(self, user_id: int) -> int:
         """Удаляет пользователя по ID и возвращает количество удаленных строк."""
@@ -62,7 +63,7 @@ class UserRepo(BaseRepo):
         result = await self.session.execute(stmt)
         user_orm = result.scalar_one_or_none()
 
-        return UserInDB.from_orm(user_orm) if user_orm else None
+        return to_dto(UserInDB, user_orm) if user_orm else None
 
     async def change_password(self, user_id: int, new_hashed_password: str) -> bool:
         """
@@ -83,7 +84,7 @@ class UserRepo(BaseRepo):
         """
         user_orm = await self.session.get(Users, user_id)
 
-        return UserPublic.from_orm(user_orm) if user_orm else None
+        return to_dto(UserPublic, user_orm) if user_orm else None
 
     async def get_total_users_count(self) -> int:
         """Получает общее количество пользователей для пагинации."""
@@ -99,24 +100,23 @@ class UserRepo(BaseRepo):
         
         offset = (page - 1) * page_size
         
-        stmt = select(Users).limit(page_size).offset(offset)
+        stmt = select(*dto_columns(Users, UserListItem)).limit(page_size).offset(offset)
         result = await self.session.execute(stmt)
-        users_orm = result.scalars().all()
+        users_rows = result.all()
         
+        role_ids_by_user = {}
+        if users_rows:
+            roles_res = await self.session.execute(
+                select(Roles.user_id, Roles.role_id).where(Roles.user_id.in_([user.id for user in users_rows]))
+            )
+            for role_user_id, role_id in roles_res.all():
+                role_ids_by_user.setdefault(role_user_id, []).append(role_id)
+
         users_list = []
-        for user in users_orm:
-            stmt_roles = select(RolesInfo).join(Roles, Roles.role_id == RolesInfo.id).where(Roles.user_id == user.id)
-            roles_res = await self.session.execute(stmt_roles)
-            roles = roles_res.scalars().all()
-            
-            user_dto = UserListItem(
-                id=user.id,
-                fullname=user.fullname,
-                email=user.email,
-                avatar_url=user.avatar_url,
-                location=user.location,
-                date_created=user.date_created,
-                roles=[RoleRead.from_orm(r) for r in roles]
+        for user in users_rows:
+            user_dto = to_dto(
+                UserListItem, user,
+                roles=await reference_data.resolve_roles(role_ids_by_user.get(user.id, []))
             )
             users_list.append(user_dto)
         
@@ -179,7 +179,7 @@ class UserRepo(BaseRepo):
         result = await self.session.execute(stmt)
         events_orm = result.scalars().all()
 
-        return [UserEventsInfo.from_orm(e) for e in events_orm]
+        return [to_dto(UserEventsInfo, e) for e in events_orm]
 
     async def get_user_cabinet_info(self, user_id: int) -> UserCabinetInfo | None:
         """
@@ -189,25 +189,21 @@ class UserRepo(BaseRepo):
         if not user:
             return None
 
-        stmt_roles = select(RolesInfo).join(Roles, Roles.role_id == RolesInfo.id).where(Roles.user_id == user_id)
-        roles_res = await self.session.execute(stmt_roles)
-        roles_list = roles_res.scalars().all()
+        role_ids = await self.session.scalars(select(Roles.role_id).where(Roles.user_id == user_id))
+        roles_list = await reference_data.resolve_roles(role_ids.all())
 
-        stmt_skills = select(Skills).join(UserSkills, UserSkills.skill_id == Skills.id).where(UserSkills.user_id == user_id)
-        skills_res = await self.session.execute(stmt_skills)
-        skills_list = skills_res.scalars().all()
+        skill_ids = await self.session.scalars(select(UserSkills.skill_id).where(UserSkills.user_id == user_id))
+        skills_list = await reference_data.resolve_skills(skill_ids.all())
 
         stats = await self.get_user_statistics(user_id)
 
         events_participated = await self.get_user_events(user_id, role='volunteer')
         events_organized = await self.get_user_events(user_id, role='organizer')
 
-        user_read = UserRead.from_orm(user)
-        
-        return UserCabinetInfo(
-            **user_read.model_dump(),
-            roles=[RoleRead.from_orm(r) for r in roles_list],
-            skills=[SkillRead.from_orm(s) for s in skills_list],
+        return to_dto(
+            UserCabinetInfo, user,
+            roles=roles_list,
+            skills=skills_list,
             statistics=stats,
             events_participated=events_participated,
             events_organized=events_organized
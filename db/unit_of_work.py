@@ -1,10 +1,14 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Type
+from sqlalchemy import func, select
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Type
 
+from db.change_broadcast import CHANGES_CHANNEL, encode_changes
 from db.manager import db_manager
-from db.repositories.base_repo import BaseRepo
+from db.repositories.base_repo import BaseRepo, CHANGED_ENTITIES_KEY, READ_CACHE_KEY
 from loguru import logger
+from settings import settings
+from tracing.tracer import instrument_class
 
 class UnitOfWork:
     def __init__(self, db_session:AsyncSession, repo_registry:Dict[str, Type[BaseRepo]]):
@@ -23,6 +27,10 @@ class UnitOfWork:
         if self._is_committed:
             raise RuntimeError("Cannot commit - already committed")
         try:
+            changes = self.session.info.pop(CHANGED_ENTITIES_KEY, {})
+            if changes and settings.CHANGE_BROADCAST_ENABLED:
+                # NOTIFY транзакционный - другие воркеры узнают об изменениях только после коммита
+                await self.session.execute(select(func.pg_notify(CHANGES_CHANNEL, encode_changes(changes))))
             await self.session.commit()
             self._is_committed = True
             logger.info(f"Транзакция успешно зафиксирована (коммит выполнен). Статус: {self._is_committed}")
@@ -30,10 +38,15 @@ class UnitOfWork:
             logger.error(f"Сбой фиксации (commit failed): {e}")
             raise e
 
+        if changes:
+            await notify_commit_listeners(changes)
+
     async def rollback(self):
         if self._is_committed:
             raise RuntimeError("Cannot rollback - transaction is already committed")
 
+        self.session.info.pop(CHANGED_ENTITIES_KEY, None)
+        self.session.info.pop(READ_CACHE_KEY, None)
         await self.session.rollback()
         logger.warning(f"Откат транзакции (rollback transaction)")
 
@@ -63,10 +76,27 @@ REPOSITORY_REGISTRY:Dict[str, Type[BaseRepo]] = {}
 
 def register_repository(name:str):
     def decorator(repo_class: Type[BaseRepo]):
-        REPOSITORY_REGISTRY[name] = repo_class
-        return repo_class
+        REPOSITORY_REGISTRY[name] = instrument_class(repo_class, {"db.repository": name})
+        return REPOSITORY_REGISTRY[name]
     return decorator
 
+CommitListener = Callable[[Dict[str, Set[Optional[int]]]], Awaitable[None]]
+COMMIT_LISTENERS:List[CommitListener] = []
+
+def register_commit_listener(listener:CommitListener):
+    """Подписывает обработчик на изменения, зафиксированные UnitOfWork.commit"""
+    COMMIT_LISTENERS.append(listener)
+    return listener
+
+async def notify_commit_listeners(changes:Dict[str, Set[Optional[int]]]):
+    """Передаёт подписчикам изменения этого процесса или других воркеров (см. change_broadcast)"""
+    for listener in COMMIT_LISTENERS:
+        try:
+            await listener(changes)
+        except Exception as e:
+            # транзакция уже зафиксирована - ошибка подписчика не должна ронять запрос
+            logger.error(f"Ошибка обработчика коммита {listener.__name__}: {e}")
+
 
 
 async def get_uow(
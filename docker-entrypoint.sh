@@ -1,11 +1,18 @@
 #!/bin/bash
 set -e
 
-echo "🔑 Generating new JWT keys..."
-python -c "from app.security.generate_jwt_keys import generate_jwt_keys; generate_jwt_keys()"
+# Ключи создаются только при первом запуске: токены переживают перезапуск и деплой,
+# все воркеры используют одну пару (каталог ключей - volume в docker-compose)
+echo "🔑 Checking JWT keys..."
+python -c "from app.security.generate_jwt_keys import ensure_jwt_keys; print('✅ JWT keys generated' if ensure_jwt_keys() else '✅ Using existing JWT keys')"
 
-echo "✅ JWT keys generated successfully"
-echo "🚀 Starting application with $@ workers..."
+# uvicorn берёт число воркеров из WEB_CONCURRENCY; по умолчанию - по числу доступных CPU
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-$(python -c "from app.core.deployment import default_worker_count; print(default_worker_count())")}"
+# Срезы метрик воркеров (/metrics складывает их); старые от прошлого запуска удаляются
+export METRICS_DIR="${METRICS_DIR:-/tmp/metrics}"
+rm -rf "$METRICS_DIR" && mkdir -p "$METRICS_DIR"
+
+echo "🚀 Starting application with ${WEB_CONCURRENCY} workers..."
 
 # Запуск приложения с переданными аргументами
 exec "$@"
@@ -3,19 +3,31 @@ from pathlib import Path
 from settings import settings
 import os
 
-logs_dir = Path(settings.LOG_DIR)
-os.makedirs(logs_dir, exist_ok=True)
+_file_sink_id = None
 
-logger.add(
-	f"{settings.LOG_DIR}/app.log",
-	enqueue=True,
-	format="{time} {level} {message}",
-	level="DEBUG",
-	rotation="10 MB",
-    retention="14 days",
-    compression="zip",
-	backtrace=True,
-    diagnose=True,
-)
 
-logger.info(f"✅ Logger initialized. Log file: {logs_dir}")
\ No newline at end of file
+def setup_file_logging():
+	"""
+	Подключает файл логов с ротацией. Вызывается при старте воркера (lifespan), а не при импорте:
+	импорт не создаёт каталог и поток записи, скрипты и миграции не трогают app.log.
+	"""
+	global _file_sink_id
+	if _file_sink_id is not None:
+		return
+
+	logs_dir = Path(settings.LOG_DIR)
+	os.makedirs(logs_dir, exist_ok=True)
+
+	_file_sink_id = logger.add(
+		f"{settings.LOG_DIR}/app.log",
+		enqueue=True,
+		format="{time} {level} {message}",
+		level="DEBUG",
+		rotation="10 MB",
+		retention="14 days",
+		compression="zip",
+		backtrace=True,
+		diagnose=True,
+	)
+
+	logger.info(f"✅ Logger initialized. Log file: {logs_dir}")
@@ -1,10 +1,20 @@
+import time
+
+# отсчёт холодного старта воркера: импорт приложения + lifespan до приёма запросов
+_started_at = time.perf_counter()
+
+import asyncio
 import uvicorn
-from logger.logger import logger
-from contextlib import asynccontextmanager
+from logger.logger import setup_file_logging
+from contextlib import AsyncExitStack, asynccontextmanager
 from loguru import logger
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from db.manager import db_manager
+from db.reference_data import reference_data
+from db.change_broadcast import change_broadcast_listener
+from db.unit_of_work import notify_commit_listeners
 from fastapi.exceptions import RequestValidationError, HTTPException
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.core.exceptions import AppException, NotFoundError
@@ -16,16 +26,72 @@ from app.core.handlers import (
     sqlalchemy_exception_handler,
     general_exception_handler
 )
-from app.endpoints import main_router
+from app.endpoints import main_router, metrics_router
+from app.background_jobs.notifications_retention import run_notifications_retention
+from app.background_jobs.events_recurrence import run_events_recurrence
+from app.background_jobs.events_lifecycle import run_events_lifecycle
+from app.discovery.events_discovery_index import events_discovery_index
+from app.response_cache.cache_backends import response_cache_backend
+from app.response_cache.cache_middleware import ResponseCacheMiddleware
+from app.profiling.profiling_middleware import ProfilingMiddleware
+from app.email_functools.verify_codes_storage import codes_storage
+from app.core.deployment import audit_process_local_state
+from app.security.generate_jwt_keys import load_jwt_keys
+from tracing.tracer import TRACING_ENABLED, install_sql_tracing, setup_tracing, shutdown_tracing
+from tracing.request_middleware import TracingMiddleware
+from app.metrics.red_metrics import MetricsMiddleware, run_metrics_flush
+from settings import settings
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Запуск приложения")
-
-    async with db_manager:
-        logger.info("Приложение запущено")
+    setup_file_logging()
+    logger.info(f"Запуск приложения (импорт {time.perf_counter() - _started_at:.2f} с)")
+    audit_process_local_state()
+    setup_tracing()
+
+    async with AsyncExitStack() as stack:
+        # ключи JWT читаются с диска в потоке, пока создаётся пул и идёт health check БД
+        # ошибка одной проверки поднимается после завершения другой: открытый пул закроет stack
+        results = await asyncio.gather(
+            asyncio.to_thread(load_jwt_keys), stack.enter_async_context(db_manager), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        install_sql_tracing(db_manager.engine)
+        if settings.CHANGE_BROADCAST_ENABLED:
+            # подписка до загрузки справочников и индекса - изменения на время загрузки не теряются
+            await change_broadcast_listener.start(db_manager.engine.url, notify_commit_listeners)
+
+        async with db_manager.get_session() as session:
+            await reference_data.load(session)
+
+        background_tasks = [
+            # индекс строится после начала приёма запросов, до готовности поиск идёт через БД
+            asyncio.create_task(events_discovery_index.build_in_background()),
+            asyncio.create_task(run_notifications_retention()),
+            asyncio.create_task(run_events_recurrence()),
+            asyncio.create_task(run_events_lifecycle()),
+        ]
+        if settings.METRICS_DIR:
+            background_tasks.append(asyncio.create_task(run_metrics_flush()))
+
+        startup_time = time.perf_counter() - _started_at
+        if startup_time > settings.STARTUP_TIME_BUDGET:
+            logger.warning(f"Старт воркера занял {startup_time:.2f} с - больше бюджета {settings.STARTUP_TIME_BUDGET} с")
+        logger.info(f"Приложение запущено за {startup_time:.2f} с")
         yield
 
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await change_broadcast_listener.stop()
+        await events_discovery_index.close()
+        await response_cache_backend.close()
+        await codes_storage.close()
+
+    shutdown_tracing()
+
     logger.info("Приложение остановленно")
 
 
@@ -33,9 +99,13 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Volunteer Platform API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Кеш публичных ответов - добавляется до CORS, чтобы ответы из кеша тоже получали CORS-заголовки
+app.add_middleware(ResponseCacheMiddleware)
+
 # CORS настройки для работы с frontend
 app.add_middleware(
     CORSMiddleware,
@@ -45,8 +115,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Профилирование по требованию - снаружи кеша и CORS: профиль покрывает обработку запроса приложением,
+# но не метрики и трассировку ниже (они добавлены позже и оборачивают профилировщик)
+app.add_middleware(ProfilingMiddleware)
+
+# RED-метрики по маршрутам - снаружи профилировщика: длительность профилируемых запросов
+# включает его накладные расходы
+app.add_middleware(MetricsMiddleware)
+
+# Корневой спан запроса - самый внешний middleware
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 
 app.include_router(main_router)
+app.include_router(metrics_router)
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Text, Boolean, UniqueConstraint, \
-    CheckConstraint, func
-from sqlalchemy.orm import DeclarativeBase
+    CheckConstraint, Index, PrimaryKeyConstraint, Computed, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import DeclarativeBase, deferred, relationship
 
 
 class Base(DeclarativeBase):
@@ -8,6 +9,14 @@ class Base(DeclarativeBase):
     pass
 
 
+'''
+Связи (relationship) объявлены с lazy="raise": в асинхронном коде ленивая загрузка недоступна,
+нужные связи подгружаются явно (joinedload/selectinload/contains_eager) в репозиториях.
+Коллекции - passive_deletes: каскадное удаление делает БД (ON DELETE CASCADE / SET NULL).
+Многие-ко-многим - viewonly: связи пишутся репозиториями напрямую через таблицы-связки.
+'''
+
+
 '''
 Пользователи
 '''
@@ -24,6 +33,11 @@ class Users(Base):
     date_last_login = Column(DateTime, server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True, nullable=False)
 
+    skills = relationship('Skills', secondary='user_skills', viewonly=True, lazy='raise')
+    roles = relationship('RolesInfo', secondary='roles', viewonly=True, lazy='raise')
+    organized_events = relationship('Events', back_populates='organizer', passive_deletes=True, lazy='raise')
+    applications = relationship('Applications', back_populates='volunteer', passive_deletes=True, lazy='raise')
+
 '''
 Навыки
 '''
@@ -85,15 +99,77 @@ class Events(Base):
     __tablename__ = 'events'
     id = Column(Integer, primary_key=True)
     organizer_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    # вхождение серии повторяющихся мероприятий (см. EventSeries)
+    series_id = Column(Integer, ForeignKey('event_series.id', ondelete='SET NULL'), nullable=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     location = Column(String(255), nullable=False, index=True)
     required_volunteers = Column(Integer, nullable=False)
+    # счётчик одобренных заявок: меняется только под блокировкой строки события (app/admission)
+    approved_volunteers_count = Column(Integer, nullable=False, default=0, server_default='0')
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     status = Column(String(20), default='pending', index=True)
     event_image_url = Column(String(500), nullable=True)
     date_created = Column(DateTime, server_default=func.now())
+    # когда волонтёрам отправлено напоминание EVENT_REMINDER (фоновая задача жизненного цикла)
+    reminder_sent_at = Column(DateTime, nullable=True)
+    # Полнотекстовый поиск: генерируемая колонка, в ORM не загружается
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('russian'::regconfig, title || ' ' || description || ' ' || location)",
+            persisted=True
+        )
+    ))
+
+    organizer = relationship('Users', back_populates='organized_events', lazy='raise')
+    series = relationship('EventSeries', back_populates='occurrences', lazy='raise')
+    tags = relationship('Tags', secondary='event_tags', viewonly=True, lazy='raise')
+    required_skills = relationship('Skills', secondary='required_events_skills', viewonly=True, lazy='raise')
+    applications = relationship('Applications', back_populates='event', passive_deletes=True, lazy='raise')
+
+    __table_args__ = (
+        # одно вхождение серии на момент начала - повторная материализация идемпотентна
+        UniqueConstraint('series_id', 'start_date', name='uq_events_series_start'),
+        # перевод approved -> completed по end_date пачками
+        Index('ix_events_status_end_date', 'status', 'end_date'),
+        # одобренные события, по которым ещё не отправлено напоминание
+        Index(
+            'ix_events_reminder_due', 'start_date',
+            postgresql_where=text("status = 'approved' AND reminder_sent_at IS NULL")
+        ),
+        Index('ix_events_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_events_location_trgm', 'location',
+            postgresql_using='gin',
+            postgresql_ops={'location': 'gin_trgm_ops'}
+        ),
+    )
+
+'''
+Серии повторяющихся мероприятий
+    rrule - правило повторения RFC 5545 (FREQ=WEEKLY;BYDAY=SA;COUNT=10), отсчёт от dtstart
+    вхождения - строки events с series_id, создаются заранее только до materialized_until
+    (скользящий горизонт), данные копируются с последнего вхождения серии
+    is_active = false - правило исчерпано (COUNT/UNTIL) или серия завершена организатором
+'''
+class EventSeries(Base):
+    __tablename__ = 'event_series'
+    id = Column(Integer, primary_key=True)
+    organizer_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    rrule = Column(String(500), nullable=False)
+    dtstart = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False)
+    materialized_until = Column(DateTime, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    date_created = Column(DateTime, server_default=func.now())
+
+    occurrences = relationship('Events', back_populates='series', passive_deletes=True, lazy='raise')
+
+    __table_args__ = (
+        Index('ix_event_series_active_materialized', 'is_active', 'materialized_until'),
+    )
 
 '''
 Теги id и название
@@ -146,8 +222,13 @@ class Applications(Base):
     status = Column(String(20), default='pending', index=True)
     date_created = Column(DateTime, server_default=func.now())
 
+    event = relationship('Events', back_populates='applications', lazy='raise')
+    volunteer = relationship('Users', back_populates='applications', lazy='raise')
+
     __table_args__ = (
         UniqueConstraint('event_id', 'volunteer_id', name='uq_event_volunteer'),
+        # очередь заявок мероприятия по статусу (лист ожидания - в порядке подачи)
+        Index('ix_applications_event_status_created', 'event_id', 'status', 'date_created'),
     )
 '''
 Обратная связь после проведения мероприятия 
@@ -166,6 +247,10 @@ class Reviews(Base):
     comment = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
+    event = relationship('Events', lazy='raise')
+    from_user = relationship('Users', foreign_keys=[from_user_id], lazy='raise')
+    to_user = relationship('Users', foreign_keys=[to_user_id], lazy='raise')
+
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
     )
@@ -186,3 +271,29 @@ class Notifications(Base):
     type = Column(String(20), nullable=False)
     is_read = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_notifications_is_read_created_at', 'is_read', 'created_at'),
+    )
+
+'''
+Архив прочитанных уведомлений
+Заполняется фоновой задачей ретенции (app/background_jobs/notifications_retention.py),
+партиционирован по месяцам created_at - секции создаются задачей по мере необходимости.
+Первичный ключ включает created_at, т.к. ключ партиционирования обязан входить в PK
+'''
+class NotificationsArchive(Base):
+    __tablename__ = 'notifications_archive'
+    id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    message = Column(String(255), nullable=False)
+    type = Column(String(20), nullable=False)
+    is_read = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
@@ -15,6 +15,7 @@ class ApplicationStatus(str, Enum):
     APPROVED = "approved"  # Одобрена организатором
     REJECTED = "rejected"  # Отклонена организатором
     CANCELED = "canceled"  # Отменена волонтером
+    WAITLISTED = "waitlisted"  # Одобрена сверх лимита - в листе ожидания, одобряется при освобождении места
 
 
 # ============= BASE =============
@@ -97,6 +98,18 @@ class ApplicationFilters(BaseModel):
     page_size: int = Field(default=20, ge=1, le=100)
 
 
+class ApplicationExportRow(BaseModel):
+    """Строка выгрузки заявок мероприятия с контактами волонтёра"""
+    id: int
+    status: ApplicationStatus
+    message: Optional[str] = None
+    date_created: datetime
+    volunteer_id: int
+    volunteer_fullname: str
+    volunteer_email: str
+    volunteer_location: Optional[str] = None
+
+
 class ApplicationListResponse(BaseModel):
     """Пагинированный список заявок"""
     applications: list[Union[ApplicationWithEvent, ApplicationWithVolunteer, ApplicationRead]]
@@ -61,6 +61,87 @@ class EventCreate(EventBase):
     )
 
 
+# ============= SERIES =============
+class EventSeriesCreate(EventCreate):
+    """Создание серии повторяющихся мероприятий: start_date/end_date задают первое вхождение"""
+    rrule: str = Field(
+        ..., max_length=500,
+        description="Правило повторения RFC 5545 без DTSTART, например FREQ=WEEKLY;BYDAY=SA;COUNT=10"
+    )
+
+
+class EventSeriesUpdate(BaseModel):
+    """Изменение будущих вхождений серии (partial). Расписание серии не меняется"""
+    title: Optional[str] = Field(None, min_length=5, max_length=255)
+    description: Optional[str] = Field(None, min_length=20)
+    location: Optional[str] = Field(None, max_length=255)
+    required_volunteers: Optional[int] = Field(None, ge=1, le=1000)
+    event_image_url: Optional[str] = Field(None, max_length=500)
+    tag_ids: Optional[List[int]] = None
+    skill_ids: Optional[List[int]] = None
+    from_date: Optional[datetime] = Field(None, description="Менять вхождения начиная с (по умолчанию - с текущего момента)")
+
+
+class EventSeriesRead(BaseModel):
+    """Серия повторяющихся мероприятий"""
+    id: int
+    organizer_id: int
+    rrule: str
+    dtstart: datetime
+    duration_minutes: int
+    materialized_until: datetime
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ============= BULK =============
+class EventImportRow(EventBase):
+    """Строка массового импорта: теги и навыки задаются названиями (в CSV - через ';')"""
+    tags: List[str] = Field(default_factory=list, description="Названия тегов")
+    skills: List[str] = Field(default_factory=list, description="Названия требуемых навыков")
+
+    @field_validator('tags', 'skills', mode='before')
+    @classmethod
+    def split_names(cls, v):
+        # прочие типы отклоняет List[str] - ошибка попадает в отчёт по строке, а не в 500
+        if v is None:
+            return []
+        if isinstance(v, str):
+            v = v.split(';')
+        if not isinstance(v, list):
+            return v
+        return [name.strip() if isinstance(name, str) else name for name in v if not isinstance(name, str) or name.strip()]
+
+
+class EventImportRowError(BaseModel):
+    """Ошибка строки импорта: строка пропущена, остальные импортируются"""
+    line: int = Field(..., description="Номер строки во входном файле")
+    errors: List[str]
+
+
+class EventImportResult(BaseModel):
+    """Итог массового импорта"""
+    created: int
+    event_ids: List[int] = Field(default_factory=list)
+    errors: List[EventImportRowError] = Field(default_factory=list)
+
+
+class EventExportRow(BaseModel):
+    """Строка экспорта; формат совместим с импортом (id и status при импорте игнорируются)"""
+    id: int
+    title: str
+    description: str
+    location: str
+    required_volunteers: int
+    start_date: datetime
+    end_date: datetime
+    event_image_url: Optional[str] = None
+    status: EventStatus
+    tags: List[str] = Field(default_factory=list)
+    skills: List[str] = Field(default_factory=list)
+
+
 # ============= UPDATE =============
 class EventUpdate(BaseModel):
     """Обновление события (partial, только организатор)"""
@@ -95,6 +176,7 @@ class EventRead(EventBase):
     organizer_id: int
     status: EventStatus
     event_image_url: Optional[str] = None
+    series_id: Optional[int] = None
     date_created: datetime
     date_updated: Optional[datetime] = None
 
@@ -135,6 +217,7 @@ class EventListItem(BaseModel):
 class EventFilters(BaseModel):
     """Фильтры для поиска событий"""
     location: Optional[str] = Field(None, description="Фильтр по городу")
+    search: Optional[str] = Field(None, max_length=255, description="Полнотекстовый поиск по названию, описанию и месту")
     tag_ids: Optional[List[int]] = Field(None, description="Фильтр по тегам")
     skill_ids: Optional[List[int]] = Field(None, description="Фильтр по навыкам")
     status: Optional[EventStatus] = Field(None, description="Фильтр по статусу")
@@ -146,6 +229,23 @@ class EventFilters(BaseModel):
     page_size: int = Field(default=20, ge=1, le=100)
 
 
+class EventIndexEntry(BaseModel):
+    """Данные одобренного события для in-memory индекса публичного поиска"""
+    id: int
+    location: str
+    start_date: datetime
+    tag_ids: List[int] = Field(default_factory=list)
+    skill_ids: List[int] = Field(default_factory=list)
+
+
+class EventHeader(BaseModel):
+    """Минимальные данные события для проверок прав и статуса"""
+    id: int
+    organizer_id: int
+    status: EventStatus
+    required_volunteers: int
+
+
 class EventListResponse(BaseModel):
     """Пагинированный список событий"""
     events: List[EventListItem]
@@ -0,0 +1,69 @@
+import re
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import List, Optional
+
+
+class ProfileFormat(str, Enum):
+    """Форматы выгрузки профиля"""
+    SPEEDSCOPE = "speedscope"  # JSON для speedscope.app (flamegraph)
+    HTML = "html"  # интерактивный отчёт pyinstrument
+    TEXT = "text"  # дерево вызовов текстом
+
+
+# ============= UPDATE =============
+class ProfilingUpdate(BaseModel):
+    """Включение/выключение профилирования запросов (только админ)"""
+    enabled: bool = Field(..., description="Профилировать запросы")
+    sample_rate: float = Field(0.01, ge=0, le=1, description="Доля профилируемых запросов")
+    route: Optional[str] = Field(None, max_length=255, description="Регулярное выражение пути запроса")
+    duration_seconds: int = Field(600, ge=1, le=86400, description="Через сколько секунд выключить")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "enabled": True,
+                "sample_rate": 0.1,
+                "route": "^/v1/events/\\d+$",
+                "duration_seconds": 600
+            }
+        }
+    )
+
+    @field_validator('route')
+    @classmethod
+    def validate_route(cls, v: Optional[str]) -> Optional[str]:
+        """Шаблон пути должен компилироваться"""
+        if v is not None:
+            try:
+                re.compile(v)
+            except re.error as e:
+                raise ValueError(f'Некорректное регулярное выражение: {e}')
+        return v
+
+
+# ============= READ =============
+class ProfilingStatus(ProfilingUpdate):
+    """Текущее состояние профилирования в воркере"""
+    expires_at: Optional[datetime] = None
+    worker: str
+    profiles_count: int
+    buffer_size: int
+
+
+class ProfileInfo(BaseModel):
+    """Сохранённый профиль запроса (без самого профиля)"""
+    id: int
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    duration_ms: float
+    started_at: datetime
+    worker: str
+
+
+class ProfileListResponse(BaseModel):
+    """Профили в кольцевом буфере воркера, новые первыми"""
+    items: List[ProfileInfo]
+    worker: str
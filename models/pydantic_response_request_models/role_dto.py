@@ -46,4 +46,10 @@ class RoleRead(BaseModel):
 class RoleListResponse(BaseModel):
     """Список всех ролей"""
     roles: list[RoleRead]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class RolesBulkAssign(BaseModel):
+    """Массовая выдача ролей пользователям (только админ)"""
+    user_ids: list[int] = Field(..., min_length=1, max_length=10000)
+    role_ids: list[int] = Field(..., min_length=1, max_length=20)
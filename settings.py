@@ -3,29 +3,121 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+_REQUIRED = object()
+
+
+class SettingsError(RuntimeError):
+    pass
+
+
+class _Env:
+    """
+    Читает переменные окружения за один проход: ошибки копятся и выводятся все разом,
+    а не по одной на каждый перезапуск.
+    """
+
+    def __init__(self):
+        self.errors = []
+
+    def str(self, name, default=None, choices=None):
+        value = os.getenv(name)
+        if not value:
+            if default is _REQUIRED:
+                self.errors.append(f"{name}: не задана")
+            return None if default is _REQUIRED else default
+        if choices and value not in choices:
+            self.errors.append(f"{name}={value!r}: ожидается одно из {', '.join(choices)}")
+        return value
+
+    def int(self, name, default=_REQUIRED):
+        return self._number(int, name, default)
+
+    def float(self, name, default=_REQUIRED):
+        return self._number(float, name, default)
+
+    def bool(self, name, default: bool):
+        value = os.getenv(name)
+        return default if not value else value.lower() == "true"
+
+    def _number(self, cast, name, default):
+        value = os.getenv(name)
+        if not value:
+            if default is _REQUIRED:
+                self.errors.append(f"{name}: не задана")
+                return None
+            return default
+        try:
+            return cast(value)
+        except ValueError:
+            self.errors.append(f"{name}={value!r}: ожидается число")
+            return None
+
+    def check(self):
+        if self.errors:
+            raise SettingsError("Некорректные настройки окружения:\n- " + "\n- ".join(self.errors))
+
+
+_env = _Env()
+
+
 class Settings:
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
-    FAST_API_DATABASE_URI = os.getenv("DATABASE_URL_ASYNC")
-    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE"))
-    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW"))
-    LOG_DIR = os.getenv("LOG_DIR")
-    DEFAULT_DIR = os.getenv("DEFAULT_DIR")
-    DEFAULT_PRIV = os.getenv("DEFAULT_PRIV")
-    DEFAULT_PUB = os.getenv("DEFAULT_PUB")
-    KEY_SIZE = int(os.getenv("KEY_SIZE"))
-    ACCESS_TOKEN_NAME = os.getenv("ACCESS_TOKEN_NAME")
-    JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
-    ACCESS_TOKEN_EXPIRE = int(os.getenv("ACCESS_TOKEN_EXPIRE"))
-    JWT_PRIVATE_KEY_PATH = os.getenv("JWT_PRIVATE_KEY_PATH")
-    JWT_PUBLIC_KEY_PATH = os.getenv("JWT_PUBLIC_KEY_PATH")
-    JWT_KEY_ID = os.getenv("JWT_KEY_ID")
-    VERIFY_CODE_EXPIRE = int(os.getenv("VERIFY_CODE_EXPIRE"))
-    VERIFY_TOKEN_EXPIRE = int(os.getenv("VERIFY_TOKEN_EXPIRE"))
-    SMTP_HOST = os.getenv("SMTP_HOST")
-    SMTP_PORT = int(os.getenv("SMTP_PORT"))
-    SMTP_USER = os.getenv("SMTP_USER")
-    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-    SMTP_FROM = os.getenv("SMTP_FROM")
-    VERIFY_TOKEN_NAME = os.getenv("VERIFY_TOKEN_NAME")
+    SQLALCHEMY_DATABASE_URI = _env.str("DATABASE_URL")
+    FAST_API_DATABASE_URI = _env.str("DATABASE_URL_ASYNC", _REQUIRED)
+    DB_POOL_SIZE = _env.int("DB_POOL_SIZE")
+    DB_MAX_OVERFLOW = _env.int("DB_MAX_OVERFLOW")
+    LOG_DIR = _env.str("LOG_DIR", _REQUIRED)
+    DEFAULT_DIR = _env.str("DEFAULT_DIR", _REQUIRED)
+    DEFAULT_PRIV = _env.str("DEFAULT_PRIV")
+    DEFAULT_PUB = _env.str("DEFAULT_PUB")
+    KEY_SIZE = _env.int("KEY_SIZE")
+    ACCESS_TOKEN_NAME = _env.str("ACCESS_TOKEN_NAME", _REQUIRED)
+    JWT_ALGORITHM = _env.str("JWT_ALGORITHM", _REQUIRED)
+    ACCESS_TOKEN_EXPIRE = _env.int("ACCESS_TOKEN_EXPIRE")
+    JWT_PRIVATE_KEY_PATH = _env.str("JWT_PRIVATE_KEY_PATH", _REQUIRED)
+    JWT_PUBLIC_KEY_PATH = _env.str("JWT_PUBLIC_KEY_PATH", _REQUIRED)
+    JWT_KEY_ID = _env.str("JWT_KEY_ID")
+    VERIFY_CODE_EXPIRE = _env.int("VERIFY_CODE_EXPIRE")
+    VERIFY_TOKEN_EXPIRE = _env.int("VERIFY_TOKEN_EXPIRE")
+    SMTP_HOST = _env.str("SMTP_HOST")
+    SMTP_PORT = _env.int("SMTP_PORT")
+    SMTP_USER = _env.str("SMTP_USER")
+    SMTP_PASSWORD = _env.str("SMTP_PASSWORD")
+    SMTP_FROM = _env.str("SMTP_FROM")
+    VERIFY_TOKEN_NAME = _env.str("VERIFY_TOKEN_NAME", _REQUIRED)
+    NOTIFICATIONS_RETENTION_DAYS = _env.int("NOTIFICATIONS_RETENTION_DAYS", 90)
+    NOTIFICATIONS_ARCHIVE_BATCH_SIZE = _env.int("NOTIFICATIONS_ARCHIVE_BATCH_SIZE", 1000)
+    NOTIFICATIONS_ARCHIVE_INTERVAL = _env.int("NOTIFICATIONS_ARCHIVE_INTERVAL", 3600)
+    RESPONSE_CACHE_BACKEND = _env.str("RESPONSE_CACHE_BACKEND", "memory", choices=("memory", "redis"))
+    RESPONSE_CACHE_TTL = _env.int("RESPONSE_CACHE_TTL", 30)
+    RESPONSE_CACHE_MAX_ENTRIES = _env.int("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+    REDIS_URL = _env.str("REDIS_URL", "redis://localhost:6379/0")
+    REFERENCE_DATA_TTL = _env.int("REFERENCE_DATA_TTL", 300)
+    EVENTS_BULK_CHUNK_SIZE = _env.int("EVENTS_BULK_CHUNK_SIZE", 500)
+    EVENTS_BULK_MAX_ROWS = _env.int("EVENTS_BULK_MAX_ROWS", 10000)
+    APPLICATIONS_EXPORT_CHUNK_SIZE = _env.int("APPLICATIONS_EXPORT_CHUNK_SIZE", 1000)
+    EVENTS_RECURRENCE_HORIZON_DAYS = _env.int("EVENTS_RECURRENCE_HORIZON_DAYS", 60)
+    EVENTS_RECURRENCE_MAX_OCCURRENCES = _env.int("EVENTS_RECURRENCE_MAX_OCCURRENCES", 500)
+    EVENTS_RECURRENCE_INTERVAL = _env.int("EVENTS_RECURRENCE_INTERVAL", 3600)
+    EVENTS_LIFECYCLE_INTERVAL = _env.int("EVENTS_LIFECYCLE_INTERVAL", 300)
+    EVENTS_LIFECYCLE_BATCH_SIZE = _env.int("EVENTS_LIFECYCLE_BATCH_SIZE", 1000)
+    EVENTS_REMINDER_HOURS = _env.int("EVENTS_REMINDER_HOURS", 24)
+    SINGLE_FLIGHT_TTL = _env.float("SINGLE_FLIGHT_TTL", 1.0)
+    SINGLE_FLIGHT_MAX_ENTRIES = _env.int("SINGLE_FLIGHT_MAX_ENTRIES", 1024)
+    WEB_CONCURRENCY = _env.int("WEB_CONCURRENCY", 1)
+    VERIFY_CODES_BACKEND = _env.str("VERIFY_CODES_BACKEND", "memory", choices=("memory", "redis"))
+    CHANGE_BROADCAST_ENABLED = _env.bool("CHANGE_BROADCAST_ENABLED", True)
+    PROFILING_BUFFER_SIZE = _env.int("PROFILING_BUFFER_SIZE", 50)
+    PROFILING_INTERVAL = _env.float("PROFILING_INTERVAL", 0.001)
+    TRACING_EXPORTER = _env.str("TRACING_EXPORTER", "none", choices=("none", "noop", "file", "otlp"))
+    TRACING_FILE = _env.str("TRACING_FILE", f"{LOG_DIR}/traces.jsonl")
+    TRACING_OTLP_ENDPOINT = _env.str("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_SERVICE_NAME = _env.str("TRACING_SERVICE_NAME", "volunteer-platform")
+    TRACING_SAMPLE_RATE = _env.float("TRACING_SAMPLE_RATE", 1.0)
+    METRICS_DIR = _env.str("METRICS_DIR", "")
+    METRICS_FLUSH_INTERVAL = _env.float("METRICS_FLUSH_INTERVAL", 5)
+    STARTUP_TIME_BUDGET = _env.float("STARTUP_TIME_BUDGET", 1.0)
+
+
+_env.check()
 
 settings = Settings()
\ No newline at end of file
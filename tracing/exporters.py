@@ -0,0 +1,61 @@
+import base64
+import json
+import threading
+from typing import Sequence
+
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+# в OTLP/JSON идентификаторы - hex-строки, а не base64 из protobuf JSON mapping
+_ID_FIELDS = ("traceId", "spanId", "parentSpanId")
+
+
+def _hex_ids(value):
+    if isinstance(value, dict):
+        return {
+            key: base64.b64decode(item).hex() if key in _ID_FIELDS and isinstance(item, str) else _hex_ids(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_hex_ids(item) for item in value]
+    return value
+
+
+def otlp_json(request) -> str:
+    """ExportTraceServiceRequest в строку OTLP/JSON (формат otlpjsonfile коллектора)."""
+    return json.dumps(_hex_ids(MessageToDict(request)), ensure_ascii=False)
+
+
+class OTLPJsonFileExporter(SpanExporter):
+    """
+    Пишет пачки спанов в файл: одна строка OTLP/JSON на пачку.
+    Файл читает коллектор (receiver otlpjsonfile) или benchmarks.trace_collector --read.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        line = otlp_json(encode_spans(spans)) + "\n"
+        try:
+            with self._lock, open(self._path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+class NoopSpanExporter(SpanExporter):
+    """Спаны создаются и сразу отбрасываются - замер накладных расходов самой трассировки."""
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
@@ -0,0 +1,43 @@
+from opentelemetry import trace
+from opentelemetry.propagate import extract
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tracing.tracer import tracer
+
+
+class TracingMiddleware:
+    """
+    Корневой спан HTTP-запроса: в нём - спаны сервисов, репозиториев и SQL.
+    Входящий заголовок traceparent продолжает трассу вызывающей стороны.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=extract(headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            async def send_with_status(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(trace.StatusCode.ERROR)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None and hasattr(route, "path"):
+                    # шаблон маршрута вместо пути - трассы одного эндпоинта группируются
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
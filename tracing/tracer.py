@@ -0,0 +1,189 @@
+"""
+Трассировка горячих путей в формате OpenTelemetry.
+
+Спаны: HTTP-запрос (TracingMiddleware) -> метод сервиса -> метод репозитория -> SQL-выражение,
+а также отправка письма (smtp.send) и хеширование пароля (password.hash / password.verify).
+Сервисы и репозитории оборачиваются при регистрации (register_services, register_repository),
+текущий спан живёт в contextvars - всё, что фабрики Services/UnitOfWork создают в запросе,
+попадает в его трассу, включая задачи single-flight и greenlet-ы SQLAlchemy.
+
+TRACING_EXPORTER:
+- none - трассировка выключена, классы и функции не оборачиваются;
+- noop - спаны создаются и отбрасываются (замер накладных расходов);
+- file - OTLP/JSON в TRACING_FILE;
+- otlp - OTLP/HTTP на TRACING_OTLP_ENDPOINT (коллектор или benchmarks.trace_collector).
+"""
+import functools
+import inspect
+import os
+import socket
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from loguru import logger
+from opentelemetry import trace
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from settings import settings
+
+TRACING_ENABLED = settings.TRACING_EXPORTER != "none"
+MAX_STATEMENT_LENGTH = 2000
+
+tracer = trace.get_tracer("volunteer-platform")
+_provider = None
+
+T = TypeVar("T")
+
+
+def _row_count(result: Any) -> Optional[int]:
+    """Строк в результате метода: список или страница с items."""
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    items = getattr(result, "items", None)
+    if isinstance(items, list):
+        return len(items)
+    return None
+
+
+def traced(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """Декоратор: вызов функции (обычной, корутины или async-генератора) - спан name."""
+    def decorator(func):
+        if not TRACING_ENABLED:
+            return func
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args, **kwargs):
+                # спан не делается текущим: между yield контекст принадлежит потребителю
+                span = tracer.start_span(name, attributes=attributes)
+                rows = 0
+                try:
+                    async for chunk in func(*args, **kwargs):
+                        rows += len(chunk) if isinstance(chunk, (list, tuple)) else 1
+                        yield chunk
+                except Exception as e:
+                    span.record_exception(e)
+                    span.set_status(trace.StatusCode.ERROR)
+                    raise
+                finally:
+                    span.set_attribute("app.rows", rows)
+                    span.end()
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name, attributes=attributes) as span:
+                    result = await func(*args, **kwargs)
+                    rows = _row_count(result)
+                    if rows is not None:
+                        span.set_attribute("app.rows", rows)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name, attributes=attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls: Type[T], attributes: Dict[str, Any]) -> Type[T]:
+    """Оборачивает публичные async-методы класса в спаны "<Класс>.<метод>"."""
+    if not TRACING_ENABLED:
+        return cls
+
+    for method_name, method in inspect.getmembers(cls):
+        if method_name.startswith("_"):
+            continue
+        if inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method):
+            span_attributes = {**attributes, "code.function": method_name}
+            setattr(cls, method_name, traced(f"{cls.__name__}.{method_name}", span_attributes)(method))
+    return cls
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    context._tracing_span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind=trace.SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.executemany": executemany,
+        },
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_tracing_span", None)
+    if span is None:
+        return
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        span.set_attribute("db.rows", cursor.rowcount)
+    span.end()
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_tracing_span", None)
+    if span is None:
+        return
+    span.record_exception(exception_context.original_exception)
+    span.set_status(trace.StatusCode.ERROR)
+    span.end()
+
+
+def install_sql_tracing(engine: AsyncEngine):
+    """Спан на каждое SQL-выражение движка (один раз на движок)."""
+    if not TRACING_ENABLED or event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def create_span_exporter():
+    from tracing.exporters import NoopSpanExporter, OTLPJsonFileExporter
+
+    if settings.TRACING_EXPORTER == "noop":
+        return NoopSpanExporter()
+    if settings.TRACING_EXPORTER == "file":
+        return OTLPJsonFileExporter(settings.TRACING_FILE)
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    raise ValueError(f"Unknown TRACING_EXPORTER: {settings.TRACING_EXPORTER}")
+
+
+def setup_tracing():
+    """Подключает экспортёр TRACING_EXPORTER; вызывается при старте воркера."""
+    global _provider
+    if not TRACING_ENABLED or _provider is not None:
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.TRACING_SERVICE_NAME,
+            "service.instance.id": f"{socket.gethostname()}-{os.getpid()}",
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATE)),
+    )
+    # экспорт в фоновом потоке пачками - запрос не ждёт записи в файл или сеть
+    _provider.add_span_processor(BatchSpanProcessor(create_span_exporter()))
+    trace.set_tracer_provider(_provider)
+    logger.info(f"Трассировка включена: экспорт {settings.TRACING_EXPORTER}, доля трасс {settings.TRACING_SAMPLE_RATE}")
+
+
+def shutdown_tracing():
+    """Отправляет накопленные спаны при остановке воркера."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None